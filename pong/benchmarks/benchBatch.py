@@ -0,0 +1,79 @@
+# =================================================================================================
+# Contributing Authors:	    Shelby Scoville
+# Email Addresses:          snsc235@uky.edu
+# Date:                     10/18/2026
+# Purpose:                  Checks the NumPy batch simulator against Simulation and measures its speed
+# =================================================================================================
+#
+# Run from the pong/ folder:  python -m benchmarks.benchBatch --matches 10000 --ticks 2000
+#
+# First plays a set of matches with random paddle input on both the scalar Simulation (helperCode
+# Ball/Paddle) and BatchSimulation and stops if any tick differs. Then times batch steps.
+
+import argparse
+import time
+
+import numpy as np
+
+from pongSim import Simulation
+from pongBatch import BatchSimulation, UP, STILL, DOWN
+
+MOVES = {UP: "up", STILL: "", DOWN: "down"}
+
+# Author:   Shelby Scoville
+# Purpose:  Runs scalar and batch simulations side by side and compares every tick
+# Pre:      None
+# Post:     Raises SystemExit on the first difference, otherwise returns the number of ticks compared
+def check_equivalence(matches: int, ticks: int, seed: int) -> int:
+    rng = np.random.default_rng(seed)
+    batch = BatchSimulation(matches)
+    scalars = [Simulation() for _ in range(matches)]
+    for tick in range(ticks):
+        # Players change direction now and then; held long enough to reach the walls sometimes
+        if tick % 7 == 0:
+            left = rng.integers(-1, 2, matches)
+            right = rng.integers(-1, 2, matches)
+            batch.setInputs(left, right)
+            for i, sim in enumerate(scalars):
+                sim.setInput(1, MOVES[int(left[i])])
+                sim.setInput(2, MOVES[int(right[i])])
+        batch.step()
+        for i, sim in enumerate(scalars):
+            sim.step()
+            if batch.getState(i) != sim.getState():
+                raise SystemExit(f"match {i} differs at tick {tick + 1}:\n  batch  {batch.getState(i)}\n  scalar {sim.getState()}")
+    return matches * ticks
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Batch simulator equivalence check and benchmark")
+    parser.add_argument("--matches", type=int, default=10000)
+    parser.add_argument("--ticks", type=int, default=2000)
+    parser.add_argument("--check-matches", type=int, default=50)
+    parser.add_argument("--check-ticks", type=int, default=20000, help="long enough for matches to finish")
+    args = parser.parse_args()
+
+    compared = check_equivalence(args.check_matches, args.check_ticks, seed=1)
+    print(f"equivalence: {compared} match-ticks identical to Simulation")
+
+    rng = np.random.default_rng(2)
+    batch = BatchSimulation(args.matches)
+    started = time.perf_counter()
+    for tick in range(args.ticks):
+        if tick % 7 == 0:
+            batch.setInputs(rng.integers(-1, 2, args.matches), rng.integers(-1, 2, args.matches))
+        batch.step()
+    elapsed = time.perf_counter() - started
+    print(f"batch: {args.matches} matches x {args.ticks} ticks in {elapsed:.2f}s "
+          f"= {args.matches * args.ticks / elapsed:,.0f} match-ticks/s")
+
+    sim = Simulation()
+    started = time.perf_counter()
+    for _ in range(100000):
+        sim.step()
+        if sim.isOver():
+            sim = Simulation()
+    elapsed = time.perf_counter() - started
+    print(f"scalar Simulation: {100000 / elapsed:,.0f} match-ticks/s")
+
+if __name__ == "__main__":
+    main()
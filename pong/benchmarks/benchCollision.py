@@ -0,0 +1,189 @@
+# =================================================================================================
+# Contributing Authors:	    Shelby Scoville
+# Email Addresses:          snsc235@uky.edu
+# Date:                     10/18/2026
+# Purpose:                  Property checks for the swept ball collisions, up to absurd ball speeds
+# =================================================================================================
+#
+# Run from the pong/ folder:  python -m benchmarks.benchCollision --states 2000
+#
+# For each ball speed, random starting states (ball anywhere on screen between the walls and not
+# inside a paddle, paddles anywhere, velocity up to that many pixels per tick on each axis) are moved one
+# tick with pongSim.sweepBall and checked for:
+#   - no tunnelling: every straight piece of the path, walked a pixel at a time, stays out of the
+#     walls and paddles, and the rounded end position does too
+#   - speed: a wall bounce only flips dy, a paddle bounce only flips dx
+#   - step size: moving for a random part of the tick and then the rest ends up in the same place
+#     with the same velocity as moving for the whole tick
+#   - BatchSimulation gives exactly the same tick as Simulation from the same state
+# Also reported: of the ticks whose straight-line move crosses a paddle, how many the old
+# move-then-colliderect rule let through (start and end both clear of it), and the time per
+# Simulation.step. Exits with status 1 if any check fails.
+
+import argparse
+import math
+import random
+import sys
+import time
+
+import numpy as np
+
+from pongSim import Simulation, sweepBall, timeOfImpact, MAX_BOUNCES
+from pongBatch import BatchSimulation
+
+SCREEN_WIDTH = 640
+SCREEN_HEIGHT = 480
+SIZE = 5
+WALLS = [(-10, 0, SCREEN_WIDTH + 20, 10), (-10, SCREEN_HEIGHT - 10, SCREEN_WIDTH + 20, 10)]
+
+# Author:   Shelby Scoville
+# Purpose:  A random state the ball could be in at the start of a tick
+# Pre:      speed is the largest velocity on either axis
+# Post:     Returns (x, y, dx, dy, leftY, rightY)
+def random_state(rng: random.Random, speed: int) -> tuple:
+    while True:
+        leftY = rng.randrange(10, SCREEN_HEIGHT - 60 + 1, 5)
+        rightY = rng.randrange(10, SCREEN_HEIGHT - 60 + 1, 5)
+        # Off the screen it would have been scored at the end of the last tick
+        x = rng.randint(0, SCREEN_WIDTH)
+        y = rng.randint(10, SCREEN_HEIGHT - 10 - SIZE)
+        if not any(overlap(x, y, rect) for rect in paddle_rects(leftY, rightY)):
+            break
+    dx = rng.choice((-1, 1)) * rng.randint(max(1, speed // 10), speed)
+    dy = rng.randint(-speed, speed)
+    return x, y, dx, dy, leftY, rightY
+
+def paddle_rects(leftY: int, rightY: int) -> list:
+    return [(10, leftY, 10, 50), (SCREEN_WIDTH - 20, rightY, 10, 50)]
+
+# Author:   Shelby Scoville
+# Purpose:  pygame.Rect.colliderect for the ball at a float position, with a little slack
+# Pre:      rect is (left, top, width, height)
+# Post:     Returns True if they overlap by more than slack
+def overlap(x: float, y: float, rect: tuple, slack: float =0.0) -> bool:
+    left, top, width, height = rect
+    return (x < left + width - slack and x + SIZE > left + slack
+            and y < top + height - slack and y + SIZE > top + slack)
+
+# Author:   Shelby Scoville
+# Purpose:  Walks the path sweepBall took a pixel at a time, looking for the ball inside something
+# Pre:      hits is sweepBall's list for a tick that started at (x, y) with (dx, dy)
+# Post:     Returns True if any point on it overlaps a wall or paddle
+def tunnels(x: float, y: float, dx: int, dy: int, hits: list, end: tuple, rects: list) -> bool:
+    points = [(x, y)] + [(hx, hy) for _, _, _, hx, hy in hits] + [end]
+    for (ax, ay), (bx, by) in zip(points, points[1:]):
+        steps = max(1, int(math.hypot(bx - ax, by - ay)) + 1)
+        t = np.linspace(0.0, 1.0, steps + 1)
+        px = ax + (bx - ax) * t
+        py = ay + (by - ay) * t
+        for left, top, width, height in rects:
+            inside = ((px < left + width - 1e-6) & (px + SIZE > left + 1e-6)
+                      & (py < top + height - 1e-6) & (py + SIZE > top + 1e-6))
+            if inside.any():
+                return True
+    return False
+
+# Author:   Shelby Scoville
+# Purpose:  What the old rule (move the whole tick, then colliderect) does with a paddle in the way
+# Pre:      Same state as given to sweepBall
+# Post:     Returns (crosses, passed): whether the straight move this tick goes into a paddle, and
+#           whether it does while ending outside it, so the old rule never saw the hit
+def old_rule(x: int, y: int, dx: int, dy: int, paddles: list) -> tuple:
+    crosses = passed = False
+    for rect in paddles:
+        t = timeOfImpact(x, y, dx, dy, SIZE, rect)
+        if t is not None and t < 1.0:
+            crosses = True
+            passed = passed or not overlap(x + dx, y + dy, rect)
+    return crosses, passed
+
+# Author:   Shelby Scoville
+# Purpose:  Puts a Simulation and match 0 of a BatchSimulation into the same state
+# Pre:      state is from random_state
+# Post:     Returns the two, ready to step
+def same_state(state: tuple) -> tuple:
+    x, y, dx, dy, leftY, rightY = state
+    sim = Simulation(SCREEN_WIDTH, SCREEN_HEIGHT)
+    sim.ball.rect.topleft = (x, y)
+    sim.ball.xVel, sim.ball.yVel = dx, dy
+    sim.leftPaddle.rect.y = leftY
+    sim.rightPaddle.rect.y = rightY
+    batch = BatchSimulation(1, SCREEN_WIDTH, SCREEN_HEIGHT)
+    batch.ballX[0], batch.ballY[0], batch.ballDx[0], batch.ballDy[0] = x, y, dx, dy
+    batch.leftY[0], batch.rightY[0] = leftY, rightY
+    return sim, batch
+
+# Author:   Shelby Scoville
+# Purpose:  Runs every check at one speed
+# Pre:      None
+# Post:     Returns a dict of failure counts and the paddle hit counts
+def check_speed(speed: int, states: int, rng: random.Random) -> dict:
+    result = {"tunnel": 0, "speed": 0, "split": 0, "batch": 0, "capped": 0, "crossings": 0, "old_passed": 0}
+    for _ in range(states):
+        state = random_state(rng, speed)
+        x, y, dx, dy, leftY, rightY = state
+        paddles = paddle_rects(leftY, rightY)
+        ex, ey, edx, edy, hits = sweepBall(x, y, dx, dy, SIZE, paddles, WALLS)
+        if len(hits) == MAX_BOUNCES:
+            result["capped"] += 1
+
+        rounded = (math.floor(ex + 0.5), math.floor(ey + 0.5))
+        if (tunnels(x, y, dx, dy, hits, (ex, ey), paddles + WALLS)
+                or any(overlap(rounded[0], rounded[1], rect) for rect in paddles + WALLS)):
+            result["tunnel"] += 1
+
+        paddleHits = sum(1 for kind, _, _, _, _ in hits if kind == "paddle")
+        wallHits = len(hits) - paddleHits
+        if abs(edx) != abs(dx) or (-1) ** paddleHits * dx != edx or (paddleHits == 0 and (-1) ** wallHits * dy != edy):
+            result["speed"] += 1
+        crosses, passed = old_rule(x, y, dx, dy, paddles)
+        result["crossings"] += crosses
+        result["old_passed"] += passed
+
+        split = rng.uniform(0.05, 0.95)
+        mx, my, mdx, mdy, _ = sweepBall(x, y, dx, dy, SIZE, paddles, WALLS, split)
+        sx, sy, sdx, sdy, _ = sweepBall(mx, my, mdx, mdy, SIZE, paddles, WALLS, 1.0 - split)
+        if (sdx, sdy) != (edx, edy) or abs(sx - ex) > 1e-6 * speed or abs(sy - ey) > 1e-6 * speed:
+            result["split"] += 1
+
+        sim, batch = same_state(state)
+        sim.step()
+        batch.step()
+        if batch.getState(0) != sim.getState():
+            result["batch"] += 1
+    return result
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Swept collision property checks at extreme ball speeds")
+    parser.add_argument("--states", type=int, default=2000, help="random states per speed")
+    parser.add_argument("--speeds", type=int, nargs="+", default=[5, 20, 100, 1000, 5000],
+                        help="largest pixels per tick on each axis")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    failed = False
+    print(f"{args.states} random states per speed")
+    print(f"{'px/tick':>8} {'tunnelled':>9} {'speed':>6} {'split':>6} {'batch':>6} {'capped':>6} "
+          f"{'crossings':>9} {'old rule let through':>20}")
+    for speed in args.speeds:
+        result = check_speed(speed, args.states, rng)
+        passed = result["old_passed"] / max(1, result["crossings"]) * 100
+        print(f"{speed:>8} {result['tunnel']:>9} {result['speed']:>6} {result['split']:>6} {result['batch']:>6} "
+              f"{result['capped']:>6} {result['crossings']:>9} {passed:19.1f}%")
+        if result["tunnel"] or result["speed"] or result["split"] or result["batch"] or result["capped"]:
+            failed = True
+
+    sim = Simulation(SCREEN_WIDTH, SCREEN_HEIGHT)
+    started = time.perf_counter()
+    for _ in range(100000):
+        sim.step()
+        if sim.isOver():
+            sim = Simulation(SCREEN_WIDTH, SCREEN_HEIGHT)
+    print(f"Simulation.step: {(time.perf_counter() - started) * 10:.2f}us per tick")
+    print("columns 2-6 count failures: a path through a paddle or wall, a bounce that changed the speed,")
+    print("a split tick ending elsewhere, batch differing from Simulation, more than MAX_BOUNCES in a tick.")
+    print("crossings: ticks whose straight move goes into a paddle, of which the old rule let some pass through")
+    if failed:
+        print("FAIL: swept collisions broke a property")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,76 @@
+# =================================================================================================
+# Contributing Authors:	    Shelby Scoville
+# Email Addresses:          snsc235@uky.edu
+# Date:                     10/18/2026
+# Purpose:                  Measures bytes per second per client for full states vs delta snapshots
+# =================================================================================================
+#
+# Run from the pong/ folder:  python -m benchmarks.benchDelta --seconds 300 --ack-delay 6
+#
+# Plays a simulated match with scripted paddles, sends every tick through the delta encoder and
+# decoder (acks arrive --ack-delay ticks late, like a real round trip) and checks that the rebuilt
+# state matches the real one on every tick.
+
+import argparse
+import random
+from collections import deque
+
+from pongSim import Simulation
+from pongProtocol import JSON_CODEC, BINARY_CODEC, DeltaEncoder, DeltaDecoder
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Delta snapshot bandwidth benchmark")
+    parser.add_argument("--seconds", type=float, default=300.0, help="simulated match time")
+    parser.add_argument("--tick-rate", type=int, default=60)
+    parser.add_argument("--ack-delay", type=int, default=6, help="ticks before an ack reaches the server")
+    parser.add_argument("--keyframe-interval", type=int, default=60)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    sim = Simulation()
+    ticks = int(args.seconds * args.tick_rate)
+    totals = {}
+    for codec in (JSON_CODEC, BINARY_CODEC):
+        totals[("full", codec.name)] = 0
+        totals[("delta", codec.name)] = 0
+        totals[("ack", codec.name)] = 0
+
+    encoder = DeltaEncoder(keyframe_interval=args.keyframe_interval)
+    decoder = DeltaDecoder()
+    acks_in_flight = deque()
+    keyframes = 0
+    for tick in range(ticks):
+        # Each paddle changes direction now and then, like a player would
+        for playerId in (1, 2):
+            if rng.random() < 0.05:
+                sim.setInput(playerId, rng.choice(["up", "down", ""]))
+        sim.step()
+        state = sim.getState()
+
+        while acks_in_flight and acks_in_flight[0][0] <= tick:
+            encoder.ack(acks_in_flight.popleft()[1])
+        message = encoder.encode(state)
+        keyframes += message["base"] == 0
+
+        for codec in (JSON_CODEC, BINARY_CODEC):
+            totals[("full", codec.name)] += len(codec.encode("state", state))
+            frame = codec.encode("snapshot", message)
+            totals[("delta", codec.name)] += len(frame)
+            totals[("ack", codec.name)] += len(codec.encode("ack", {"ack": message["snap"]}))
+            decoded = codec.decode(frame)[0]
+
+        rebuilt = decoder.decode(decoded)
+        if rebuilt != state:
+            raise SystemExit(f"drift at tick {tick}: {rebuilt} != {state}")
+        acks_in_flight.append((tick + args.ack_delay, message["snap"]))
+
+    print(f"{ticks} ticks checked, no drift ({keyframes} keyframes)")
+    print(f"{'format':7} {'full B/s':>9} {'delta B/s':>10} {'saved':>6} {'ack B/s up':>11}")
+    for codec in (JSON_CODEC, BINARY_CODEC):
+        full = totals[("full", codec.name)] / args.seconds
+        delta = totals[("delta", codec.name)] / args.seconds
+        ack = totals[("ack", codec.name)] / args.seconds
+        print(f"{codec.name:7} {full:9.0f} {delta:10.0f} {100*(1-delta/full):5.1f}% {ack:11.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# =================================================================================================
+# Contributing Authors:	    Shelby Scoville
+# Email Addresses:          snsc235@uky.edu
+# Date:                     10/18/2026
+# Purpose:                  Measures how many matches the event loop server hosts per CPU core
+# =================================================================================================
+#
+# Run from the pong/ folder:  python -m benchmarks.benchEventServer --matches 1000 --rate 30
+#
+# The server runs in its own process so its CPU time can be measured on its own. The bots all live
+# in this process on one selector and send a paddle/ball update at --rate per second each.
+
+import argparse
+import json
+import os
+import selectors
+import socket
+import subprocess
+import sys
+import time
+
+from pongServer import raise_file_limit
+
+# Author:   Shelby Scoville
+# Purpose:  Starts the event loop server as a child process on a free port
+# Pre:      Run from the pong/ folder
+# Post:     Returns the process and the port it is listening on
+def start_server() -> tuple:
+    proc = subprocess.Popen(
+        [sys.executable, "pongServer.py", "--mode", "event", "--host", "127.0.0.1", "--port", "0"],
+        stdout=subprocess.PIPE, text=True)
+    line = proc.stdout.readline()
+    while not line.startswith("Server started"):
+        line = proc.stdout.readline()
+    port = int(line.strip().rsplit(":", 1)[1])
+    return proc, port
+
+# Author:   Shelby Scoville
+# Purpose:  Connects the bot sockets and reads their init_data
+# Pre:      Server is listening on port
+# Post:     Returns a list of connected non-blocking sockets
+def connect_bots(port: int, count: int) -> list:
+    bots = []
+    for _ in range(count):
+        s = socket.create_connection(("127.0.0.1", port))
+        s.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        bots.append(s)
+    for s in bots:
+        buffer = b""
+        while b'\n' not in buffer:
+            buffer += s.recv(1024)
+        s.setblocking(False)
+    return bots
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Event loop server capacity benchmark")
+    parser.add_argument("--matches", type=int, default=500)
+    parser.add_argument("--rate", type=float, default=30.0, help="updates per second per player")
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    raise_file_limit()
+    proc, port = start_server()
+    bots = connect_bots(port, args.matches * 2)
+    connected_at = time.perf_counter()
+
+    selector = selectors.DefaultSelector()
+    for s in bots:
+        selector.register(s, selectors.EVENT_READ)
+
+    interval = 1.0 / args.rate
+    # Spread the bots evenly over one interval so they do not all fire at once
+    next_send = [connected_at + interval * i / len(bots) for i in range(len(bots))]
+    sent = received = bytes_in = 0
+    sync = 0
+    end = connected_at + args.duration
+    while True:
+        now = time.perf_counter()
+        if now >= end:
+            break
+        for i, s in enumerate(bots):
+            if next_send[i] <= now:
+                sync += 1
+                message = json.dumps({"paddle_y": 215, "ball_x": 320, "ball_y": 240, "ball_dx": -5,
+                                      "ball_dy": 0, "score1": 0, "score2": 0, "sync": sync}) + '\n'
+                try:
+                    s.send(message.encode('utf-8'))
+                    sent += 1
+                except BlockingIOError:
+                    pass
+                next_send[i] += interval
+        wait = max(0.0, min(min(next_send), end) - time.perf_counter())
+        for key, _ in selector.select(wait):
+            try:
+                chunk = key.fileobj.recv(65536)
+            except BlockingIOError:
+                continue
+            bytes_in += len(chunk)
+            received += chunk.count(b'\n')
+    elapsed = time.perf_counter() - connected_at
+
+    for s in bots:
+        s.close()
+    proc.terminate()
+    proc.stdout.close()
+    # wait4 hands back the child's own CPU usage
+    _, _, usage = os.wait4(proc.pid, 0)
+    cpu = usage.ru_utime + usage.ru_stime
+
+    print(f"connections:          {len(bots)}")
+    print(f"matches:              {args.matches}")
+    print(f"messages in/out:      {sent} / {received}  ({sent/elapsed:.0f}/s in)")
+    print(f"bytes to clients:     {bytes_in}")
+    print(f"server cpu seconds:   {cpu:.2f} over {elapsed:.2f}s wall ({100*cpu/elapsed:.1f}% of one core)")
+    if cpu > 0:
+        print(f"matches per core:     {args.matches * elapsed / cpu:.0f} at {args.rate:g} updates/s per player")
+        print(f"connections per core: {len(bots) * elapsed / cpu:.0f}")
+
+if __name__ == "__main__":
+    main()
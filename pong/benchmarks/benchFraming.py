@@ -0,0 +1,125 @@
+# =================================================================================================
+# Contributing Authors:	    Shelby Scoville
+# Email Addresses:          snsc235@uky.edu
+# Date:                     10/18/2026
+# Purpose:                  Measures how fast a reader catches up on a backlog of queued states
+# =================================================================================================
+#
+# Run from the pong/ folder:  python -m benchmarks.benchFraming --backlogs 1000 5000 20000
+#
+# A backlog of state frames (with a score message every 100 states) is written into a socketpair
+# by a second thread, and the reader is timed until it has handled the last one. Readers:
+#   split     - the original loop: recv(1024).decode(), string += chunk, split('\n', 1), JSON parse
+#   decode    - bytearray += chunk and decoding every frame by offset with the codec
+#   frames    - FrameBuffer with recv_into, still decoding every frame
+#   latest    - FrameBuffer skipping states that a newer queued state replaces
+
+import argparse
+import json
+import socket
+import threading
+import time
+
+from pongProtocol import JSON_CODEC, BINARY_CODEC
+from pongFraming import FrameBuffer
+
+# Author:   Shelby Scoville
+# Purpose:  Builds the bytes of a backlog
+# Pre:      None
+# Post:     Returns the frames for count states in codec's format
+def make_backlog(codec, count: int) -> bytes:
+    state = {"ball_x": 320, "ball_y": 240, "ball_dx": -5, "ball_dy": 1, "p1_y": 215, "p2_y": 215,
+             "score1": 0, "score2": 0, "sync": 0, "p1_seq": 0, "p2_seq": 0, "time": 0}
+    frames = []
+    for i in range(count):
+        state["sync"] = i
+        state["ball_x"] = 320 + (i % 60)
+        frames.append(codec.encode("state", state))
+        if i % 100 == 99:
+            frames.append(codec.encode("score", {"score_left": i // 100, "score_right": 0}))
+    return b"".join(frames)
+
+def read_split(sock: socket.socket, codec, last: int) -> int:
+    buffer = ""
+    handled = 0
+    while True:
+        chunk = sock.recv(1024).decode()
+        buffer += chunk
+        while '\n' in buffer:
+            message, buffer = buffer.split('\n', 1)
+            data = json.loads(message)
+            handled += 1
+            if data.get("sync") == last:
+                return handled
+
+def read_decode(sock: socket.socket, codec, last: int) -> int:
+    buffer = bytearray()
+    handled = 0
+    while True:
+        buffer += sock.recv(1024)
+        start = 0
+        while True:
+            data, end = codec.decode(buffer, start)
+            if end == start:
+                break
+            start = end
+            handled += 1
+            if data.get("sync") == last:
+                return handled
+        del buffer[:start]
+
+def read_frames(sock: socket.socket, codec, last: int, latest_wins: bool =False) -> int:
+    frames = FrameBuffer(65536, latest_wins)
+    handled = 0
+    while True:
+        frames.recv_into(sock)
+        while True:
+            data, found = frames.next_message(codec)
+            if not found:
+                break
+            handled += 1
+            if data.get("sync") == last:
+                return handled
+
+def read_latest(sock: socket.socket, codec, last: int) -> int:
+    return read_frames(sock, codec, last, True)
+
+READERS = {"split": read_split, "decode": read_decode, "frames": read_frames, "latest": read_latest}
+
+# Author:   Shelby Scoville
+# Purpose:  Times one reader on one backlog
+# Pre:      backlog was made by make_backlog with count states
+# Post:     Returns (seconds, messages decoded)
+def run(reader, codec, backlog: bytes, count: int) -> tuple:
+    left, right = socket.socketpair()
+    # The whole backlog is queued before the reader starts, like a client that stalled
+    left.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4 * 1024 * 1024)
+    right.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+    writer = threading.Thread(target=left.sendall, args=(backlog,))
+    writer.start()
+    # Let the backlog pile up (as much as the socket buffers hold) before reading any of it
+    writer.join(0.5)
+    started = time.perf_counter()
+    handled = reader(right, codec, count - 1)
+    elapsed = time.perf_counter() - started
+    writer.join()
+    left.close()
+    right.close()
+    return elapsed, handled
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time to catch up on a backlog of queued state frames")
+    parser.add_argument("--backlogs", type=int, nargs="+", default=[1000, 5000, 20000])
+    args = parser.parse_args()
+
+    print(f"{'format':>7} {'backlog':>8} {'reader':>7} {'ms':>9} {'decoded':>8} {'speedup':>8}")
+    for codec in (JSON_CODEC, BINARY_CODEC):
+        for count in args.backlogs:
+            backlog = make_backlog(codec, count)
+            baseline = None
+            for name, reader in READERS.items():
+                if name == "split" and codec is not JSON_CODEC:
+                    continue
+                elapsed, handled = min(run(reader, codec, backlog, count) for _ in range(3))
+                baseline = baseline or elapsed
+                print(f"{codec.name:>7} {count:>8} {name:>7} {elapsed * 1000:9.2f} {handled:>8} {baseline / elapsed:7.1f}x")
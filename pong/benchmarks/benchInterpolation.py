@@ -0,0 +1,93 @@
+# =================================================================================================
+# Contributing Authors:	    Shelby Scoville
+# Email Addresses:          snsc235@uky.edu
+# Date:                     10/18/2026
+# Purpose:                  Shows how smooth the ball looks with snapping vs snapshot interpolation
+# =================================================================================================
+#
+# Run from the pong/ folder:  python -m benchmarks.benchInterpolation --send-rates 60 30 20 10
+#
+# A simulated match sends state at each send rate over a link with random delay. A 60 fps client
+# draws the ball either by snapping to the newest state (the original behaviour) or through a
+# SnapshotBuffer, either dating states from their tick and arrival time or by the shared clock
+# (the state's "time" field, whole milliseconds). "jerk" is how much the ball's per-frame movement changes from frame to frame;
+# a perfectly smooth ball has ~0 jerk between bounces.
+
+import argparse
+import heapq
+import random
+
+from pongSim import Simulation
+from pongNetcode import SnapshotBuffer
+
+# Author:   Shelby Scoville
+# Purpose:  Plays one match and measures how the ball moves on screen
+# Pre:      sendRate <= tickRate
+# Post:     Returns (mean jerk when snapping, when interpolating by tick, when interpolating by the
+#           shared clock, frames spent extrapolating by tick)
+def run(sendRate: float, tickRate: float, latency: float, jitter: float, seconds: float) -> tuple:
+    rng = random.Random(7)
+    sim = Simulation()
+    buffer = SnapshotBuffer(tickRate, delay=2.0 / sendRate)
+    clockBuffer = SnapshotBuffer(tickRate, delay=2.0 / sendRate)
+    sendEvery = max(1, round(tickRate / sendRate))
+
+    # (arrival time, order, state) for states still on the wire
+    inFlight = []
+    newest = None
+    drawn = {"snap": [], "interp": [], "clock": []}
+    extrapolated = 0
+    frame = 1.0 / 60
+    tick = 1.0 / tickRate
+    now = 0.0
+    nextTick = 0.0
+    while now < seconds:
+        while nextTick <= now:
+            sim.step()
+            if sim.tick % sendEvery == 0:
+                arrival = nextTick + latency + rng.uniform(0, jitter)
+                heapq.heappush(inFlight, (arrival, sim.tick, sim.getState()))
+            nextTick += tick
+        while inFlight and inFlight[0][0] <= now:
+            arrival, _, state = heapq.heappop(inFlight)
+            if newest is None or state["sync"] > newest["sync"]:
+                newest = state
+            buffer.push(state, arrival)
+            # Sent on its tick, stamped in whole milliseconds like the wire's "time"
+            clockBuffer.push(state, arrival, round(state["sync"] / tickRate, 3))
+        if newest is not None:
+            drawn["snap"].append((newest["ball_x"], newest["ball_y"]))
+            view = buffer.sample(now)
+            drawn["interp"].append((view["ball_x"], view["ball_y"]))
+            view = clockBuffer.sample(now)
+            drawn["clock"].append((view["ball_x"], view["ball_y"]))
+            if now - buffer.delay > buffer.states[-1][0]:
+                extrapolated += 1
+        now += frame
+
+    results = []
+    for name in ("snap", "interp", "clock"):
+        points = drawn[name]
+        steps = [(b[0] - a[0], b[1] - a[1]) for a, b in zip(points, points[1:])]
+        # Ignore resets after a point, those are meant to jump
+        jerks = [abs(s2[0] - s1[0]) + abs(s2[1] - s1[1]) for s1, s2 in zip(steps, steps[1:])
+                 if abs(s1[0]) < 50 and abs(s2[0]) < 50]
+        results.append(sum(jerks) / len(jerks))
+    return results[0], results[1], results[2], extrapolated
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Snapshot interpolation smoothness benchmark")
+    parser.add_argument("--send-rates", type=float, nargs="+", default=[60, 30, 20, 10])
+    parser.add_argument("--tick-rate", type=float, default=60)
+    parser.add_argument("--latency", type=float, default=0.03)
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--seconds", type=float, default=60)
+    args = parser.parse_args()
+
+    print(f"{'send/s':>6} {'snap jerk':>10} {'interp jerk':>12} {'clock jerk':>11} {'extrapolated frames':>20}")
+    for sendRate in args.send_rates:
+        snap, interp, clock, extrapolated = run(sendRate, args.tick_rate, args.latency, args.jitter, args.seconds)
+        print(f"{sendRate:6g} {snap:10.2f} {interp:12.2f} {clock:11.2f} {extrapolated:20d}")
+
+if __name__ == "__main__":
+    main()
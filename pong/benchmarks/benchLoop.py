@@ -0,0 +1,115 @@
+# =================================================================================================
+# Contributing Authors:	    Shelby Scoville
+# Email Addresses:          snsc235@uky.edu
+# Date:                     10/18/2026
+# Purpose:                  Checks that frame rate and hitches no longer change game speed or traffic
+# =================================================================================================
+#
+# Run from the pong/ folder:  python -m benchmarks.benchLoop --seconds 60
+#
+# Frame times from a few made-up frame profiles (steady 60 and 144 Hz, a slow 30 Hz machine, 60 Hz
+# with a 100ms hitch every second, frames anywhere between 4ms and 25ms) are fed on a simulated clock
+# to two loops: the old one, which ran one game tick and sent one update per frame, and the
+# pongLoop one (FixedStep ticks, Cadence updates, drawing between ticks). Reported per loop: game
+# ticks and updates per second of real time. For the new loop also how far the ball moves on screen
+# each frame compared to how far it should have in that frame's time (judder), drawn at the last
+# tick vs between the last two ticks. Exits with status 1 if the new loop's speed or update rate
+# moves more than 1% from what was asked for.
+
+import argparse
+import random
+import sys
+
+from pongLoop import FixedStep, Cadence, lerp
+
+BALL_SPEED = 5
+
+# Author:   Shelby Scoville
+# Purpose:  Frame durations for one profile
+# Pre:      None
+# Post:     Returns a list of frame times in seconds covering about seconds of real time
+def frame_times(profile: str, seconds: float, rng: random.Random) -> list:
+    times = []
+    total = 0.0
+    while total < seconds:
+        if profile == "60Hz":
+            frame = 1 / 60
+        elif profile == "144Hz":
+            frame = 1 / 144
+        elif profile == "30Hz":
+            frame = 1 / 30
+        elif profile == "60Hz+hitches":
+            frame = 0.1 if len(times) % 60 == 59 else 1 / 60
+        else:
+            frame = rng.uniform(0.004, 0.025)
+        times.append(frame)
+        total += frame
+    return times
+
+# Author:   Shelby Scoville
+# Purpose:  Runs the old loop: a tick and an update every frame
+# Pre:      None
+# Post:     Returns (ticks per second, updates per second)
+def old_loop(frames: list) -> tuple:
+    elapsed = sum(frames)
+    return len(frames) / elapsed, len(frames) / elapsed
+
+# Author:   Shelby Scoville
+# Purpose:  Runs the fixed-timestep loop and measures how evenly the ball moves on screen
+# Pre:      None
+# Post:     Returns (ticks per second, updates per second, judder drawn at the tick, judder interpolated)
+def new_loop(frames: list, tick_rate: float, update_rate: float) -> tuple:
+    stepper = FixedStep(tick_rate)
+    cadence = Cadence(update_rate)
+    now = 0.0
+    stepper.advance(now)
+    ball = last = 0
+    updates = 0
+    drawn_tick = drawn_lerp = None
+    error_tick = error_lerp = 0.0
+    for frame in frames:
+        now += frame
+        for _ in range(stepper.advance(now)):
+            last = ball
+            ball += BALL_SPEED
+        at_tick = ball
+        between = lerp(last, ball, stepper.alpha())
+        if drawn_tick is not None:
+            # How far it should have moved on screen in this frame's time
+            expected = BALL_SPEED * tick_rate * frame
+            error_tick += (at_tick - drawn_tick - expected) ** 2
+            error_lerp += (between - drawn_lerp - expected) ** 2
+        drawn_tick, drawn_lerp = at_tick, between
+        if cadence.due(now):
+            updates += 1
+    count = max(1, len(frames) - 1)
+    return (stepper.ticks / (now - stepper.skipped), updates / now, (error_tick / count) ** 0.5,
+            (error_lerp / count) ** 0.5)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fixed-timestep client loop vs one tick per frame")
+    parser.add_argument("--seconds", type=float, default=60.0, help="simulated real time per profile")
+    parser.add_argument("--tick-rate", type=float, default=60.0)
+    parser.add_argument("--update-rate", type=float, default=60.0)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    failed = False
+    print(f"tick rate {args.tick_rate:g}/s, update rate {args.update_rate:g}/s, {args.seconds:g}s per profile")
+    print(f"{'frames':>13} {'old ticks/s':>11} {'old sends/s':>11} {'new ticks/s':>11} {'new sends/s':>11} "
+          f"{'judder at tick':>14} {'interpolated':>12}")
+    for profile in ("60Hz", "144Hz", "30Hz", "60Hz+hitches", "4-25ms"):
+        frames = frame_times(profile, args.seconds, rng)
+        old_ticks, old_sends = old_loop(frames)
+        ticks, sends, judder_tick, judder_lerp = new_loop(frames, args.tick_rate, args.update_rate)
+        print(f"{profile:>13} {old_ticks:11.1f} {old_sends:11.1f} {ticks:11.1f} {sends:11.1f} "
+              f"{judder_tick:12.2f}px {judder_lerp:10.2f}px")
+        # Updates can't go out more often than frames are drawn
+        update_target = min(args.update_rate, len(frames) / sum(frames))
+        if abs(ticks - args.tick_rate) > 0.01 * args.tick_rate or sends > 1.01 * update_target:
+            failed = True
+    print("ticks/s is game speed in real time (stalls longer than FixedStep's catch-up are left out), judder is")
+    print("the RMS difference between how far the ball moved on screen in a frame and how far it should have")
+    if failed:
+        print("FAIL: the fixed-timestep loop's speed or update rate depends on the frames")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,150 @@
+# =================================================================================================
+# Contributing Authors:	    Shelby Scoville
+# Email Addresses:          snsc235@uky.edu
+# Date:                     10/18/2026
+# Purpose:                  Scrapes the metrics endpoint while bots play and measures its overhead
+# =================================================================================================
+#
+# Run from the pong/ folder:  python -m benchmarks.benchMetrics --bots 200 --duration 10
+#
+# For each server setup the bots from pongBots play twice, once without metrics and once with
+# them. During the metrics run /metrics is scraped every half second; every scrape has to parse,
+# contain every metric in pongMetrics.METRICS and have counters that never go backwards. The
+# server's CPU time per message is compared between the two runs. Exits with status 1 if a check
+# fails.
+
+import argparse
+import sys
+import threading
+import time
+import urllib.request
+
+from pongServer import Server, EventServer
+from pongMetrics import Metrics, METRICS
+from pongBots import run_load
+
+# Author:   Shelby Scoville
+# Purpose:  Parses a Prometheus text page
+# Pre:      text is what /metrics returned
+# Post:     Returns {"name{labels}": value}; raises ValueError on a malformed line
+def parse_metrics(text: str) -> dict:
+    samples = {}
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        name, value = line.rsplit(" ", 1)
+        samples[name] = float(value)
+    return samples
+
+# Author:   Shelby Scoville
+# Purpose:  Scrapes /metrics until stop is set and checks every page
+# Pre:      url serves metrics
+# Post:     Appends the parsed pages to pages and any problems to errors
+def scrape_loop(url: str, stop: threading.Event, pages: list, errors: list) -> None:
+    previous = {}
+    while not stop.wait(0.5):
+        try:
+            with urllib.request.urlopen(url, timeout=2) as response:
+                samples = parse_metrics(response.read().decode("utf-8"))
+        except (OSError, ValueError) as e:
+            errors.append(f"scrape failed: {e}")
+            continue
+        for name, (kind, _) in METRICS.items():
+            if kind == "histogram":
+                continue
+            if name not in samples:
+                errors.append(f"{name} missing")
+            elif kind == "counter" and samples[name] < previous.get(name, 0):
+                errors.append(f"{name} went backwards")
+        previous = samples
+        pages.append(samples)
+
+# Author:   Shelby Scoville
+# Purpose:  Runs the event loop server in this thread until stop is set
+# Pre:      server is an EventServer
+# Post:     Appends the CPU time this thread used to cpu
+def serve_event(server: EventServer, stop: threading.Event, cpu: list) -> None:
+    started = time.thread_time()
+    while not stop.is_set():
+        server.serve_once(0.05)
+    cpu.append(time.thread_time() - started)
+    server.close()
+
+# Author:   Shelby Scoville
+# Purpose:  Plays one round of bots against one server, with or without metrics
+# Pre:      setup is "threaded", "event" or "authoritative"
+# Post:     Returns (server CPU seconds per message or None, bot results, pages scraped, errors,
+#           process CPU seconds)
+def run(setup: str, bots: int, duration: float, with_metrics: bool) -> tuple:
+    metrics = Metrics() if with_metrics else None
+    stop = threading.Event()
+    cpu = []
+    if setup == "threaded":
+        # The original server plays one match and runs its own threads, so only CPU for the
+        # whole process is available, which includes the bots
+        server = Server("127.0.0.1", 0, metrics=metrics)
+        port = server.server.getsockname()[1]
+        threading.Thread(target=server.run, daemon=True).start()
+        bots = 2
+    else:
+        server = EventServer("127.0.0.1", 0, tick_rate=60.0 if setup == "authoritative" else None, metrics=metrics)
+        port = server.port
+        server_thread = threading.Thread(target=serve_event, args=(server, stop, cpu), daemon=True)
+        server_thread.start()
+
+    pages = []
+    errors = []
+    scraper = None
+    if metrics is not None:
+        url = f"http://127.0.0.1:{metrics.serve('127.0.0.1', 0)}/metrics"
+        scraper = threading.Thread(target=scrape_loop, args=(url, stop, pages, errors), daemon=True)
+        scraper.start()
+
+    started = time.process_time()
+    results = run_load("127.0.0.1", port, bots, 60.0, duration)
+    process_cpu = time.process_time() - started
+    stop.set()
+    if scraper is not None:
+        scraper.join()
+        metrics.close()
+    if setup == "threaded":
+        per_message = None
+        server.running = False
+    else:
+        server_thread.join()
+        per_message = cpu[0] / max(1, server.messages_in + server.messages_out)
+    if not pages and metrics is not None:
+        errors.append("no successful scrapes")
+    return per_message, results, pages, errors, process_cpu
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape /metrics while bots play and measure the overhead")
+    parser.add_argument("--bots", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--setups", nargs="+", choices=["threaded", "event", "authoritative"],
+                        default=["threaded", "event", "authoritative"])
+    args = parser.parse_args()
+
+    failed = False
+    for setup in args.setups:
+        plain, plain_results, _, _, plain_process = run(setup, args.bots, args.duration, False)
+        timed, results, pages, errors, process = run(setup, args.bots, args.duration, True)
+        print(f"== {setup}: {results['connected']} bots, {len(pages)} scrapes")
+        if plain is not None:
+            print(f"   server CPU per message: {plain * 1e6:.2f}us without metrics, {timed * 1e6:.2f}us with "
+                  f"({(timed / plain - 1) * 100:+.1f}%)")
+        else:
+            print(f"   process CPU (server and bots): {plain_process:.2f}s without metrics, {process:.2f}s with")
+        print(f"   bot latency p50/p99: {plain_results['latency_ms']['p50']}/{plain_results['latency_ms']['p99']}ms "
+              f"without, {results['latency_ms']['p50']}/{results['latency_ms']['p99']}ms with")
+        if pages:
+            last = pages[-1]
+            shown = ("pong_messages_in_total", "pong_messages_out_total", "pong_bytes_in_total", "pong_bytes_out_total",
+                     "pong_connections", "pong_matches", "pong_decode_seconds_count", "pong_state_lock_wait_seconds_count")
+            print("   last scrape: " + ", ".join(f"{name}={last.get(name, 0):g}" for name in shown))
+            if last.get("pong_messages_in_total", 0) <= 0 or last.get("pong_bytes_out_total", 0) <= 0:
+                errors.append("counters never moved")
+        for error in sorted(set(errors)):
+            print(f"   FAIL: {error}")
+        failed = failed or bool(errors)
+    sys.exit(1 if failed else 0)
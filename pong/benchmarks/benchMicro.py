@@ -0,0 +1,353 @@
+# =================================================================================================
+# Contributing Authors:	    Shelby Scoville
+# Email Addresses:          snsc235@uky.edu
+# Date:                     10/18/2026
+# Purpose:                  Microbenchmarks for the per-frame code, with regression checks
+# =================================================================================================
+#
+# Run from the pong/ folder:  python -m benchmarks.benchMicro --output before.json
+#                             (make a change)
+#                             python -m benchmarks.benchMicro --baseline before.json
+#
+# Times the code that runs every tick or every frame, headless under the SDL dummy video and audio
+# drivers: the ball (helperCode's updatePos/hitPaddle and pongSim's moveBall and Simulation.step),
+# the server's send_data and the client's send_update encoding, the threaded server's receive,
+# parse and merge path (Server.receive_messages, the body of handle_client) and the client's
+# receive_updates parsing (read_messages), both driven one message at a time over a socketpair,
+# and a playGame frame drawn with the Renderer, the original full redraw and updateScore.
+#
+# Each sample runs a case long enough (--min-time), with the garbage collector off. Cases are
+# sampled in turn, --repeat rounds of all of them, so a slow few seconds on a busy machine hit
+# every case a little instead of a few cases a lot, and the best sample is kept since noise only
+# ever makes one slower. --output saves the results as JSON; --baseline compares against a saved
+# file and exits with status 1 if any case got more than --threshold slower. On a shared or
+# single-core machine two runs of unchanged code can still differ by 20% or more, hence the 25%
+# default; on a quiet machine --threshold 0.1 works.
+
+import argparse
+import gc
+import json
+import os
+import platform
+import socket
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+import pongClient
+from assets.code.helperCode import Ball, updateScore
+from pongSim import Simulation, moveBall
+from pongProtocol import JSON_CODEC, BINARY_CODEC
+from pongFraming import FrameBuffer
+from pongServer import Server, Connection
+from pongRender import openWindow, WHITE
+
+CODECS = {"json": JSON_CODEC, "binary": BINARY_CODEC}
+
+# Author:   Shelby Scoville
+# Purpose:  A state as the server sends it, partway through a match
+# Pre:      None
+# Post:     Returns a new dictionary
+def sample_state() -> dict:
+    sim = Simulation()
+    for _ in range(37):
+        sim.step()
+    return dict(sim.getState(), score1=3, score2=5, time=123456)
+
+# Author:   Shelby Scoville
+# Purpose:  Reads everything waiting on a non-blocking socket and throws it away
+# Pre:      sock is non-blocking
+# Post:     Nothing is left to read
+def drain(sock: socket.socket) -> None:
+    while True:
+        try:
+            if not sock.recv(1 << 20):
+                return
+        except BlockingIOError:
+            return
+
+# Author:   Shelby Scoville
+# Purpose:  A connected pair of sockets, the second one non-blocking
+# Pre:      closing is a list of things to close when the run is over
+# Post:     Returns (a, b)
+def socket_pair(closing: list) -> tuple:
+    a, b = socket.socketpair()
+    b.setblocking(False)
+    closing += [a, b]
+    return a, b
+
+# Each case sets itself up and returns (run, ops): run() does ops operations of what is measured.
+# Setup cost is not measured.
+
+def case_update_pos(closing: list) -> tuple:
+    ball = Ball(pygame.Rect(320, 240, 5, 5), -5, 3)
+    def run() -> None:
+        for _ in range(1000):
+            ball.updatePos()
+        ball.rect.topleft = (320, 240)
+    return run, 1000
+
+def case_hit_paddle(closing: list) -> tuple:
+    ball = Ball(pygame.Rect(20, 240, 5, 5), -5, 0)
+    def run() -> None:
+        for _ in range(1000):
+            ball.hitPaddle(265)
+    return run, 1000
+
+def case_move_ball_open(closing: list) -> tuple:
+    # The usual tick: nowhere near a paddle or wall
+    sim = Simulation()
+    ball = sim.ball
+    paddles = [sim.leftPaddle, sim.rightPaddle]
+    walls = [sim.topWall, sim.bottomWall]
+    def run() -> None:
+        ball.rect.topleft = (320, 200)
+        ball.xVel, ball.yVel = -5, 1
+        for _ in range(50):
+            moveBall(ball, paddles, walls)
+    return run, 50
+
+def case_move_ball_bounce(closing: list) -> tuple:
+    # Every move hits the left paddle (putting the ball back is part of the cost)
+    sim = Simulation()
+    ball = sim.ball
+    paddles = [sim.leftPaddle, sim.rightPaddle]
+    walls = [sim.topWall, sim.bottomWall]
+    def run() -> None:
+        for _ in range(100):
+            ball.rect.topleft = (22, 230)
+            ball.xVel, ball.yVel = -5, 1
+            moveBall(ball, paddles, walls)
+    return run, 100
+
+def case_simulation_step(closing: list) -> tuple:
+    sims = [Simulation()]
+    def run() -> None:
+        sim = sims[0]
+        for _ in range(1000):
+            # Paddles chase the ball so rallies and bounces happen
+            sim.setInput(1, "down" if sim.ball.rect.y > sim.leftPaddle.rect.centery else "up")
+            sim.setInput(2, "down" if sim.ball.rect.y > sim.rightPaddle.rect.centery + 20 else "up")
+            sim.step()
+            if sim.isOver():
+                sim = sims[0] = Simulation()
+    return run, 1000
+
+def send_data_case(wire: str):
+    def case(closing: list) -> tuple:
+        server = Server("127.0.0.1", 0)
+        closing.append(server.server)
+        a, b = socket_pair(closing)
+        state = sample_state()
+        codec = CODECS[wire]
+        def run() -> None:
+            for _ in range(100):
+                server.send_data(a, state, codec)
+            drain(b)
+        return run, 100
+    return case
+
+def send_update_case(wire: str):
+    def case(closing: list) -> tuple:
+        a, b = socket_pair(closing)
+        codec = CODECS[wire]
+        def run() -> None:
+            for sync in range(100):
+                pongClient.send_update(a, 215, 320, 240, -5, 3, 3, 5, sync, codec)
+            drain(b)
+        return run, 100
+    return case
+
+def receive_merge_case(wire: str):
+    # One update at a time, like a client sending every frame (the peer's send is included)
+    def case(closing: list) -> tuple:
+        server = Server("127.0.0.1", 0)
+        closing.append(server.server)
+        a, b = socket_pair(closing)
+        conn = Connection(b, None)
+        conn.player_id = 1
+        conn.codec = CODECS[wire]
+        messages = [conn.codec.encode("update", {"paddle_y": 215, "ball_x": 320 - sync, "ball_y": 240, "ball_dx": -5,
+                                                 "ball_dy": 3, "score1": 3, "score2": 5, "sync": sync})
+                    for sync in range(100)]
+        def run() -> None:
+            for message in messages:
+                a.send(message)
+                server.receive_messages(conn)
+        return run, 100
+    return case
+
+def receive_updates_case(wire: str):
+    # One state at a time into the client's FrameBuffer, then read_messages (the peer's send is included)
+    def case(closing: list) -> tuple:
+        a, b = socket_pair(closing)
+        frames = FrameBuffer(65536)
+        codec = CODECS[wire]
+        state = sample_state()
+        messages = [codec.encode("state", dict(state, sync=sync)) for sync in range(100)]
+        def reply(kind: str, message: dict) -> None:
+            pass
+        def run() -> None:
+            for message in messages:
+                a.send(message)
+                frames.recv_into(b)
+                pongClient.read_messages(frames, codec, reply)
+        return run, 100
+    return case
+
+# Author:   Shelby Scoville
+# Purpose:  A minute of match to draw: the moving rectangles and score for every tick
+# Pre:      None
+# Post:     Returns a list of (rects, lScore, rScore)
+def recorded_frames(ticks: int =600) -> list:
+    sim = Simulation()
+    frames = []
+    for tick in range(ticks):
+        sim.setInput(1, "down" if sim.ball.rect.y > sim.leftPaddle.rect.centery else "up")
+        sim.setInput(2, "down" if sim.ball.rect.y > sim.rightPaddle.rect.centery + 20 else "up")
+        sim.step()
+        # Points now and then so the score layer gets rebuilt like in a real match
+        score = tick // 150
+        frames.append(([sim.ball.rect.copy(), sim.leftPaddle.rect.copy(), sim.rightPaddle.rect.copy()],
+                       score, score // 2))
+    return frames
+
+def frame_case(dirtyRects: bool):
+    def case(closing: list) -> tuple:
+        renderer = openWindow(640, 480, "benchMicro")
+        renderer.dirtyRects = dirtyRects
+        frames = recorded_frames()
+        def run() -> None:
+            for rects, lScore, rScore in frames:
+                renderer.draw(rects, lScore, rScore)
+        return run, len(frames)
+    return case
+
+def case_update_score(closing: list) -> tuple:
+    renderer = openWindow(640, 480, "benchMicro")
+    def run() -> None:
+        for score in range(100):
+            updateScore(score % 11, score % 7, renderer.screen, WHITE, renderer.scoreFont)
+    return run, 100
+
+CASES = {
+    "ball.updatePos": case_update_pos,
+    "ball.hitPaddle": case_hit_paddle,
+    "moveBall open field": case_move_ball_open,
+    "moveBall paddle bounce": case_move_ball_bounce,
+    "Simulation.step": case_simulation_step,
+    "send_data json": send_data_case("json"),
+    "send_data binary": send_data_case("binary"),
+    "send_update json": send_update_case("json"),
+    "send_update binary": send_update_case("binary"),
+    "handle_client receive json": receive_merge_case("json"),
+    "handle_client receive binary": receive_merge_case("binary"),
+    "receive_updates json": receive_updates_case("json"),
+    "receive_updates binary": receive_updates_case("binary"),
+    "frame dirty rects": frame_case(True),
+    "frame full redraw": frame_case(False),
+    "updateScore": case_update_score,
+}
+
+# Author:   Shelby Scoville
+# Purpose:  How many calls of run make one sample
+# Pre:      None
+# Post:     Returns a call count that takes at least min_time
+def calibrate(run, min_time: float) -> int:
+    run()
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            run()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            return loops
+        loops = max(loops * 2, int(loops * min_time / max(elapsed, 1e-9) * 1.2))
+
+# Author:   Shelby Scoville
+# Purpose:  Runs the selected cases, a round of one sample each at a time
+# Pre:      names are keys of CASES
+# Post:     Returns {name: dict with the best and median time per operation in nanoseconds}
+def run_cases(names: list, repeat: int, min_time: float) -> dict:
+    closing = []
+    try:
+        cases = {}
+        for name in names:
+            run, ops = CASES[name](closing)
+            cases[name] = (run, ops, calibrate(run, min_time))
+        samples = {name: [] for name in names}
+        gc.disable()
+        try:
+            for _ in range(repeat):
+                for name, (run, ops, loops) in cases.items():
+                    started = time.perf_counter()
+                    for _ in range(loops):
+                        run()
+                    samples[name].append((time.perf_counter() - started) / (loops * ops) * 1e9)
+        finally:
+            gc.enable()
+    finally:
+        for thing in closing:
+            thing.close()
+    return {name: {"best_ns": min(values), "median_ns": statistics.median(values), "ops": cases[name][2] * cases[name][1]}
+            for name, values in samples.items()}
+
+# Author:   Shelby Scoville
+# Purpose:  Describes where the numbers came from, saved with them
+# Pre:      None
+# Post:     Returns a dict
+def environment() -> dict:
+    return {"python": platform.python_version(), "pygame": pygame.version.ver, "machine": platform.machine(),
+            "platform": platform.platform(), "cpus": os.cpu_count(), "date": time.strftime("%Y-%m-%d %H:%M:%S")}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Microbenchmarks for the per-frame code, with regression checks")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this")
+    parser.add_argument("--repeat", type=int, default=15, help="samples per case")
+    parser.add_argument("--min-time", type=float, default=0.05, help="seconds per sample")
+    parser.add_argument("--output", help="save the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against results saved with --output")
+    parser.add_argument("--threshold", type=float, default=0.25, help="slowdown that counts as a regression")
+    args = parser.parse_args()
+
+    names = [name for name in CASES if args.filter.lower() in name.lower()]
+    pygame.init()
+    results = run_cases(names, args.repeat, args.min_time)
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            saved = json.load(f)
+        baseline = saved["results"]
+        if saved["environment"]["platform"] != environment()["platform"]:
+            print(f"note: the baseline was measured on {saved['environment']['platform']}")
+
+    regressions = []
+    print(f"{'case':<30} {'best':>10} {'median':>10} {'baseline':>10} {'change':>8}")
+    for name, result in results.items():
+        line = f"{name:<30} {result['best_ns']:8.0f}ns {result['median_ns']:8.0f}ns"
+        if name in baseline:
+            change = result["best_ns"] / baseline[name]["best_ns"] - 1
+            line += f" {baseline[name]['best_ns']:8.0f}ns {change * 100:+7.1f}%"
+            if change > args.threshold:
+                line += "  REGRESSED"
+                regressions.append(name)
+        elif baseline:
+            line += f" {'new':>10}"
+        print(line)
+    print("times are per operation (one call, one message or one frame), best and median of the samples")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"environment": environment(), "results": results}, f, indent=2)
+        print(f"saved to {args.output}")
+    if regressions:
+        print(f"FAIL: {len(regressions)} case(s) more than {args.threshold * 100:g}% slower than the baseline: "
+              f"{', '.join(regressions)}")
+    sys.exit(1 if regressions else 0)
@@ -0,0 +1,155 @@
+# =================================================================================================
+# Contributing Authors:	    Shelby Scoville
+# Email Addresses:          snsc235@uky.edu
+# Date:                     10/18/2026
+# Purpose:                  Measures what the frame profiler costs and checks what it records
+# =================================================================================================
+#
+# Run from the pong/ folder:  python -m benchmarks.benchProfile --frames 5000
+#
+# Runs a playGame-like frame (events, state_lock, Simulation.step, Renderer.draw) headless under
+# the SDL dummy drivers three ways, alternating in rounds: with no profiling code at all, with the
+# "if lane is not None" checks and profiling off, and with profiling on. Reports the time per frame
+# of each. Then checks with a small ring buffer that:
+#   - only the newest spans are kept, oldest first, after it has wrapped around many times
+#   - the phases of every frame add up to that frame and lie inside it
+#   - the Chrome trace is valid JSON with one complete event per kept span
+# Exits with status 1 if a check fails (timings are only reported, they are too noisy to fail on).
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from pongSim import Simulation
+from pongRender import openWindow
+from pongProfile import FrameProfiler, PHASES, FRAME, EVENTS, LOCK_WAIT, STATE, PHYSICS, DISPLAY, FRAME_CAP, SEND
+
+# Author:   Shelby Scoville
+# Purpose:  A frame of playGame's work with no profiling code, to compare against
+# Pre:      renderer is from openWindow
+# Post:     sim has stepped once and the frame is drawn
+def plain_frame(sim: Simulation, renderer, lock: threading.Lock) -> None:
+    pygame.event.get()
+    with lock:
+        state = sim.getState()
+    sim.step()
+    renderer.draw([sim.ball.rect, sim.leftPaddle.rect, sim.rightPaddle.rect], state["score1"], state["score2"])
+
+# Author:   Shelby Scoville
+# Purpose:  The same frame, marking its phases the way playGame does
+# Pre:      lane is a Lane or None, and is also renderer.lane
+# Post:     Same as plain_frame, with the phases recorded if lane is not None
+def profiled_frame(sim: Simulation, renderer, lock: threading.Lock, lane) -> None:
+    pygame.event.get()
+    if lane is not None:
+        lane.lap(EVENTS)
+    with lock:
+        if lane is not None:
+            lane.lap(LOCK_WAIT)
+        state = sim.getState()
+    if lane is not None:
+        lane.lap(STATE)
+    sim.step()
+    if lane is not None:
+        lane.lap(PHYSICS)
+    renderer.draw([sim.ball.rect, sim.leftPaddle.rect, sim.rightPaddle.rect], state["score1"], state["score2"])
+    if lane is not None:
+        lane.lap(DISPLAY)
+        lane.lap(FRAME_CAP)
+        lane.lap(SEND)
+        lane.frame()
+
+# Author:   Shelby Scoville
+# Purpose:  Times the three ways of running a frame
+# Pre:      None
+# Post:     Returns {"plain"|"off"|"on": best time per frame in microseconds}
+def time_frames(frames: int, rounds: int) -> dict:
+    renderer = openWindow(640, 480)
+    lock = threading.Lock()
+    lane = FrameProfiler().lane("playGame")
+    ways = {
+        "plain": lambda sim: plain_frame(sim, renderer, lock),
+        "off": lambda sim: profiled_frame(sim, renderer, lock, None),
+        "on": lambda sim: profiled_frame(sim, renderer, lock, lane),
+    }
+    samples = {name: [] for name in ways}
+    for _ in range(rounds):
+        for name, frame in ways.items():
+            renderer.lane = lane if name == "on" else None
+            sim = Simulation()
+            started = time.perf_counter()
+            for _ in range(frames):
+                frame(sim)
+                if sim.isOver():
+                    sim = Simulation()
+            samples[name].append((time.perf_counter() - started) / frames * 1e6)
+    return {name: (min(values), statistics.median(values)) for name, values in samples.items()}
+
+# Author:   Shelby Scoville
+# Purpose:  Runs the recording checks on a small ring buffer
+# Pre:      None
+# Post:     Returns a list of failure messages, empty if everything held
+def check_recording(frames: int) -> list:
+    failures = []
+    renderer = openWindow(640, 480)
+    lock = threading.Lock()
+    profiler = FrameProfiler(capacity=256)
+    lane = renderer.lane = profiler.lane("playGame")
+    sim = Simulation()
+    for _ in range(frames):
+        profiled_frame(sim, renderer, lock, lane)
+
+    spans = lane.spans()
+    if len(spans) != 256 or lane.count != frames * 9:
+        failures.append(f"kept {len(spans)} of {lane.count} spans, expected 256 of {frames * 9}")
+    if any(b[2] < a[2] for a, b in zip(spans, spans[1:])):
+        failures.append("spans are not oldest first")
+
+    # Every whole frame still in the buffer: its phases tile it exactly
+    phases = []
+    for phase, start, end in spans:
+        if phase != FRAME:
+            phases.append((start, end))
+            continue
+        if len(phases) == 8:
+            if (abs(phases[0][0] - start) > 1e-9 or abs(phases[-1][1] - end) > 1e-9
+                    or any(abs(a[1] - b[0]) > 1e-9 for a, b in zip(phases, phases[1:]))):
+                failures.append(f"phases do not add up to the frame at {start:.6f}")
+                break
+        phases = []
+
+    trace = json.loads(json.dumps(profiler.trace()))
+    complete = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+    if len(complete) != len(spans) or any(event["name"] not in PHASES or event["dur"] < 0 for event in complete):
+        failures.append("trace does not hold one valid complete event per span")
+    return failures
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Frame profiler overhead and recording checks")
+    parser.add_argument("--frames", type=int, default=5000, help="frames per timing run")
+    parser.add_argument("--rounds", type=int, default=5, help="timing runs of each kind, alternating")
+    args = parser.parse_args()
+
+    results = time_frames(args.frames, args.rounds)
+    print(f"{'profiling':<28} {'best':>10} {'median':>10}")
+    for name, label in (("plain", "no profiling code"), ("off", "off (lane is None checks)"), ("on", "on")):
+        best, median = results[name]
+        print(f"{label:<28} {best:8.2f}us {median:8.2f}us")
+    plain = results["plain"][0]
+    print(f"off costs {results['off'][0] - plain:+.2f}us per frame, on costs {results['on'][0] - plain:+.2f}us per frame")
+
+    failures = check_recording(1000)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("ring buffer, frame phases and trace export check out")
+    sys.exit(1 if failures else 0)
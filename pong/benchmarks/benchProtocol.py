@@ -0,0 +1,40 @@
+# =================================================================================================
+# Contributing Authors:	    Shelby Scoville
+# Email Addresses:          snsc235@uky.edu
+# Date:                     10/18/2026
+# Purpose:                  Compares the JSON and binary wire formats (encode/decode time, bytes)
+# =================================================================================================
+#
+# Run from the pong/ folder:  python -m benchmarks.benchProtocol
+
+import argparse
+import timeit
+
+from pongProtocol import JSON_CODEC, BINARY_CODEC
+
+SAMPLES = {
+    "state": {"ball_x": 320, "ball_y": 240, "ball_dx": -5, "ball_dy": 3, "p1_y": 215,
+              "p2_y": 180, "score1": 4, "score2": 7, "sync": 123456, "p1_seq": 31, "p2_seq": 17,
+              "time": 3600000},
+    "update": {"paddle_y": 215, "ball_x": 320, "ball_y": 240, "ball_dx": -5, "ball_dy": 3,
+               "score1": 4, "score2": 7, "sync": 123456},
+    "input": {"moving": "up", "seq": 42},
+}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Wire format benchmark")
+    parser.add_argument("--number", type=int, default=200000)
+    args = parser.parse_args()
+
+    print(f"{'message':8} {'format':7} {'bytes':>6} {'encode ns':>10} {'decode ns':>10} {'60Hz B/s':>9}")
+    for kind, data in SAMPLES.items():
+        for codec in (JSON_CODEC, BINARY_CODEC):
+            frame = codec.encode(kind, data)
+            assert codec.decode(frame)[0] == data
+            encode = timeit.timeit(lambda: codec.encode(kind, data), number=args.number)
+            decode = timeit.timeit(lambda: codec.decode(frame), number=args.number)
+            print(f"{kind:8} {codec.name:7} {len(frame):6d} {encode*1e9/args.number:10.0f} "
+                  f"{decode*1e9/args.number:10.0f} {len(frame)*60:9d}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# =================================================================================================
+# Contributing Authors:	    Shelby Scoville
+# Email Addresses:          snsc235@uky.edu
+# Date:                     10/18/2026
+# Purpose:                  Measures frame time for full redraws vs the dirty-rectangle renderer
+# =================================================================================================
+#
+# Run from the pong/ folder:  python -m benchmarks.benchRender --frames 5000
+#
+# Plays a match with pongSim and draws every tick with both renderers under the SDL dummy video
+# driver (no window needed). Both draw onto their own screen-sized surface so the results can be
+# compared pixel for pixel; any difference is reported as a mismatch. Only draw time is measured,
+# not the simulation.
+
+import argparse
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from pongSim import Simulation
+from pongRender import Renderer
+
+# Author:   Shelby Scoville
+# Purpose:  Builds the walls and center line the way playGame does
+# Pre:      None
+# Post:     Returns the list of static rectangles
+def staticRects(screenWidth: int, screenHeight: int) -> list:
+    rects = [pygame.Rect(-10,0,screenWidth+20, 10), pygame.Rect(-10, screenHeight-10, screenWidth+20, 10)]
+    for i in range(0, screenHeight, 10):
+        rects.append(pygame.Rect((screenWidth/2)-5,i,5,5))
+    return rects
+
+# Author:   Shelby Scoville
+# Purpose:  Returns the value at fraction p of a sorted list
+# Pre:      values is sorted and not empty
+# Post:     Returns one element of values
+def percentile(values: list, p: float) -> float:
+    return values[min(len(values) - 1, int(p * len(values)))]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Frame time of full redraws vs dirty rectangles")
+    parser.add_argument("--frames", type=int, default=5000)
+    parser.add_argument("--check-every", type=int, default=50, help="compare the two screens every N frames")
+    args = parser.parse_args()
+
+    pygame.init()
+    screenWidth, screenHeight = 640, 480
+    display = pygame.display.set_mode((screenWidth, screenHeight))
+    scoreFont = pygame.font.Font("./assets/fonts/pong-score.ttf", 32)
+    winFont = pygame.font.Font("./assets/fonts/visitor.ttf", 48)
+
+    # Each renderer draws to the real display in turn, a copy of each result is kept for the check
+    walls = staticRects(screenWidth, screenHeight)
+    renderers = {"full": Renderer(display, walls, scoreFont, winFont, dirtyRects=False),
+                 "dirty": Renderer(display, walls, scoreFont, winFont)}
+    screens = {name: pygame.Surface((screenWidth, screenHeight)).convert() for name in renderers}
+    times = {name: [] for name in renderers}
+    pixels = {name: 0 for name in renderers}
+    mismatches = 0
+
+    sim = Simulation(screenWidth, screenHeight)
+    for frame in range(args.frames):
+        # Paddles follow the ball so points are long, scores still change now and then
+        for paddle, playerId in ((sim.leftPaddle, 1), (sim.rightPaddle, 2)):
+            centre = paddle.rect.centery + (frame // 97 % 3 - 1) * 30
+            sim.setInput(playerId, "down" if sim.ball.rect.y > centre else "up" if sim.ball.rect.y < centre else "")
+        sim.step()
+        winText = None
+        if sim.isOver():
+            winText = "Player 1 Wins! " if sim.lScore > sim.rScore else "Player 2 Wins! "
+        moving = [sim.ball.rect if winText is None else None, sim.leftPaddle.rect, sim.rightPaddle.rect]
+
+        for name, renderer in renderers.items():
+            # Put back what this renderer drew last frame, as if it owned the window
+            display.blit(screens[name], (0,0))
+            started = time.perf_counter()
+            dirty = renderer.draw(moving, sim.lScore, sim.rScore, winText)
+            times[name].append(time.perf_counter() - started)
+            pixels[name] += sum(rect.width * rect.height for rect in dirty)
+            screens[name].blit(display, (0,0))
+
+        if frame % args.check_every == 0:
+            if pygame.image.tostring(screens["full"], "RGB") != pygame.image.tostring(screens["dirty"], "RGB"):
+                mismatches += 1
+        if winText:
+            sim = Simulation(screenWidth, screenHeight)
+
+    print(f"{args.frames} frames, SDL video driver {pygame.display.get_driver()}")
+    print(f"{'renderer':>8} {'mean ms':>9} {'p50 ms':>8} {'p99 ms':>8} {'max fps':>9} {'px pushed/frame':>16}")
+    for name in renderers:
+        values = sorted(times[name])
+        mean = sum(values) / len(values)
+        print(f"{name:>8} {mean * 1000:9.4f} {percentile(values, 0.5) * 1000:8.4f} {percentile(values, 0.99) * 1000:8.4f}"
+              f" {1 / mean:9.0f} {pixels[name] / args.frames:16.0f}")
+    speedup = sum(times["full"]) / sum(times["dirty"])
+    print(f"dirty rectangles are {speedup:.1f}x faster per frame, {mismatches} pixel mismatches "
+          f"in {len(range(0, args.frames, args.check_every))} checked frames")
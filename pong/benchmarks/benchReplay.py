@@ -0,0 +1,143 @@
+# =================================================================================================
+# Contributing Authors:	    Shelby Scoville
+# Email Addresses:          snsc235@uky.edu
+# Date:                     10/18/2026
+# Purpose:                  Measures replay recording overhead per tick and seek time on long files
+# =================================================================================================
+#
+# Run from the pong/ folder:  python -m benchmarks.benchReplay --hours 3
+#
+# An authoritative match (random paddle input, the score reset whenever someone wins) is simulated
+# for --hours of game time at --tick-rate, once bare and once with a Recorder, on a simulated clock
+# so the file covers hours without taking them. The difference is the recording cost per tick.
+# The file is then opened (with its footer index, and again cut short without one) and random
+# ticks and times are looked up. Sampled ticks must rebuild to exactly the state that was
+# recorded; exits with status 1 if one does not.
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from pongSim import Simulation
+from pongReplay import Recorder, ReplayWriter, Replay
+from pongBots import percentile
+
+# Author:   Shelby Scoville
+# Purpose:  Plays a match for a number of ticks, recording it if a recorder is given
+# Pre:      Same seed gives the same match
+# Post:     Returns (seconds spent, {tick: state} for the ticks in sample)
+def play(ticks: int, tick_rate: float, recorder: Recorder =None, sample: set =frozenset(), seed: int =1) -> tuple:
+    rng = random.Random(seed)
+    sim = Simulation()
+    # Input changes are drawn up front so both runs spend the same time on them
+    changes = {tick: (rng.choice(("up", "down", "")), rng.choice(("up", "down", ""))) for tick in range(0, ticks, 20)}
+    truth = {}
+    started = time.perf_counter()
+    for tick in range(ticks):
+        change = changes.get(tick)
+        if change is not None:
+            sim.setInput(1, change[0], tick)
+            sim.setInput(2, change[1], tick)
+        sim.step()
+        if sim.isOver():
+            sim.lScore = sim.rScore = 0
+        state = sim.getState()
+        if recorder is not None:
+            now = recorder.started + tick / tick_rate
+            recorder.record(state, now)
+            if tick in sample:
+                state["time"] = int((now - recorder.started) * 1000) & 0xFFFFFFFF
+                truth[tick] = state
+    return time.perf_counter() - started, truth
+
+# Author:   Shelby Scoville
+# Purpose:  Times a lookup function on many arguments
+# Pre:      None
+# Post:     Returns the sorted times in microseconds
+def time_calls(function, arguments: list) -> list:
+    times = []
+    for argument in arguments:
+        started = time.perf_counter()
+        function(argument)
+        times.append((time.perf_counter() - started) * 1e6)
+    return sorted(times)
+
+def summary(times: list) -> str:
+    return (f"p50 {percentile(times, 0.5):.1f}us p99 {percentile(times, 0.99):.1f}us "
+            f"max {times[-1]:.1f}us")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay recording overhead and seek latency")
+    parser.add_argument("--hours", type=float, default=3.0, help="game time to record")
+    parser.add_argument("--tick-rate", type=float, default=60.0)
+    parser.add_argument("--keyframe-interval", type=int, default=60)
+    parser.add_argument("--seeks", type=int, default=5000)
+    args = parser.parse_args()
+
+    ticks = int(args.hours * 3600 * args.tick_rate)
+    folder = tempfile.mkdtemp()
+    path = os.path.join(folder, "bench.pongrep")
+    failed = False
+    try:
+        # Every recorded tick is a state transition (sync goes up each tick), so tick == record
+        sample = set(random.sample(range(ticks), min(ticks, 1000)))
+        bare, _ = play(ticks, args.tick_rate)
+        writer = ReplayWriter()
+        recorder = Recorder(path, writer, args.keyframe_interval)
+        recorded, truth = play(ticks, args.tick_rate, recorder, sample)
+        started = time.perf_counter()
+        recorder.close()
+        writer.close()
+        drain = time.perf_counter() - started
+        size = os.path.getsize(path)
+        print(f"{ticks} ticks ({args.hours:g}h at {args.tick_rate:g}/s), {size / 1e6:.1f}MB, {size / ticks:.1f} bytes per tick")
+        print(f"simulation {bare / ticks * 1e6:.2f}us per tick, with recording {recorded / ticks * 1e6:.2f}us "
+              f"(+{(recorded - bare) / ticks * 1e6:.2f}us), writer drained in {drain * 1000:.1f}ms at close")
+
+        started = time.perf_counter()
+        replay = Replay(path)
+        opened = time.perf_counter() - started
+        print(f"open with footer index: {opened * 1000:.2f}ms ({len(replay.keyframes)} keyframes)")
+
+        # A recording cut short by a crash: no footer, the last record half written
+        cut_path = os.path.join(folder, "cut.pongrep")
+        with open(path, "rb") as source, open(cut_path, "wb") as cut:
+            cut.write(source.read(replay.end - 5))
+        started = time.perf_counter()
+        cut_replay = Replay(cut_path)
+        scanned = time.perf_counter() - started
+        print(f"open without footer (index rebuilt by scanning): {scanned * 1000:.1f}ms, {len(cut_replay)} ticks recovered")
+        if len(cut_replay) != len(replay) - 1 or cut_replay.keyframes[-1] != replay.keyframes[-1]:
+            print("FAIL: scanning did not rebuild the index")
+            failed = True
+        cut_replay.close()
+
+        ticks_to_seek = [random.randrange(len(replay)) for _ in range(args.seeks)]
+        print(f"seek to a random tick: {summary(time_calls(replay.state_at, ticks_to_seek))}")
+        duration = replay.duration_ms()
+        times_to_seek = [random.randrange(duration) for _ in range(args.seeks)]
+        print(f"seek to a random time: {summary(time_calls(replay.tick_at, times_to_seek))}")
+
+        # What seeking costs without the index: walking every record from the start
+        last = len(replay) - 1
+        started = time.perf_counter()
+        for _ in replay.states(0, len(replay)):
+            pass
+        print(f"seek to the last tick by reading from the start: {(time.perf_counter() - started) * 1000:.0f}ms")
+
+        wrong = [tick for tick, state in truth.items() if replay.state_at(tick) != state]
+        streamed = dict(replay.states(last - 500, last + 1))
+        wrong += [tick for tick in truth if tick in streamed and streamed[tick] != truth[tick]]
+        if len(replay) != ticks or wrong:
+            print(f"FAIL: {len(replay)} ticks in the file, {len(wrong)} sampled ticks rebuilt wrong")
+            failed = True
+        else:
+            print(f"{len(truth)} sampled ticks rebuilt exactly")
+        replay.close()
+    finally:
+        shutil.rmtree(folder)
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,138 @@
+# =================================================================================================
+# Contributing Authors:	    Shelby Scoville
+# Email Addresses:          snsc235@uky.edu
+# Date:                     10/18/2026
+# Purpose:                  Shows how many matches a sharded server serves as workers are added
+# =================================================================================================
+#
+# Run from the pong/ folder:  python -m benchmarks.benchShard --workers 1 2 4 --matches 1500
+#
+# For each worker count an authoritative sharded server (pongServer.py --workers N) runs in its
+# own process tree and --load-procs processes connect 2 * --matches clients to it. Clients never
+# send anything, so they stay on full JSON states, and only count the states they receive. After
+# --warmup seconds each client's rate is measured for --duration seconds. A match is served when
+# its players get at least 90% of the tick rate; with more matches than one core can tick, the
+# served count should grow with the worker count until the host runs out of cores (or the load
+# processes do, since they share the host).
+
+import argparse
+import multiprocessing
+import os
+import selectors
+import socket
+import subprocess
+import sys
+import time
+
+from pongServer import raise_file_limit
+
+# Author:   Shelby Scoville
+# Purpose:  Starts a sharded authoritative server on a free port
+# Pre:      Run from the pong/ folder
+# Post:     Returns the process and the port it is listening on
+def start_server(workers: int, tick_rate: float) -> tuple:
+    proc = subprocess.Popen(
+        [sys.executable, "pongServer.py", "--mode", "event", "--authoritative", "--tick-rate", str(tick_rate),
+         "--workers", str(workers), "--host", "127.0.0.1", "--port", "0"],
+        stdout=subprocess.PIPE, text=True)
+    line = proc.stdout.readline()
+    while not line.startswith("Server started"):
+        line = proc.stdout.readline()
+    port = int(line.strip().rsplit(":", 1)[1])
+    return proc, port
+
+# Author:   Shelby Scoville
+# Purpose:  One load process: connects clients, then counts the states each one receives
+# Pre:      Server is listening on port
+# Post:     Puts the list of states per second per client on results
+def load(port: int, clients: int, warmup: float, duration: float, go, results) -> None:
+    raise_file_limit()
+    selector = selectors.DefaultSelector()
+    counts = []
+    for i in range(clients):
+        sock = socket.create_connection(("127.0.0.1", port))
+        sock.setblocking(False)
+        selector.register(sock, selectors.EVENT_READ, i)
+        counts.append(0)
+    results.put("ready")
+    go.wait()
+
+    measuring = False
+    start = time.perf_counter() + warmup
+    end = start + duration
+    while True:
+        now = time.perf_counter()
+        if now >= end:
+            break
+        if not measuring and now >= start:
+            measuring = True
+        for key, _ in selector.select(0.05):
+            try:
+                chunk = key.fileobj.recv(65536)
+            except (BlockingIOError, InterruptedError):
+                continue
+            if not chunk:
+                selector.unregister(key.fileobj)
+                continue
+            if measuring:
+                counts[key.data] += chunk.count(b"\n")
+    results.put([count / duration for count in counts])
+    for key in list(selector.get_map().values()):
+        key.fileobj.close()
+
+# Author:   Shelby Scoville
+# Purpose:  Measures one worker count
+# Pre:      None
+# Post:     Returns a dict of measurements
+def run(workers: int, matches: int, tick_rate: float, load_procs: int, warmup: float, duration: float) -> dict:
+    started = time.perf_counter()
+    proc, port = start_server(workers, tick_rate)
+    results = multiprocessing.Queue()
+    go = multiprocessing.Event()
+    clients = 2 * matches
+    procs = []
+    for i in range(load_procs):
+        share = clients // load_procs + (1 if i < clients % load_procs else 0)
+        procs.append(multiprocessing.Process(target=load, args=(port, share, warmup, duration, go, results)))
+        procs[-1].start()
+    for _ in procs:
+        results.get(timeout=120)
+    go.set()
+    rates = []
+    for _ in procs:
+        rates += results.get(timeout=warmup + duration + 60)
+    for p in procs:
+        p.join()
+
+    # SIGTERM makes the parent shut its workers down and reap them, so wait4 counts their CPU too
+    wall = time.perf_counter() - started
+    proc.terminate()
+    # Workers print as they close their matches, read until the last of them has exited
+    for _ in proc.stdout:
+        pass
+    _, _, usage = os.wait4(proc.pid, 0)
+    rates.sort()
+    full = sum(1 for rate in rates if rate >= 0.9 * tick_rate)
+    return {"served": full // 2, "median": rates[len(rates) // 2], "lowest": rates[0],
+            "cpu": usage.ru_utime + usage.ru_stime, "wall": wall}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sharded server scaling with worker count")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--matches", type=int, default=1500)
+    parser.add_argument("--tick-rate", type=float, default=60.0)
+    parser.add_argument("--load-procs", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+    raise_file_limit()
+
+    print(f"{args.matches} authoritative matches at {args.tick_rate:g} ticks/s, {args.load_procs} load processes, "
+          f"{os.cpu_count()} CPU cores on this host")
+    print(f"{'workers':>7} {'served':>8} {'states/s p50':>12} {'lowest':>8} {'server cpu':>11}")
+    for workers in args.workers:
+        result = run(workers, args.matches, args.tick_rate, args.load_procs, args.warmup, args.duration)
+        print(f"{workers:>7} {result['served']:>8} {result['median']:12.1f} {result['lowest']:8.1f} "
+              f"{result['cpu'] / result['wall'] * 100:10.0f}%")
+    print("served: matches whose players got at least 90% of the tick rate, server cpu: parent and workers")
+    print("together, averaged from server start (connecting included) to shutdown (100% = one core)")
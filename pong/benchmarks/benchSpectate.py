@@ -0,0 +1,160 @@
+# =================================================================================================
+# Contributing Authors:	    Shelby Scoville
+# Email Addresses:          snsc235@uky.edu
+# Date:                     10/18/2026
+# Purpose:                  Shows what hundreds of spectators per match cost the players
+# =================================================================================================
+#
+# Run from the pong/ folder:  python -m benchmarks.benchSpectate --matches 2 --spectators 0 100 500
+#
+# For each spectator count an authoritative event loop server and a SpectatorHub run in this
+# process, bots from pongBots play --matches matches, and one more process per match connects that
+# many spectators to it (plus --slow ones that never read after the handshake) and reads them.
+# Reported: the game server thread's CPU and tick time and the bots' reply latency (the players'
+# path), the hub thread's CPU, how many encodes served how many writes, and how many states a second
+# the spectators got and how fresh they were. The first count should be 0 to give the baseline.
+
+import argparse
+import multiprocessing
+import selectors
+import socket
+import threading
+import time
+
+from pongServer import EventServer, raise_file_limit
+from pongSpectate import SpectatorHub, connect_spectator
+from pongProtocol import JSON_CODEC
+from pongClock import stamp_ms
+from pongBots import run_load, percentile
+
+# Author:   Shelby Scoville
+# Purpose:  Spectator side, run in its own process so reading does not compete with the server
+# Pre:      A hub listens on port, match will start soon
+# Post:     Puts a dict of what the readers saw on results
+def watch(port: int, match: int, per_match: int, slow: int, duration: float, wire_format: str, results) -> None:
+    raise_file_limit()
+    selector = selectors.DefaultSelector()
+    readers = []
+    stalled = []
+    for _ in range(per_match):
+        sock, codec, _, frames = connect_spectator("127.0.0.1", port, match, wire_format)
+        sock.setblocking(False)
+        reader = {"sock": sock, "codec": codec, "frames": frames, "states": 0}
+        selector.register(sock, selectors.EVENT_READ, reader)
+        readers.append(reader)
+    for _ in range(slow):
+        # A tiny receive buffer that is never read backs up quickly
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 2048)
+        sock.connect(("127.0.0.1", port))
+        sock.sendall(JSON_CODEC.encode("control", {"watch": match}))
+        stalled.append(sock)
+    results.put({"ready": True})
+
+    latencies = []
+    started = time.perf_counter()
+    end = started + duration
+    while time.perf_counter() < end:
+        for key, _ in selector.select(0.1):
+            reader = key.data
+            try:
+                if not reader["frames"].recv_into(reader["sock"]):
+                    selector.unregister(reader["sock"])
+                    continue
+            except (BlockingIOError, InterruptedError):
+                continue
+            received = stamp_ms()
+            while True:
+                data, found = reader["frames"].next_message(reader["codec"])
+                if not found:
+                    break
+                if isinstance(data, dict) and "ball_x" in data:
+                    reader["states"] += 1
+                    latencies.append((received - data["time"]) & 0xFFFFFFFF)
+    elapsed = time.perf_counter() - started
+    # States the reader skipped because a newer one was right behind were still delivered
+    delivered = sum(reader["states"] + reader["frames"].skipped for reader in readers)
+    results.put({"states_per_s": delivered / max(1, len(readers)) / elapsed, "latencies": latencies})
+    for reader in readers:
+        reader["sock"].close()
+    for sock in stalled:
+        sock.close()
+
+# Author:   Shelby Scoville
+# Purpose:  Runs the event loop server in this thread until stop is set
+# Pre:      server is an EventServer
+# Post:     Appends the CPU time this thread used to cpu
+def serve(server: EventServer, stop: threading.Event, cpu: list) -> None:
+    started = time.thread_time()
+    while not stop.is_set():
+        server.serve_once(0.05)
+    cpu.append(time.thread_time() - started)
+
+# Author:   Shelby Scoville
+# Purpose:  Plays one round with a given number of spectators per match
+# Pre:      None
+# Post:     Returns a dict of measurements
+def run(matches: int, per_match: int, slow: int, duration: float, wire_format: str, stall_timeout: float) -> dict:
+    hub = SpectatorHub("127.0.0.1", 0, 60.0, max_per_match=per_match + slow, stall_timeout=stall_timeout)
+    hub.start()
+    server = EventServer("127.0.0.1", 0, tick_rate=60.0, spectators=hub)
+    stop = threading.Event()
+    cpu = []
+    server_thread = threading.Thread(target=serve, args=(server, stop, cpu), daemon=True)
+    server_thread.start()
+
+    results = multiprocessing.Queue()
+    watchers = []
+    if per_match or slow:
+        for match in range(1, matches + 1):
+            watcher = multiprocessing.Process(target=watch, args=(hub.port, match, per_match, slow, duration + 1.0,
+                                                                  wire_format, results))
+            watcher.start()
+            watchers.append(watcher)
+        for _ in watchers:
+            results.get(timeout=120)
+
+    bots = run_load("127.0.0.1", server.port, 2 * matches, 60.0, duration)
+    watched = None
+    if watchers:
+        reports = [results.get(timeout=60) for _ in watchers]
+        latencies = sorted(latency for report in reports for latency in report["latencies"])
+        watched = {"states_per_s": sum(report["states_per_s"] for report in reports) / len(reports),
+                   "latency_p50": percentile(latencies, 0.5), "latency_p99": percentile(latencies, 0.99)}
+    stop.set()
+    server_thread.join()
+    ticks = server.tick_stats.ticks
+    tick_ms = server.tick_stats.busy / max(1, ticks) * 1000
+    server.close()
+    hub.close()
+    for watcher in watchers:
+        watcher.join()
+    return {"server_cpu": cpu[0] / duration, "tick_ms": tick_ms, "bots": bots, "hub_cpu": hub.cpu / duration,
+            "encodes": hub.encodes, "writes": hub.writes, "dropped": hub.dropped, "evictions": hub.evictions,
+            "watched": watched}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Spectator fan-out cost for the players")
+    parser.add_argument("--matches", type=int, default=2)
+    parser.add_argument("--spectators", type=int, nargs="+", default=[0, 100, 500], help="spectators per match")
+    parser.add_argument("--slow", type=int, default=5, help="spectators per match that never read")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--format", choices=["json", "binary"], default="binary")
+    parser.add_argument("--stall-timeout", type=float, default=3.0)
+    args = parser.parse_args()
+    raise_file_limit()
+
+    print(f"{args.matches} authoritative matches at 60 ticks/s, {args.format} spectators, {args.duration:g}s each")
+    print(f"{'watchers':>8} {'server':>7} {'tick':>7} {'bot p50':>8} {'bot p99':>8} {'hub':>6} {'encodes':>8} "
+          f"{'writes':>8} {'states/s':>8} {'lag p50':>8} {'lag p99':>8} {'dropped':>8} {'evicted':>8}")
+    for per_match in args.spectators:
+        slow = args.slow if per_match else 0
+        result = run(args.matches, per_match, slow, args.duration, args.format, args.stall_timeout)
+        watched = result["watched"] or {"states_per_s": 0, "latency_p50": 0, "latency_p99": 0}
+        latency = result["bots"]["latency_ms"]
+        print(f"{per_match:>8} {result['server_cpu'] * 100:6.1f}% {result['tick_ms']:6.3f}ms {latency['p50']:6.2f}ms "
+              f"{latency['p99']:6.2f}ms {result['hub_cpu'] * 100:5.1f}% {result['encodes']:>8} {result['writes']:>8} "
+              f"{watched['states_per_s']:8.1f} {watched['latency_p50']:6.0f}ms {watched['latency_p99']:6.0f}ms "
+              f"{result['dropped']:>8} {result['evictions']:>8}")
+    print("server: game server thread CPU (one core = 100%), tick: time per tick including publishing to the hub,")
+    print("hub: spectator thread CPU, lag: age of a state when a spectator read it, dropped/evicted: slow spectators")
@@ -0,0 +1,153 @@
+# =================================================================================================
+# Contributing Authors:	    Shelby Scoville
+# Email Addresses:          snsc235@uky.edu
+# Date:                     10/18/2026
+# Purpose:                  Measures the client's time from process start to the first frame
+# =================================================================================================
+#
+# Run from the pong/ folder:  python -m benchmarks.benchStartup --runs 5 --rtt 0.05
+#
+# Starts client processes headless (SDL dummy drivers) against a local server that answers like
+# the threaded server, and times from starting the process until the client prints that its first
+# frame was drawn. Two ways of starting, alternating:
+#   - old: the previous order. pygame and tkinter imported up front, then connect, then pygame's
+#     init and the fonts and sounds loaded from the loose files in assets/
+#   - new: pongClient.py --host ... --headless, which imports pygame and decodes the asset pack on
+#     a background thread while it connects and waits for init_data
+# The server waits 1.5 x --rtt before sending init_data, like a connect and a reply over a link
+# with that round trip time, which is the time the new way gets to load in.
+# Also times opening and decoding the assets from the pack vs the loose files, and checks that the
+# pack holds exactly the loose files (exits with status 1 if not, rebuild it with pongAssets.py).
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from pongServer import make_init_data
+from pongProtocol import JSON_CODEC
+from pongAssets import ASSET_FILES, AssetPack, LooseFiles, PACK_PATH
+
+# The client before this change, launched the same way apart from the start screen
+OLD_LAUNCH = """
+import sys, time
+import pygame
+import tkinter
+import pongClient, pongAssets
+pongClient.openAssets = lambda: pongAssets.LooseFiles()
+pongClient.launch_time = time.perf_counter()
+status = pongClient.ConsoleStatus()
+pongClient.joinServer("127.0.0.1", sys.argv[1], status, status)
+"""
+
+# Author:   Shelby Scoville
+# Purpose:  Accepts clients and sends each one the threaded server's init_data after a delay
+# Pre:      listener is listening
+# Post:     Runs until the listener is closed; clients are read from and never answered again
+def serve(listener: socket.socket, delay: float) -> None:
+    while True:
+        try:
+            sock, _ = listener.accept()
+        except OSError:
+            return
+        def client(sock: socket.socket) -> None:
+            time.sleep(delay)
+            try:
+                sock.sendall(JSON_CODEC.encode("state", make_init_data("left")))
+                while sock.recv(65536):
+                    pass
+            except OSError:
+                pass
+            sock.close()
+        threading.Thread(target=client, args=(sock,), daemon=True).start()
+
+# Author:   Shelby Scoville
+# Purpose:  Starts one client and waits for its first frame
+# Pre:      command starts a client that prints "First frame" once it has drawn one
+# Post:     Returns seconds from starting the process until that line, the process is killed
+def time_launch(command: list, timeout: float =30.0) -> float:
+    started = time.perf_counter()
+    proc = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    try:
+        for line in proc.stdout:
+            if line.startswith("First frame"):
+                return time.perf_counter() - started
+            if time.perf_counter() - started > timeout:
+                break
+        raise RuntimeError(f"client never drew a frame: {' '.join(command[:3])}")
+    finally:
+        proc.kill()
+        proc.wait()
+
+# Author:   Shelby Scoville
+# Purpose:  Times opening and decoding the fonts and sounds, in this process
+# Pre:      pygame can start its font and mixer modules
+# Post:     Returns {"pack"|"loose": best seconds}
+def time_assets(rounds: int) -> dict:
+    from pongAssets import GameAssets
+    GameAssets(LooseFiles())
+    best = {}
+    for name, opener in (("pack", lambda: AssetPack(PACK_PATH)), ("loose", LooseFiles)):
+        samples = []
+        for _ in range(rounds):
+            started = time.perf_counter()
+            GameAssets(opener())
+            samples.append(time.perf_counter() - started)
+        best[name] = min(samples)
+    return best
+
+# Author:   Shelby Scoville
+# Purpose:  Checks that the pack is up to date
+# Pre:      None
+# Post:     Returns the names whose packed bytes differ from the loose file (or are missing)
+def stale_assets() -> list:
+    pack = AssetPack(PACK_PATH)
+    loose = LooseFiles()
+    stale = [name for name in ASSET_FILES if name not in pack.entries or pack.read(name) != loose.read(name)]
+    pack.close()
+    return stale
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Client start-to-first-frame time, old launch order vs new")
+    parser.add_argument("--runs", type=int, default=5, help="launches of each kind, alternating")
+    parser.add_argument("--rtt", type=float, default=0.05, help="simulated round trip time to the server in seconds")
+    args = parser.parse_args()
+
+    if not os.path.exists(PACK_PATH):
+        print(f"FAIL: no asset pack at {PACK_PATH}, build it with python pongAssets.py")
+        sys.exit(1)
+    stale = stale_assets()
+
+    listener = socket.create_server(("127.0.0.1", 0))
+    port = str(listener.getsockname()[1])
+    threading.Thread(target=serve, args=(listener, 1.5 * args.rtt), daemon=True).start()
+    commands = {
+        "old": [sys.executable, "-c", OLD_LAUNCH, port],
+        "new": [sys.executable, "pongClient.py", "--host", "127.0.0.1", "--port", port, "--headless", "--startup-time"],
+    }
+    samples = {name: [] for name in commands}
+    for _ in range(args.runs):
+        for name, command in commands.items():
+            samples[name].append(time_launch(command))
+    listener.close()
+
+    print(f"start to first frame, {args.runs} launches each, simulated round trip {args.rtt * 1000:.0f} ms")
+    print(f"{'launch':<8} {'best':>9} {'median':>9}")
+    for name, values in samples.items():
+        print(f"{name:<8} {min(values) * 1000:7.0f}ms {statistics.median(values) * 1000:7.0f}ms")
+    old = statistics.median(samples["old"])
+    new = statistics.median(samples["new"])
+    print(f"new launch saves {(old - new) * 1000:.0f} ms ({(1 - new / old) * 100:.0f}%) at the median")
+
+    assets = time_assets(20)
+    print(f"fonts and sounds: {assets['pack'] * 1000:.2f} ms from the pack, {assets['loose'] * 1000:.2f} ms from loose files")
+    if stale:
+        print(f"FAIL: the asset pack is out of date for {', '.join(stale)}, rebuild it with python pongAssets.py")
+    sys.exit(1 if stale else 0)
@@ -0,0 +1,197 @@
+# =================================================================================================
+# Contributing Authors:	    Shelby Scoville
+# Email Addresses:          snsc235@uky.edu
+# Date:                     10/18/2026
+# Purpose:                  Match result ingest rate under bot load, and leaderboard speed at scale
+# =================================================================================================
+#
+# Run from the pong/ folder:  python -m benchmarks.benchStats --bots 100 --duration 10 --prefill 1000000
+#
+# Ingest: an authoritative event server plays bots from pongBots while its game loop also hands
+# the StatsWriter made-up results at each --rates rate (as if that many matches a second were
+# ending), plus one run without stats to compare against. Reports the results committed per
+# second, how far the writer fell behind, its average batch, the game loop's time per result
+# handed over, tick time and bot latency. When the bots leave, every real match has to be saved.
+#
+# Scale: fills a fresh stats file with --prefill matches between --players players, then times
+# the leaderboard, one player's stats and their latest matches. The leaderboard has to be read
+# off its index (no sort) and the players' totals have to add up to the matches.
+# Exits with status 1 if a check fails.
+
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+from pongServer import EventServer
+from pongStats import open_store, write_results, leaderboard, player_stats, recent_matches, LEADERBOARD
+from pongBots import run_load
+
+# Author:   Shelby Scoville
+# Purpose:  A made-up finished match between two of the first `players` players
+# Pre:      None
+# Post:     Returns the arguments of StatsWriter.record
+def random_result(rng: random.Random, players: int, match: int) -> tuple:
+    one = rng.randrange(players)
+    two = (one + rng.randrange(1, players)) % players
+    loser = rng.randint(0, 11)
+    score1, score2 = (12, loser) if rng.random() < 0.5 else (loser, 12)
+    if rng.random() < 0.1:
+        # Someone left before the end
+        score1, score2 = rng.randint(0, 11), rng.randint(0, 11)
+    ended = time.time()
+    return match, ended - 120.0, ended, f"sim{one}", f"sim{two}", score1, score2
+
+# Author:   Shelby Scoville
+# Purpose:  Runs the event loop in this thread, handing the stats writer `rate` results a second
+# Pre:      server is an EventServer
+# Post:     Appends (results handed over, seconds the loop spent handing them over) to out
+def serve(server: EventServer, stop: threading.Event, rate: float, players: int, out: list) -> None:
+    rng = random.Random(1)
+    offered = 0
+    spent = 0.0
+    started = time.perf_counter()
+    while not stop.is_set():
+        server.serve_once(0.005)
+        if rate:
+            due = int((time.perf_counter() - started) * rate) - offered
+            if due > 0:
+                results = [random_result(rng, players, 1000000 + offered + i) for i in range(due)]
+                handing = time.perf_counter()
+                for result in results:
+                    server.stats.record(*result)
+                spent += time.perf_counter() - handing
+                offered += due
+    out.append((offered, spent))
+    server.close()
+
+# Author:   Shelby Scoville
+# Purpose:  Plays bots against a server handing over results at one rate
+# Pre:      rate is None for a server without stats
+# Post:     Returns a dict of what was measured, and a list of failures
+def ingest(folder: str, rate: float, bots: int, duration: float, players: int) -> tuple:
+    path = os.path.join(folder, f"ingest-{rate}.db") if rate is not None else None
+    server = EventServer("127.0.0.1", 0, tick_rate=60.0, stats_path=path)
+    stop = threading.Event()
+    out = []
+    thread = threading.Thread(target=serve, args=(server, stop, rate or 0, players, out), daemon=True)
+    thread.start()
+
+    # How far behind the writer is, sampled while the bots play
+    behind = []
+    def watch() -> None:
+        while not stop.wait(0.1):
+            behind.append(server.stats.pending())
+    if server.stats is not None:
+        threading.Thread(target=watch, daemon=True).start()
+
+    started = time.perf_counter()
+    results = run_load("127.0.0.1", server.port, bots, 60.0, duration)
+    written_in_time = server.stats.written if server.stats is not None else 0
+    elapsed = time.perf_counter() - started
+    ticks = server.tick_stats
+    # The bots have left, so every match has ended; close() waits for the writer to finish
+    stop.set()
+    thread.join()
+    offered, spent = out[0]
+
+    measured = {"bots": results["connected"], "latency": results["latency_ms"],
+                "tick_avg_ms": ticks.busy / max(1, ticks.ticks) * 1000, "tick_worst_ms": ticks.worst * 1000,
+                "overruns": ticks.overruns}
+    failures = []
+    if server.stats is not None:
+        db = sqlite3.connect(path)
+        saved = db.execute("SELECT count(*) FROM matches WHERE player1 LIKE 'bot%'").fetchone()[0]
+        total = db.execute("SELECT count(*) FROM matches").fetchone()[0]
+        db.close()
+        measured.update(offered_per_s=offered / elapsed, committed_per_s=written_in_time / elapsed,
+                        most_behind=max(behind, default=0), batches=server.stats.batches,
+                        average_batch=server.stats.written / max(1, server.stats.batches),
+                        handover_us=spent / max(1, offered) * 1e6)
+        if saved != results["connected"] // 2:
+            failures.append(f"rate {rate}: {saved} bot matches saved, {results['connected'] // 2} were played")
+        if total != offered + saved or server.stats.failed:
+            failures.append(f"rate {rate}: {total} results saved of {offered + saved}, {server.stats.failed} failed")
+    return measured, failures
+
+# Author:   Shelby Scoville
+# Purpose:  Fills a stats file with matches, then times the queries against it
+# Pre:      None
+# Post:     Returns a dict of what was measured, and a list of failures
+def scale(folder: str, matches: int, players: int) -> tuple:
+    path = os.path.join(folder, "scale.db")
+    db = open_store(path)
+    rng = random.Random(2)
+    started = time.perf_counter()
+    for first in range(0, matches, 50000):
+        write_results(db, [random_result(rng, players, i) for i in range(first, min(matches, first + 50000))])
+    fill = time.perf_counter() - started
+
+    names = [f"sim{rng.randrange(players)}" for _ in range(200)]
+    timings = {}
+    for label, query in (("leaderboard top 10", lambda name: leaderboard(db, 10)),
+                         ("leaderboard top 100", lambda name: leaderboard(db, 100)),
+                         ("player stats", lambda name: player_stats(db, name)),
+                         ("latest 10 matches", lambda name: recent_matches(db, name, 10))):
+        samples = []
+        for name in names:
+            began = time.perf_counter()
+            query(name)
+            samples.append(time.perf_counter() - began)
+        timings[label] = statistics.median(samples) * 1e6
+
+    failures = []
+    plan = " ".join(row[3] for row in db.execute("EXPLAIN QUERY PLAN " + LEADERBOARD, (10,)))
+    if "TEMP B-TREE" in plan or "players_leaderboard" not in plan:
+        failures.append(f"leaderboard is not read off its index: {plan}")
+    played = db.execute("SELECT sum(matches), sum(wins), sum(losses) FROM players").fetchone()
+    decided = db.execute("SELECT count(*) FROM matches WHERE winner IS NOT NULL").fetchone()[0]
+    if played != (2 * matches, decided, decided):
+        failures.append(f"player totals {played} do not add up to {matches} matches with {decided} winners")
+    db.close()
+    size = os.path.getsize(path) + (os.path.getsize(path + "-wal") if os.path.exists(path + "-wal") else 0)
+    return {"fill_per_s": matches / fill, "megabytes": size / 1e6, "query_us": timings}, failures
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Match result ingest under bot load and leaderboard speed at scale")
+    parser.add_argument("--bots", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--rates", type=float, nargs="+", default=[100, 2000, 20000],
+                        help="made-up match results per second handed to the writer during each run")
+    parser.add_argument("--players", type=int, default=100000, help="players the made-up results are between")
+    parser.add_argument("--prefill", type=int, default=1000000, help="matches in the stats file the queries are timed on")
+    args = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as folder:
+        print(f"== ingest: {args.bots} bots on an authoritative event server for {args.duration:g}s per run")
+        print(f"{'offered/s':>10} {'saved/s':>9} {'behind':>7} {'batch':>7} {'loop us':>8} "
+              f"{'tick avg':>9} {'worst':>8} {'bot p50':>8} {'p99':>8}")
+        for rate in [None] + args.rates:
+            measured, failed = ingest(folder, rate, args.bots, args.duration, args.players)
+            failures += failed
+            tail = (f"{measured['tick_avg_ms']:7.3f}ms {measured['tick_worst_ms']:6.2f}ms "
+                    f"{measured['latency']['p50']:6.2f}ms {measured['latency']['p99']:6.2f}ms")
+            if rate is None:
+                print(f"{'no stats':>10} {'':>9} {'':>7} {'':>7} {'':>8} {tail}")
+            else:
+                print(f"{measured['offered_per_s']:10.0f} {measured['committed_per_s']:9.0f} {measured['most_behind']:7d} "
+                      f"{measured['average_batch']:7.1f} {measured['handover_us']:8.2f} {tail}")
+        print("saved/s: results committed while the bots played; behind: most results waiting for the writer;")
+        print("loop us: game loop time per result handed over")
+
+        print(f"== scale: {args.prefill} matches between {args.players} players")
+        measured, failed = scale(folder, args.prefill, args.players)
+        failures += failed
+        print(f"filled at {measured['fill_per_s']:.0f} matches/s, {measured['megabytes']:.1f} MB")
+        for label, us in measured["query_us"].items():
+            print(f"   {label:<22} {us:8.1f}us (median)")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,149 @@
+# =================================================================================================
+# Contributing Authors:	    Shelby Scoville
+# Email Addresses:          snsc235@uky.edu
+# Date:                     10/18/2026
+# Purpose:                  Measures the UDP state stream over loopback with simulated loss and delay
+# =================================================================================================
+#
+# Run from the pong/ folder:  python -m benchmarks.benchUdp --loss 0.05 --delay 0.03 --jitter 0.01
+#
+# Starts an authoritative event server with the UDP stream, puts a LossyShim on both directions and
+# connects bot players. Reports how often fresh state arrives (the gap between usable updates is
+# what a player sees as stutter), how many stale datagrams were discarded and whether every score
+# event made it through the reliable channel.
+
+import argparse
+import json
+import selectors
+import socket
+import threading
+import time
+
+from pongServer import EventServer
+from pongProtocol import BINARY_CODEC, DeltaDecoder
+from pongUdp import UdpChannel, LossyShim, MAX_DATAGRAM
+
+# Author:   Shelby Scoville
+# Purpose:  Returns the value at fraction p of a sorted list
+# Pre:      values is sorted and not empty
+# Post:     Returns one element of values
+def percentile(values: list, p: float) -> float:
+    return values[min(len(values) - 1, int(p * len(values)))]
+
+class UdpBot:
+    # Author:   Shelby Scoville
+    # Purpose:  One headless player that joins over TCP and then lives on the UDP stream
+    # Pre:      Server is listening on port with UDP enabled
+    # Post:     Hello is sent over the reliable channel
+    def __init__(self, port: int, loss: float, delay: float, jitter: float, seed: int) -> None:
+        self.tcp = socket.create_connection(("127.0.0.1", port))
+        buffer = b""
+        while b'\n' not in buffer:
+            buffer += self.tcp.recv(1024)
+        init_data = json.loads(buffer.split(b'\n', 1)[0])
+        self.tcp.sendall(json.dumps({"format": "binary", "delta": True}).encode('utf-8') + b'\n')
+
+        self.udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.udp.setblocking(False)
+        self.shim = LossyShim(self.udp.sendto, loss, delay, jitter, seed)
+        self.channel = UdpChannel(self.shim, ("127.0.0.1", init_data['udp_port']))
+        self.channel.send_reliable(BINARY_CODEC.encode("hello", {"hello": init_data['udp_token']}))
+        self.decoder = DeltaDecoder()
+        self.newest_sync = 0
+        self.last_fresh = None
+        self.gaps = []
+        self.score_events = 0
+        self.score = (0, 0)
+        self.inputs = 0
+
+    # Author:   Shelby Scoville
+    # Purpose:  Handles every datagram waiting on the bot's socket
+    # Pre:      None
+    # Post:     Gaps between fresh states and score events are recorded
+    def read(self, now: float) -> None:
+        while True:
+            try:
+                datagram, _ = self.udp.recvfrom(MAX_DATAGRAM)
+            except (BlockingIOError, InterruptedError):
+                return
+            for payload in self.channel.receive(datagram):
+                data, _ = BINARY_CODEC.decode(payload)
+                if data is None:
+                    continue
+                if "score_left" in data:
+                    self.score_events += 1
+                    self.score = (data["score_left"], data["score_right"])
+                    continue
+                if "snap" in data:
+                    snap = data["snap"]
+                    data = self.decoder.decode(data)
+                    if data is None:
+                        self.channel.send_reliable(BINARY_CODEC.encode("keyframe", {"keyframe": 1}))
+                        continue
+                    self.channel.send_state(BINARY_CODEC.encode("ack", {"ack": snap}))
+                if data["sync"] > self.newest_sync:
+                    self.newest_sync = data["sync"]
+                    if self.last_fresh is not None:
+                        self.gaps.append(now - self.last_fresh)
+                    self.last_fresh = now
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="UDP state stream benchmark")
+    parser.add_argument("--bots", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--tick-rate", type=float, default=60.0)
+    parser.add_argument("--loss", type=float, default=0.05)
+    parser.add_argument("--delay", type=float, default=0.02)
+    parser.add_argument("--jitter", type=float, default=0.01)
+    args = parser.parse_args()
+
+    shims = []
+    def make_shim(sendto):
+        shims.append(LossyShim(sendto, args.loss, args.delay, args.jitter, seed=0))
+        return shims[-1]
+
+    server = EventServer("127.0.0.1", 0, tick_rate=args.tick_rate, udp_port=0, udp_shim=make_shim)
+    server_thread = threading.Thread(target=server.run, daemon=True)
+    server_thread.start()
+
+    bots = [UdpBot(server.port, args.loss, args.delay, args.jitter, seed=i + 1) for i in range(args.bots - args.bots % 2)]
+    selector = selectors.DefaultSelector()
+    for bot in bots:
+        selector.register(bot.udp, selectors.EVENT_READ, bot)
+
+    started = time.perf_counter()
+    next_input = started
+    while time.perf_counter() - started < args.duration:
+        for key, _ in selector.select(0.01):
+            key.data.read(time.perf_counter())
+        now = time.perf_counter()
+        for bot in bots:
+            bot.channel.poll()
+        if now >= next_input:
+            # Every bot changes direction twice a second, over the reliable channel
+            for i, bot in enumerate(bots):
+                bot.inputs += 1
+                moving = ("up", "down", "")[(bot.inputs + i) % 3]
+                bot.channel.send_reliable(BINARY_CODEC.encode("input", {"moving": moving, "seq": bot.inputs}))
+            next_input = now + 0.5
+    server.stop()
+    server_thread.join()
+
+    gaps = sorted(g for bot in bots for g in bot.gaps)
+    states = sum(len(bot.gaps) + 1 for bot in bots if bot.last_fresh is not None)
+    expected = len(bots) * args.duration * args.tick_rate
+    stale = sum(bot.channel.stale_dropped for bot in bots)
+    resends = sum(bot.channel.resends for bot in bots)
+    # Each bot gets one score event for 0-0 and one per point after that
+    points = sum(1 + bot.score[0] + bot.score[1] for bot in bots)
+    print(f"bots: {len(bots)}  loss: {args.loss:.0%}  delay: {args.delay*1000:.0f}ms +/- {args.jitter*1000:.0f}ms each way")
+    print(f"fresh states received: {states} of ~{expected:.0f} sent ({states/expected:.1%})")
+    print(f"stale datagrams discarded: {stale}")
+    if gaps:
+        print(f"gap between fresh states: p50 {percentile(gaps, 0.5)*1000:.1f}ms  p99 {percentile(gaps, 0.99)*1000:.1f}ms"
+              f"  max {gaps[-1]*1000:.1f}ms  (tick is {1000/args.tick_rate:.1f}ms)")
+    print(f"score events received: {sum(bot.score_events for bot in bots)} of {points}  reliable resends by bots: {resends}")
+    print(f"server datagrams dropped by shim: {shims[0].dropped if shims else 0}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+# =================================================================================================
+# Contributing Authors:	    Shelby Scoville
+# Email Addresses:          snsc235@uky.edu
+# Date:                     10/18/2026
+# Purpose:                  Single-file asset pack for the client, loaded in the background
+# =================================================================================================
+#
+# The client's fonts, sounds and logo are packed into one file, assets/pong.pack (network byte order):
+#     header: 8s magic "PONGPAK1", uint16 version, uint16 entry count
+#     entries: uint16 name length, the name (UTF-8), uint32 offset, uint32 length
+#     then the files' bytes, each at its offset from the start of the pack
+#
+# AssetPack memory-maps the pack, so opening it is one open() and reading an asset is a slice.
+# AssetLoader imports pygame, starts its font and sound modules and builds the Font and Sound
+# objects on a background thread, so that all happens while the client connects and waits for
+# the server's handshake (or while the player types the address) instead of after it. Without a
+# pack the loose files in assets/ are used.
+#
+# Rebuild the pack after changing an asset (from the pong/ folder):  python pongAssets.py
+
+import argparse
+import base64
+import io
+import mmap
+import os
+import struct
+import threading
+
+PACK_PATH = "./assets/pong.pack"
+PACK_MAGIC = b"PONGPAK1"
+PACK_VERSION = 1
+PACK_HEADER = struct.Struct("!8sHH")
+NAME_LENGTH = struct.Struct("!H")
+ENTRY_SPAN = struct.Struct("!II")
+
+# Name in the pack -> loose file it is built from
+ASSET_FILES = {
+    "scoreFont": "./assets/fonts/pong-score.ttf",
+    "winFont": "./assets/fonts/visitor.ttf",
+    "pointSound": "./assets/sounds/point.wav",
+    "bounceSound": "./assets/sounds/bounce.wav",
+    "logo": "./assets/images/logo.png",
+}
+
+# Author:   Shelby Scoville
+# Purpose:  Packs the loose asset files into one file
+# Pre:      Run from the pong/ folder (or files maps names to paths that exist)
+# Post:     path holds the pack, returns its size in bytes
+def buildPack(path: str =PACK_PATH, files: dict =ASSET_FILES) -> int:
+    blobs = []
+    for name, source in files.items():
+        with open(source, "rb") as f:
+            blobs.append((name.encode("utf-8"), f.read()))
+    header = PACK_HEADER.pack(PACK_MAGIC, PACK_VERSION, len(blobs))
+    offset = len(header) + sum(NAME_LENGTH.size + len(name) + ENTRY_SPAN.size for name, _ in blobs)
+    entries = []
+    for name, data in blobs:
+        entries.append(NAME_LENGTH.pack(len(name)) + name + ENTRY_SPAN.pack(offset, len(data)))
+        offset += len(data)
+    with open(path, "wb") as f:
+        f.write(header + b"".join(entries) + b"".join(data for _, data in blobs))
+    return offset
+
+class AssetPack:
+    # Author:   Shelby Scoville
+    # Purpose:  Read-only view of an asset pack
+    # Pre:      path is a pack written by buildPack
+    # Post:     The file is memory-mapped and its entries read. Raises ValueError if it is not a pack
+    def __init__(self, path: str =PACK_PATH) -> None:
+        with open(path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.data) < PACK_HEADER.size:
+            raise ValueError(f"{path} is not an asset pack")
+        magic, version, count = PACK_HEADER.unpack_from(self.data)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            raise ValueError(f"{path} is not a version {PACK_VERSION} asset pack")
+        # name -> (offset, length)
+        self.entries = {}
+        pos = PACK_HEADER.size
+        for _ in range(count):
+            (length,) = NAME_LENGTH.unpack_from(self.data, pos)
+            pos += NAME_LENGTH.size
+            name = self.data[pos:pos + length].decode("utf-8")
+            pos += length
+            self.entries[name] = ENTRY_SPAN.unpack_from(self.data, pos)
+            pos += ENTRY_SPAN.size
+
+    # Author:   Shelby Scoville
+    # Purpose:  The bytes of one asset
+    # Pre:      name is in the pack
+    # Post:     Returns a copy of the asset's bytes
+    def read(self, name: str) -> bytes:
+        offset, length = self.entries[name]
+        return self.data[offset:offset + length]
+
+    # Author:   Shelby Scoville
+    # Purpose:  One asset as a file object, for pygame's loaders
+    # Pre:      name is in the pack
+    # Post:     Returns a new file object positioned at the start
+    def open(self, name: str) -> io.BytesIO:
+        return io.BytesIO(self.read(name))
+
+    def close(self) -> None:
+        self.data.close()
+
+class LooseFiles:
+    # Author:   Shelby Scoville
+    # Purpose:  Same interface as AssetPack over the files in assets/, when there is no pack
+    # Pre:      Run from the pong/ folder
+    # Post:     Nothing is read until asked for
+    def __init__(self, files: dict =ASSET_FILES) -> None:
+        self.files = files
+
+    def read(self, name: str) -> bytes:
+        with open(self.files[name], "rb") as f:
+            return f.read()
+
+    def open(self, name: str):
+        return open(self.files[name], "rb")
+
+    def close(self) -> None:
+        pass
+
+# Author:   Shelby Scoville
+# Purpose:  Opens the pack, or the loose files if there is none
+# Pre:      Run from the pong/ folder
+# Post:     Returns an AssetPack or LooseFiles
+def openAssets(path: str =PACK_PATH):
+    if path and os.path.exists(path):
+        return AssetPack(path)
+    return LooseFiles()
+
+# Author:   Shelby Scoville
+# Purpose:  The logo as Tk wants it for PhotoImage(data=...)
+# Pre:      assets is from openAssets
+# Post:     Returns the PNG as base64 text
+def logoData(assets) -> str:
+    return base64.b64encode(assets.read("logo")).decode("ascii")
+
+class GameAssets:
+    # Author:   Shelby Scoville
+    # Purpose:  Imports pygame and builds the fonts and sounds playGame uses
+    # Pre:      assets is from openAssets. Safe to call off the main thread (no window is opened)
+    # Post:     scoreFont, winFont, pointSound and bounceSound are ready, the mixer and font modules
+    #           are initialized the way playGame initializes them
+    def __init__(self, assets) -> None:
+        import pygame
+        pygame.mixer.pre_init(44100, -16, 2, 2048)
+        pygame.mixer.init()
+        pygame.font.init()
+        # pygame keeps reading fonts as glyphs are needed, so each gets its own file object
+        self.scoreFont = pygame.font.Font(assets.open("scoreFont"), 32)
+        self.winFont = pygame.font.Font(assets.open("winFont"), 48)
+        self.pointSound = pygame.mixer.Sound(file=assets.open("pointSound"))
+        self.bounceSound = pygame.mixer.Sound(file=assets.open("bounceSound"))
+
+class AssetLoader:
+    # Author:   Shelby Scoville
+    # Purpose:  Loads GameAssets on a background thread
+    # Pre:      Run from the pong/ folder
+    # Post:     Loading has started
+    def __init__(self, path: str =PACK_PATH) -> None:
+        self.path = path
+        self.assets = None
+        self.error = None
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self) -> None:
+        try:
+            self.assets = GameAssets(openAssets(self.path))
+        except Exception as e:
+            self.error = e
+
+    # Author:   Shelby Scoville
+    # Purpose:  Waits until the assets are loaded
+    # Pre:      None
+    # Post:     Returns the GameAssets, or raises whatever stopped them from loading
+    def wait(self) -> GameAssets:
+        self.thread.join()
+        if self.error is not None:
+            raise self.error
+        return self.assets
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the client's asset pack from the files in assets/")
+    parser.add_argument("--output", default=PACK_PATH, help="where to write the pack")
+    args = parser.parse_args()
+    size = buildPack(args.output)
+    print(f"Packed {len(ASSET_FILES)} assets into {args.output} ({size} bytes)")
@@ -0,0 +1,272 @@
+# =================================================================================================
+# Contributing Authors:	    Shelby Scoville
+# Email Addresses:          snsc235@uky.edu
+# Date:                     10/18/2026
+# Purpose:                  Headless simulator that steps many independent matches at once with NumPy
+# =================================================================================================
+#
+# Used for bot training, balance testing and capacity planning. Every match follows exactly the
+# same rules as pongSim.Simulation (which uses helperCode's Ball/Paddle and pygame.Rect), just
+# stored as one array entry per match instead of one object per match.
+
+import numpy as np
+
+from pongSim import WIN_SCORE, MAX_BOUNCES, TOUCH_SLACK, PIXEL_SLACK
+
+# Sizes used by playGame and Simulation
+BALL_SIZE = 5
+PADDLE_WIDTH = 10
+PADDLE_HEIGHT = 50
+PADDLE_SPEED = 5
+WALL_HEIGHT = 10
+
+# Input values for setInputs
+UP = -1
+STILL = 0
+DOWN = 1
+
+# Author:   Shelby Scoville
+# Purpose:  pongSim.timeOfImpact for one rectangle per match
+# Pre:      Arrays that broadcast together (one row per rectangle, one column per ball)
+# Post:     Returns a float array of times, inf where it never touches. The float operations are the
+#           same ones in the same order, so the results are identical
+def timesOfImpact(x, y, dx, dy, size, left, top, width, height) -> np.ndarray:
+    shape = np.broadcast_shapes(np.shape(x), np.shape(left), np.shape(top))
+    enter = np.full(shape, -np.inf)
+    leave = np.full(shape, np.inf)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for pos, vel, low, high in ((x, dx, left - size, left + width), (y, dy, top - size, top + height)):
+            near = (low - pos) / vel
+            far = (high - pos) / vel
+            first = np.minimum(near, far)
+            last = np.maximum(near, far)
+            # Not moving on this axis: always inside the slab or never
+            still = vel == 0
+            inside = (low < pos) & (pos < high)
+            first = np.where(still, np.where(inside, -np.inf, np.inf), first)
+            last = np.where(still, np.where(inside, np.inf, -np.inf), last)
+            enter = np.maximum(enter, first)
+            leave = np.minimum(leave, last)
+    depthX = np.minimum(x - (left - size), left + width - x)
+    depthY = np.minimum(y - (top - size), top + height - y)
+    heading = np.where(depthX <= depthY, dx * (left + width / 2 - x - size / 2),
+                       dy * (top + height / 2 - y - size / 2))
+    touches = (enter < leave) & (leave > 0)
+    times = np.where(enter < 0, np.where(heading > 0, 0.0, np.inf), enter)
+    return np.where(touches, times, np.inf)
+
+class BatchSimulation:
+    # Author:   Shelby Scoville
+    # Purpose:  Sets up n matches, each laid out like a new Simulation
+    # Pre:      n > 0
+    # Post:     Every match is at tick 0 with a 0-0 score
+    def __init__(self, n: int, screenWidth: int =640, screenHeight: int =480) -> None:
+        self.n = n
+        self.screenWidth = screenWidth
+        self.screenHeight = screenHeight
+
+        # pygame.Rect truncates float positions, so do the same here
+        self.startX = int(screenWidth / 2)
+        self.startY = int(screenHeight / 2)
+        self.paddleStartY = int(screenHeight / 2 - PADDLE_HEIGHT / 2)
+        self.leftX = 10
+        self.rightX = screenWidth - 20
+        self.bottomWallY = screenHeight - WALL_HEIGHT
+
+        self.ballX = np.empty(n, dtype=np.int32)
+        self.ballY = np.empty(n, dtype=np.int32)
+        self.ballDx = np.empty(n, dtype=np.int32)
+        self.ballDy = np.empty(n, dtype=np.int32)
+        self.leftY = np.empty(n, dtype=np.int32)
+        self.rightY = np.empty(n, dtype=np.int32)
+        self.lScore = np.empty(n, dtype=np.int32)
+        self.rScore = np.empty(n, dtype=np.int32)
+        self.tick = np.empty(n, dtype=np.int64)
+        # -1 up, 0 still, 1 down
+        self.leftMove = np.empty(n, dtype=np.int32)
+        self.rightMove = np.empty(n, dtype=np.int32)
+        self.resetMatches(np.ones(n, dtype=bool))
+
+    # Author:   Shelby Scoville
+    # Purpose:  Starts the selected matches over from scratch
+    # Pre:      mask is a boolean array of length n
+    # Post:     Selected matches are back to their starting state
+    def resetMatches(self, mask: np.ndarray) -> None:
+        self.ballX[mask] = self.startX
+        self.ballY[mask] = self.startY
+        self.ballDx[mask] = -5
+        self.ballDy[mask] = 0
+        self.leftY[mask] = self.paddleStartY
+        self.rightY[mask] = self.paddleStartY
+        self.lScore[mask] = 0
+        self.rScore[mask] = 0
+        self.tick[mask] = 0
+        self.leftMove[mask] = STILL
+        self.rightMove[mask] = STILL
+
+    # Author:   Shelby Scoville
+    # Purpose:  Sets which way every paddle is moving
+    # Pre:      leftMove/rightMove are arrays (or scalars) of UP, STILL or DOWN
+    # Post:     Paddles move that way on every following step
+    def setInputs(self, leftMove, rightMove) -> None:
+        self.leftMove[:] = leftMove
+        self.rightMove[:] = rightMove
+
+    def isOver(self) -> np.ndarray:
+        return (self.lScore > WIN_SCORE) | (self.rScore > WIN_SCORE)
+
+    # Author:   Shelby Scoville
+    # Purpose:  Moves every paddle one tick, keeping them between the walls (pongSim.movePaddle)
+    # Pre:      y and move are arrays for one side
+    # Post:     y is updated in place
+    def movePaddles(self, y: np.ndarray, move: np.ndarray) -> None:
+        down = (move > 0) & (y + PADDLE_HEIGHT < self.bottomWallY)
+        up = (move < 0) & (y > WALL_HEIGHT)
+        y += PADDLE_SPEED * down
+        y -= PADDLE_SPEED * up
+
+    # Author:   Shelby Scoville
+    # Purpose:  Advances every match by one tick, with the same rules as Simulation.step
+    # Pre:      None
+    # Post:     Paddles, balls, scores and ticks are updated
+    def step(self) -> None:
+        self.movePaddles(self.leftY, self.leftMove)
+        self.movePaddles(self.rightY, self.rightMove)
+
+        # Finished matches keep their ball where it is (playGame shows the win message instead)
+        active = ~self.isOver()
+        # Most balls can't reach a wall or paddle this tick and just move; the rest are swept
+        near = active & self.mightTouch()
+        clear = active & ~near
+        self.ballX += self.ballDx * clear
+        self.ballY += self.ballDy * clear
+        self.sweepBalls(np.flatnonzero(near))
+
+        # If the ball makes it past the edge of the screen, update score, etc. (Ball.reset)
+        scoredLeft = active & (self.ballX > self.screenWidth)
+        scoredRight = active & ~scoredLeft & (self.ballX < 0)
+        self.lScore += scoredLeft
+        self.rScore += scoredRight
+        scored = scoredLeft | scoredRight
+        self.ballX[scored] = self.startX
+        self.ballY[scored] = self.startY
+        self.ballDx[scoredLeft] = -5
+        self.ballDx[scoredRight] = 5
+        self.ballDy[scored] = 0
+
+        self.tick += 1
+
+    # Author:   Shelby Scoville
+    # Purpose:  Which balls' move this tick (and a pixel more) could reach a wall or paddle
+    # Pre:      None
+    # Post:     Returns a boolean array; False means the ball can move its whole velocity untouched
+    def mightTouch(self) -> np.ndarray:
+        endX = self.ballX + self.ballDx
+        endY = self.ballY + self.ballDy
+        lowX = np.minimum(self.ballX, endX) - 1
+        highX = np.maximum(self.ballX, endX) + BALL_SIZE + 1
+        lowY = np.minimum(self.ballY, endY) - 1
+        highY = np.maximum(self.ballY, endY) + BALL_SIZE + 1
+        return ((lowY <= WALL_HEIGHT) | (highY >= self.bottomWallY)
+                | ((lowX <= self.leftX + PADDLE_WIDTH) & (highX >= self.leftX)
+                   & (lowY <= self.leftY + PADDLE_HEIGHT) & (highY >= self.leftY))
+                | ((lowX <= self.rightX + PADDLE_WIDTH) & (highX >= self.rightX)
+                   & (lowY <= self.rightY + PADDLE_HEIGHT) & (highY >= self.rightY)))
+
+    # Author:   Shelby Scoville
+    # Purpose:  Moves the selected balls one tick with pongSim.sweepBall's rules (walls, then the left
+    #           paddle, then the right one when two are touched at once)
+    # Pre:      index is an array of match numbers
+    # Post:     Their positions are rounded to whole pixels and velocities are updated. Each round
+    #           only works on the balls that bounced in the one before
+    def sweepBalls(self, index: np.ndarray) -> None:
+        x = self.ballX[index].astype(np.float64)
+        y = self.ballY[index].astype(np.float64)
+        dx = self.ballDx[index]
+        dy = self.ballDy[index]
+        elapsed = np.zeros(len(index))
+        # Positions in x/y/dx/dy of the balls still moving
+        moving = np.arange(len(index))
+        lefts = np.array([[-10], [-10], [self.leftX], [self.rightX]])
+        widths = np.array([[self.screenWidth + 20], [self.screenWidth + 20], [PADDLE_WIDTH], [PADDLE_WIDTH]])
+        heights = np.array([[WALL_HEIGHT], [WALL_HEIGHT], [PADDLE_HEIGHT], [PADDLE_HEIGHT]])
+        for _ in range(MAX_BOUNCES):
+            if not len(moving):
+                break
+            mx, my, mdx, mdy = x[moving], y[moving], dx[moving], dy[moving]
+            remaining = 1.0 - elapsed[moving]
+            # Balls whose sweep over the rest of the tick (and a pixel more) can't reach anything just move
+            endX = mx + mdx * remaining
+            endY = my + mdy * remaining
+            lowX = np.minimum(mx, endX) - 1
+            highX = np.maximum(mx, endX) + BALL_SIZE + 1
+            lowY = np.minimum(my, endY) - 1
+            highY = np.maximum(my, endY) + BALL_SIZE + 1
+            leftY = self.leftY[index[moving]]
+            rightY = self.rightY[index[moving]]
+            reach = ((lowY <= WALL_HEIGHT) | (highY >= self.bottomWallY)
+                     | ((lowX <= self.leftX + PADDLE_WIDTH) & (highX >= self.leftX)
+                        & (lowY <= leftY + PADDLE_HEIGHT) & (highY >= leftY))
+                     | ((lowX <= self.rightX + PADDLE_WIDTH) & (highX >= self.rightX)
+                        & (lowY <= rightY + PADDLE_HEIGHT) & (highY >= rightY)))
+            x[moving[~reach]] = endX[~reach]
+            y[moving[~reach]] = endY[~reach]
+            moving = moving[reach]
+            if not len(moving):
+                break
+            mx, my, mdx, mdy = mx[reach], my[reach], mdx[reach], mdy[reach]
+            remaining, leftY, rightY = remaining[reach], leftY[reach], rightY[reach]
+            # Rows: top wall, bottom wall, left paddle, right paddle. argmin takes the first row on
+            # a tie, like sweepBall's order
+            tops = np.stack((np.zeros_like(leftY), np.full_like(leftY, self.bottomWallY), leftY, rightY))
+            times = timesOfImpact(mx, my, mdx, mdy, BALL_SIZE, lefts, tops, widths, heights)
+            kind = times.argmin(axis=0)
+            first = times[kind, np.arange(len(moving))]
+            kind[first > remaining + TOUCH_SLACK] = -1
+
+            # Nothing left to hit this tick: move the rest of the way
+            done = kind < 0
+            x[moving[done]] = mx[done] + mdx[done] * remaining[done]
+            y[moving[done]] = my[done] + mdy[done] * remaining[done]
+
+            hit = ~done
+            at, t, kind = moving[hit], np.minimum(first[hit], remaining[hit]), kind[hit]
+            x[at] = mx[hit] + mdx[hit] * t
+            y[at] = my[hit] + mdy[hit] * t
+            elapsed[at] += t
+            # Ball.hitWall
+            wall = kind < 2
+            dy[at[wall]] = -dy[at[wall]]
+            # Ball.hitPaddle, with the ball's centre where it touched the paddle
+            paddle = ~wall
+            paddleY = np.where(kind[paddle] == 2, leftY[hit][paddle], rightY[hit][paddle])
+            paddleCenter = paddleY + PADDLE_HEIGHT // 2
+            dx[at[paddle]] = -dx[at[paddle]]
+            row = np.floor(y[at[paddle]] + PIXEL_SLACK).astype(np.int32)
+            dy[at[paddle]] = (row + BALL_SIZE // 2 - paddleCenter) // 2
+            moving = at
+
+        self.ballX[index] = np.floor(x + 0.5)
+        self.ballY[index] = np.floor(y + 0.5)
+        self.ballDx[index] = dx
+        self.ballDy[index] = dy
+
+    # Author:   Shelby Scoville
+    # Purpose:  Exports one match in the same layout as Simulation.getState
+    # Pre:      0 <= i < n
+    # Post:     Returns a new dictionary (input sequence numbers are not tracked here and are 0)
+    def getState(self, i: int) -> dict:
+        return {
+            "ball_x": int(self.ballX[i]),
+            "ball_y": int(self.ballY[i]),
+            "ball_dx": int(self.ballDx[i]),
+            "ball_dy": int(self.ballDy[i]),
+            "p1_y": int(self.leftY[i]),
+            "p2_y": int(self.rightY[i]),
+            "score1": int(self.lScore[i]),
+            "score2": int(self.rScore[i]),
+            "sync": int(self.tick[i]),
+            "p1_seq": 0,
+            "p2_seq": 0,
+            "time": 0
+        }
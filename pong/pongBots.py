@@ -0,0 +1,320 @@
+# =================================================================================================
+# Contributing Authors:	    Shelby Scoville
+# Email Addresses:          snsc235@uky.edu
+# Date:                     10/18/2026
+# Purpose:                  Headless load generator: many scripted bot players against a Pong server
+# =================================================================================================
+#
+# Run from the pong/ folder:  python pongBots.py --host 127.0.0.1 --bots 200 --fps 60 --duration 30
+#
+# Each bot joins like pongClient.joinServer (reads init_data, negotiates the wire format) and then
+# plays like playGame: the left bot is the ball host on the original server, and on an
+# authoritative server bots only send paddle input. Paddles follow the ball. All bots share one
+# selector thread. Results are printed as JSON so runs can be compared between builds.
+#
+# Latency is measured from a bot's message to the server's answer to it: the next state reply
+# for host/client updates, or the first state that acknowledges an input (pN_seq) for inputs.
+
+import argparse
+import json
+import selectors
+import socket
+import sys
+import time
+
+from pongSim import Simulation, movePaddle
+from pongFraming import FrameBuffer
+from pongProtocol import JSON_CODEC, CODECS, choose_format, DeltaDecoder
+
+# Author:   Shelby Scoville
+# Purpose:  Returns the value at fraction p of a sorted list
+# Pre:      values is sorted
+# Post:     Returns one element of values, or 0.0 if it is empty
+def percentile(values: list, p: float) -> float:
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(p * len(values)))]
+
+class Bot:
+    # Author:   Shelby Scoville
+    # Purpose:  One scripted player connected to the server
+    # Pre:      Server is listening on host:port, wire_format is "auto", "json" or "binary". name (optional)
+    #           is sent in the handshake for servers that keep stats
+    # Post:     Bot has read init_data, negotiated its format and is non-blocking
+    def __init__(self, host: str, port: int, wire_format: str, delta: bool, timeout: float =5.0, name: str =None) -> None:
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        buffer = b""
+        while b'\n' not in buffer:
+            chunk = self.sock.recv(1024)
+            if not chunk:
+                raise ConnectionError("Connection closed by server")
+            buffer += chunk
+        message, buffer = buffer.split(b'\n', 1)
+        init_data = json.loads(message)
+        self.paddle = init_data['paddle']
+        self.player_id = 1 if self.paddle == "left" else 2
+        self.authoritative = init_data.get('authoritative', False)
+
+        # Same negotiation as joinServer
+        self.send_codec = JSON_CODEC
+        self.recv_codec = JSON_CODEC
+        self.decoder = None
+        offered = init_data.get('formats')
+        if offered and wire_format != "json":
+            chosen = choose_format(offered) if wire_format == "auto" else wire_format
+            request = {"format": chosen}
+            if delta:
+                request["delta"] = True
+                self.decoder = DeltaDecoder()
+            if name:
+                request["name"] = name
+            self.sock.sendall(JSON_CODEC.encode("format", request))
+            self.send_codec = CODECS[chosen]
+
+        self.sock.setblocking(False)
+        self.frames = FrameBuffer()
+        self.frames.feed(buffer)
+        self.outbuf = bytearray()
+        self.closed = False
+
+        # The left bot on the original server runs the ball, like the host client does
+        self.sim = Simulation(init_data['screen_width'], init_data['screen_height'])
+        self.state = None
+        self.sync = 0
+        self.moving = ""
+        self.input_seq = 0
+
+        # Send time of the oldest update without a reply yet, and of each unacknowledged input
+        self.waiting_since = None
+        self.pending_inputs = {}
+
+        self.messages_out = 0
+        self.messages_in = 0
+        self.bytes_out = 0
+        self.bytes_in = 0
+
+    # Author:   Shelby Scoville
+    # Purpose:  Queues bytes for the server and writes what the socket will take
+    # Pre:      Bot is open
+    # Post:     Returns False if the connection broke
+    def send(self, message: bytes) -> bool:
+        self.messages_out += 1
+        self.bytes_out += len(message)
+        self.outbuf += message
+        return self.flush()
+
+    def flush(self) -> bool:
+        if not self.outbuf:
+            return True
+        try:
+            sent = self.sock.send(self.outbuf)
+        except (BlockingIOError, InterruptedError):
+            return True
+        except OSError:
+            return False
+        del self.outbuf[:sent]
+        return True
+
+    # Author:   Shelby Scoville
+    # Purpose:  Plays one frame: moves the paddle toward the ball and sends what playGame would send
+    # Pre:      now is the current perf_counter() time
+    # Post:     Returns False if the connection broke
+    def frame(self, now: float) -> bool:
+        paddle = self.sim.leftPaddle if self.player_id == 1 else self.sim.rightPaddle
+        ball_y = self.state["ball_y"] if self.state is not None else self.sim.ball.rect.y
+        if self.state is not None and self.authoritative:
+            paddle.rect.y = self.state["p1_y" if self.player_id == 1 else "p2_y"]
+
+        # Scripted player: chase the ball with a small dead zone
+        centre = paddle.rect.y + paddle.rect.height // 2
+        moving = "down" if ball_y > centre + 8 else "up" if ball_y < centre - 8 else ""
+
+        if self.authoritative:
+            if moving == self.moving:
+                return True
+            self.moving = moving
+            self.input_seq += 1
+            self.pending_inputs[self.input_seq] = now
+            return self.send(self.send_codec.encode("input", {"moving": moving, "seq": self.input_seq}))
+
+        if self.player_id == 1:
+            # The host runs the physics and paddle locally, the opponent's paddle comes from the server
+            self.sim.setInput(1, moving)
+            if self.state is not None:
+                self.sim.rightPaddle.rect.y = self.state["p2_y"]
+            self.sim.step()
+            ball = self.sim.ball
+            self.sync += 1
+            update = {"paddle_y": paddle.rect.y, "ball_x": ball.rect.x, "ball_y": ball.rect.y,
+                      "ball_dx": ball.xVel, "ball_dy": ball.yVel, "score1": self.sim.lScore,
+                      "score2": self.sim.rScore, "sync": self.sync}
+        else:
+            # The client moves its own paddle and passes on the host's ball/score data
+            paddle.moving = moving
+            movePaddle(paddle, self.sim.screenHeight)
+            state = self.state or {}
+            self.sync = state.get("sync", self.sync) + 1
+            update = {"paddle_y": paddle.rect.y, "ball_x": state.get("ball_x", 0), "ball_y": state.get("ball_y", 0),
+                      "ball_dx": state.get("ball_dx", 0), "ball_dy": state.get("ball_dy", 0),
+                      "score1": state.get("score1", 0), "score2": state.get("score2", 0), "sync": self.sync}
+        if self.waiting_since is None:
+            self.waiting_since = now
+        return self.send(self.send_codec.encode("update", update))
+
+    # Author:   Shelby Scoville
+    # Purpose:  Reads and decodes everything the server has sent
+    # Pre:      Socket is readable, now is the current perf_counter() time
+    # Post:     Latency samples (seconds) are appended to latencies; returns False on disconnect
+    def read(self, now: float, latencies: list) -> bool:
+        try:
+            count = self.frames.recv_into(self.sock)
+        except (BlockingIOError, InterruptedError):
+            return True
+        except OSError:
+            return False
+        if not count:
+            return False
+        self.bytes_in += count
+
+        while True:
+            skipped = self.frames.skipped
+            data, found = self.frames.next_message(self.recv_codec)
+            if not found:
+                break
+            # States a newer one replaced still count as received
+            self.messages_in += self.frames.skipped - skipped
+            if data is None:
+                continue
+            if "format" in data:
+                self.recv_codec = CODECS[data["format"]]
+                continue
+            self.messages_in += 1
+            if "snap" in data and self.decoder is not None:
+                snap = data["snap"]
+                data = self.decoder.decode(data)
+                if data is None:
+                    self.send(self.send_codec.encode("keyframe", {"keyframe": 1}))
+                    continue
+                self.send(self.send_codec.encode("ack", {"ack": snap}))
+            self.state = data
+
+            if self.authoritative:
+                acked = data.get("p1_seq" if self.player_id == 1 else "p2_seq", 0)
+                for seq in [s for s in self.pending_inputs if s <= acked]:
+                    latencies.append(now - self.pending_inputs.pop(seq))
+            elif self.waiting_since is not None:
+                latencies.append(now - self.waiting_since)
+                self.waiting_since = None
+        return True
+
+    def close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self.sock.close()
+
+# Author:   Shelby Scoville
+# Purpose:  Runs a load test and returns its results
+# Pre:      Server is listening on host:port
+# Post:     Returns a dictionary of results (see the keys below)
+def run_load(host: str, port: int, bots: int, fps: float, duration: float, wire_format: str ="auto",
+             delta: bool =True, ramp: float =0.0, join_timeout: float =5.0) -> dict:
+    selector = selectors.DefaultSelector()
+    players = []
+    connect_failures = 0
+    for i in range(bots):
+        try:
+            bot = Bot(host, port, wire_format, delta, join_timeout, f"bot{i}")
+        except socket.timeout:
+            # The original threaded server only ever starts one match, the rest are never answered
+            connect_failures += bots - i
+            print(f"bot {i}: no init_data from the server, not starting more bots", file=sys.stderr)
+            break
+        except (OSError, ValueError) as e:
+            connect_failures += 1
+            print(f"bot {i}: could not connect: {e}", file=sys.stderr)
+            continue
+        selector.register(bot.sock, selectors.EVENT_READ, bot)
+        players.append(bot)
+        if ramp:
+            time.sleep(ramp / bots)
+
+    interval = 1.0 / fps
+    started = time.perf_counter()
+    # Spread the bots over one frame so they do not all send at once
+    next_frame = [started + interval * i / max(1, len(players)) for i in range(len(players))]
+    latencies = []
+    disconnects = 0
+    end = started + duration
+    while True:
+        now = time.perf_counter()
+        if now >= end:
+            break
+        for i, bot in enumerate(players):
+            if bot.closed or next_frame[i] > now:
+                continue
+            next_frame[i] += interval
+            if next_frame[i] < now - interval:
+                # Fell more than a frame behind, skip ahead rather than bursting
+                next_frame[i] = now + interval
+            if not bot.frame(now):
+                disconnects += 1
+                selector.unregister(bot.sock)
+                bot.close()
+        wait = max(0.0, min([t for i, t in enumerate(next_frame) if not players[i].closed] + [end]) - time.perf_counter())
+        for key, mask in selector.select(wait):
+            bot = key.data
+            if not bot.read(time.perf_counter(), latencies) or not bot.flush():
+                disconnects += 1
+                selector.unregister(bot.sock)
+                bot.close()
+    elapsed = time.perf_counter() - started
+    for bot in players:
+        bot.close()
+    selector.close()
+
+    latencies.sort()
+    return {
+        "bots": bots,
+        "connected": len(players),
+        "connect_failures": connect_failures,
+        "disconnects": disconnects,
+        "duration_s": round(elapsed, 3),
+        "fps": fps,
+        "authoritative": any(bot.authoritative for bot in players),
+        "wire_format": wire_format,
+        "delta": delta,
+        "latency_ms": {
+            "samples": len(latencies),
+            "p50": round(percentile(latencies, 0.50) * 1000, 3),
+            "p99": round(percentile(latencies, 0.99) * 1000, 3),
+            "p999": round(percentile(latencies, 0.999) * 1000, 3),
+            "max": round((latencies[-1] if latencies else 0.0) * 1000, 3),
+        },
+        "messages_out_per_s": round(sum(bot.messages_out for bot in players) / elapsed, 1),
+        "messages_in_per_s": round(sum(bot.messages_in for bot in players) / elapsed, 1),
+        "bytes_out_per_s": round(sum(bot.bytes_out for bot in players) / elapsed, 1),
+        "bytes_in_per_s": round(sum(bot.bytes_in for bot in players) / elapsed, 1),
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pong bot load generator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=55555)
+    parser.add_argument("--bots", type=int, default=100)
+    parser.add_argument("--fps", type=float, default=60.0, help="frames per second each bot plays at")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to play after everyone has joined")
+    parser.add_argument("--format", dest="wire_format", choices=["auto", "json", "binary"], default="auto")
+    parser.add_argument("--no-delta", action="store_true", help="ask for full states instead of delta snapshots")
+    parser.add_argument("--ramp", type=float, default=0.0, help="seconds over which to spread the connects")
+    parser.add_argument("--join-timeout", type=float, default=5.0, help="seconds a bot waits for init_data")
+    parser.add_argument("--output", help="also write the JSON results to this file")
+    args = parser.parse_args()
+
+    results = run_load(args.host, args.port, args.bots, args.fps, args.duration, args.wire_format,
+                       not args.no_delta, args.ramp, args.join_timeout)
+    text = json.dumps(results, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
@@ -0,0 +1,119 @@
+# =================================================================================================
+# Contributing Authors:	    Shelby Scoville
+# Email Addresses:          snsc235@uky.edu
+# Date:                     10/18/2026
+# Purpose:                  Bounded per-client outbound queues for the servers
+# =================================================================================================
+#
+# Nothing is ever written with a blocking sendall. Encoded frames wait in a client's queue and are
+# written with non-blocking sends, so a slow client only slows itself. A client never needs an old
+# state once a newer one exists, so queueing a state (or snapshot) replaces any state that has not
+# started going out yet; such frames are counted as dropped. Other messages (handshake, scores) are
+# always delivered in order. A client whose queue overflows with those, or whose socket stays
+# backed up for longer than stall_timeout, should be evicted.
+
+import socket
+import time
+
+class OutboundQueue:
+    # Author:   Shelby Scoville
+    # Purpose:  Frames waiting to go to one client
+    # Pre:      max_frames bounds the frames queued but not started, stall_timeout is in seconds.
+    #           metrics (a pongMetrics.Metrics, optional) gets bytes written and send latency
+    #           labelled with player (1 or 2, may be set later)
+    # Post:     Queue is empty
+    def __init__(self, max_frames: int =64, stall_timeout: float =5.0, metrics=None, player: int =0) -> None:
+        self.max_frames = max_frames
+        self.stall_timeout = stall_timeout
+        # (latest_wins, frame, perf_counter() when queued or 0 without metrics) not started yet, oldest first
+        self.frames = []
+        # Bytes already committed to the socket (a frame that went out partly can't be dropped)
+        self.outbuf = bytearray()
+        # When the oldest frame in outbuf was queued (metrics only)
+        self.outbuf_queued_at = 0.0
+        self.metrics = metrics
+        self.player = player
+        # When the socket first refused to take everything, None while it keeps up
+        self.blocked_since = None
+        self.dropped = 0
+        self.max_depth = 0
+
+    # Author:   Shelby Scoville
+    # Purpose:  Number of frames waiting, counting the one being written
+    # Pre:      None
+    # Post:     Returns the queue depth
+    def depth(self) -> int:
+        return len(self.frames) + (1 if self.outbuf else 0)
+
+    def has_pending(self) -> bool:
+        return bool(self.outbuf or self.frames)
+
+    # Author:   Shelby Scoville
+    # Purpose:  Queues an encoded frame
+    # Pre:      latest_wins is True for states/snapshots that a newer one makes useless
+    # Post:     Returns False if the queue overflowed (the client is not keeping up and should go)
+    def push(self, frame: bytes, latest_wins: bool =False) -> bool:
+        if latest_wins:
+            for i, queued in enumerate(self.frames):
+                if queued[0]:
+                    # At most one state waits at a time, the newest goes to the back
+                    del self.frames[i]
+                    self.dropped += 1
+                    break
+        self.frames.append((latest_wins, frame, time.perf_counter() if self.metrics is not None else 0))
+        depth = self.depth()
+        if depth > self.max_depth:
+            self.max_depth = depth
+        return len(self.frames) <= self.max_frames
+
+    # Author:   Shelby Scoville
+    # Purpose:  Writes as much as the (non-blocking) socket will take
+    # Pre:      sock is non-blocking, now is a time.monotonic() time (looked up if not given)
+    # Post:     Returns True once everything is written. Raises OSError if the connection broke
+    def flush(self, sock: socket.socket, now: float =None) -> bool:
+        while True:
+            if not self.outbuf:
+                if not self.frames:
+                    self.blocked_since = None
+                    return True
+                self.outbuf += b"".join(queued[1] for queued in self.frames)
+                self.outbuf_queued_at = min(queued[2] for queued in self.frames)
+                self.frames.clear()
+            try:
+                sent = sock.send(self.outbuf)
+            except (BlockingIOError, InterruptedError):
+                sent = 0
+            del self.outbuf[:sent]
+            if self.metrics is not None:
+                self.metrics.inc("pong_bytes_out_total", sent)
+                if not self.outbuf:
+                    self.metrics.observe("pong_send_latency_seconds", time.perf_counter() - self.outbuf_queued_at,
+                                         f'player="{self.player}"')
+            if self.outbuf:
+                if self.blocked_since is None:
+                    self.blocked_since = time.monotonic() if now is None else now
+                return False
+
+    # Author:   Shelby Scoville
+    # Purpose:  Tells whether the client's socket has stayed backed up for too long
+    # Pre:      now is a time.monotonic() time
+    # Post:     Returns True if the client should be evicted
+    def stalled(self, now: float) -> bool:
+        return self.blocked_since is not None and now - self.blocked_since > self.stall_timeout
+
+# Author:   Shelby Scoville
+# Purpose:  Summarizes the outbound queues of a server for its periodic report
+# Pre:      queues is an iterable of OutboundQueue, dropped counts frames dropped by clients that
+#           have since left
+# Post:     Returns a one-line summary string
+def queue_summary(queues, evictions: int, dropped: int =0) -> str:
+    depths = []
+    max_depth = 0
+    for queue in queues:
+        depths.append(queue.depth())
+        dropped += queue.dropped
+        max_depth = max(max_depth, queue.max_depth)
+    backed_up = sum(1 for depth in depths if depth)
+    mean = sum(depths) / len(depths) if depths else 0.0
+    return (f"{len(depths)} clients, {backed_up} backed up, depth mean {mean:.2f} max {max(depths, default=0)}"
+            f" (peak {max_depth}), {dropped} stale frames dropped, {evictions} evicted")
@@ -5,55 +5,144 @@
 # Purpose:                  Client Logic for Pong Game
 # =================================================================================================
 
-import pygame
-import tkinter as tk
+import os
 import sys
 import socket
 import json
 import threading
-
-from assets.code.helperCode import *
+import time
+import argparse
+
+# pygame and tkinter take most of the startup time, so they (and the modules that need pygame) are
+# imported where they are first used: pygame on the asset loader's thread while we connect, tkinter
+# only for the start screen
+from pongProtocol import JSON_CODEC, BINARY_CODEC, CODECS, choose_format, DeltaDecoder
+from pongUdp import UdpChannel, MAX_DATAGRAM
+from pongNetcode import SnapshotBuffer, PaddlePredictor
+from pongFraming import FrameBuffer
+from pongClock import ClockSync, answer_ping, now_us
+from pongLoop import FixedStep, Cadence, lerp
+from pongProfile import FrameProfiler, EVENTS, LOCK_WAIT, STATE, PHYSICS, DISPLAY, FRAME_CAP, SEND, RECV_WAIT, PARSE
+from pongAssets import AssetLoader, GameAssets, openAssets, logoData
 
 # Global variable to store received game state
 received_state = None
 state_lock = threading.Lock()
+# The game loop and the receive thread (snapshot acks) both send, so sends must not interleave
+send_lock = threading.Lock()
+
+# Rebuilds full states from delta snapshots, set once we ask the server for them
+snapshot_decoder = None
+# Set once the server's UDP state stream is in use
+udp_channel = None
+# Timestamped recent states, used to draw remote things smoothly
+snapshot_buffer = None
+# Round trip time, jitter and clock offset to the server, set when the server answers pings
+clock_sync = None
+# Loads pygame, the fonts and the sounds in the background, started as soon as the client launches
+asset_loader = None
+# time.perf_counter() when the client launched, set with --startup-time to print when the first frame was drawn
+launch_time = None
+# Name our results are saved under by servers that keep stats (--name), otherwise they use our IP address
+player_name = None
+
+# Author:   Shelby Scoville
+# Purpose:  Applies one message from the server, whichever transport it came over
+# Pre:      data is a decoded message, reply(kind, message) answers the server on the same transport
+# Post:     Global 'received_state' holds the newest full state
+def handle_server_message(data: dict, reply) -> None:
+    global received_state
+    if "ping" in data:
+        # The server measures its round trip to us too
+        reply("pong", answer_ping(data, now_us()))
+        return
+    if "pong" in data:
+        if clock_sync is not None:
+            clock_sync.receive(data, now_us())
+        return
+    answer = None
+    with state_lock:
+        if "score_left" in data:
+            # Score event from the reliable UDP channel, it arrives even if the state carrying it was lost
+            if received_state is not None:
+                received_state = dict(received_state, score1=data["score_left"], score2=data["score_right"])
+            return
+        if "snap" in data and snapshot_decoder is not None:
+            # Delta snapshot: rebuild the full state and tell the server we have it
+            snap = data["snap"]
+            data = snapshot_decoder.decode(data)
+            if data is None:
+                # We lost track of the base it refers to, ask for a full snapshot
+                answer = ("keyframe", {"keyframe": 1})
+            else:
+                answer = ("ack", {"ack": snap})
+        if data is not None:
+            # Use the lock to safely update the global variable
+            received_state = data
+            if snapshot_buffer is not None:
+                arrival = time.perf_counter()
+                sent = None
+                if clock_sync is not None and clock_sync.offset_us() is not None and "time" in data:
+                    # When the server sent it by the shared clock, as an age moved onto perf_counter()
+                    sent = arrival - (now_us() - clock_sync.to_local_us(data["time"])) / 1000000
+                snapshot_buffer.push(data, arrival, sent)
+    # Answer outside the lock so a slow send never holds up the game loop
+    if answer is not None:
+        reply(*answer)
+
+# Author:   Shelby Scoville
+# Purpose:  Handles every complete message the server sent that is waiting in frames
+# Pre:      codec is the format the server is using so far
+# Post:     Returns the format to read the next messages with (the server may have switched)
+def read_messages(frames: FrameBuffer, codec, reply):
+    # process all complete messages in buffer
+    # The codec knows where one message ends and the next begins
+    while True:
+        data, found = frames.next_message(codec)
+        if not found:
+            # The rest of the buffer is a partial message
+            return codec
+        if data is None:
+            # If a message is malformed, just skip it
+            continue
+        if "format" in data:
+            # The server confirmed our format, everything after this uses it
+            codec = CODECS[data["format"]]
+            continue
+        handle_server_message(data, reply)
 
 # Author:   Shelby Scoville
 # Purpose:  Continuously receives data from the server and updates the global state
-# Pre:      Client socket is connected
+# Pre:      Client socket is connected, buffer holds any bytes read past the handshake
+#           profiler is a FrameProfiler to time this thread with, or None
 # Post:     Global 'received_state' is updated with latest server data
-def receive_updates(client: socket.socket) -> None:
+def receive_updates(client: socket.socket, buffer: bytes = b"", profiler: FrameProfiler = None) -> None:
     global received_state
-    # buffer is a temporary string to hold incoming data chunks
-    buffer = ""
+    lane = profiler.lane("receive_updates") if profiler is not None else None
+    # frames holds incoming bytes; only the newest of several queued states gets decoded
+    frames = FrameBuffer(65536)
+    frames.feed(buffer)
+    # The server speaks JSON until it confirms a format switch
+    codec = JSON_CODEC
+
+    # Acks and keyframe requests for states that came over TCP go back over TCP
+    def reply(kind: str, message: dict) -> None:
+        with send_lock:
+            client.sendall(codec.encode(kind, message))
+
     # Infinite loop to constantly listen for messages
     while True:
         try: 
-            # Receive raw bytes from the server (up to 1024 bytes at a time)
-            # decoding them converts the raw bytes into a readable string
-            chunk = client.recv(1024).decode('utf-8')
-            # If we receive an empty chunk, it means the server closed the connection 
-            if not chunk: 
-                break
-            
-            # Add the new piece of data to our buffer
-            buffer += chunk
+            codec = read_messages(frames, codec, reply)
+            if lane is not None:
+                lane.lap(PARSE)
 
-            # process all complete messages in buffer
-            # We use '\n' to know where one message ends and the next begins
-            while '\n' in buffer:
-                # Split the buffer into [message, rest of buffer]
-                message, buffer = buffer.split('\n', 1)
-                try:
-                    # Convert the string message (JSON) back into a Python dictionary
-                    data = json.loads(message)
-                    # Use the lock to safely update the global variable
-                    with state_lock:
-                        received_state = data
-
-                except json.JSONDecodeError:
-                    # If a message is malformed, just skip it
-                    continue
+            # Receive raw bytes from the server straight into the buffer
+            # If we receive nothing, it means the server closed the connection 
+            if not frames.recv_into(client): 
+                break
+            if lane is not None:
+                lane.lap(RECV_WAIT)
         except Exception as e:
             print(f"Error receiving data: {e}")
             break
@@ -61,8 +150,8 @@ def receive_updates(client: socket.socket) -> None:
 # Author:   Shelby Scoville
 # Purpose:  Sends the current client's game state to the server
 # Pre:      Client socket is connected, game variables are initialized
-# Post:     JSON data is sent over the socket
-def send_update(client: socket.socket, paddle_y: int, ball_x: int, ball_y: int, ball_dx: int, ball_dy: int, score1: int, score2: int, sync: int) -> bool:
+# Post:     The update is sent in the negotiated wire format (binary on the UDP stream), returns False if sending failed
+def send_update(client: socket.socket, paddle_y: int, ball_x: int, ball_y: int, ball_dx: int, ball_dy: int, score1: int, score2: int, sync: int, codec = JSON_CODEC) -> bool:
     try:
         # Create a dictionary containing all the info we want to share
         data = {
@@ -76,48 +165,152 @@ def send_update(client: socket.socket, paddle_y: int, ball_x: int, ball_y: int,
             "sync": sync
         }
 
-        # Convert dictionary to a JSON string and add a newline character '\n' 
-        # The newline is crucial so the server knows when the message ends
-        message = json.dumps(data) + '\n'
+        if udp_channel is not None:
+            # Updates are sent every frame, so a lost one is simply replaced by the next
+            udp_channel.send_state(BINARY_CODEC.encode("update", data))
+            return True
+        # Encode the dictionary in the negotiated wire format
+        # (JSON lines end with '\n', binary frames carry a length prefix, so the server knows where it ends)
+        message = codec.encode("update", data)
         # Send the encoded bytes to the server
-        client.sendall(message.encode('utf-8'))
+        with send_lock:
+            client.sendall(message)
         return True
     except Exception as e:
         print(f"Error sending data: {e}")
         return False
 
+# Author:   Shelby Scoville
+# Purpose:  Sends the player's paddle input to an authoritative server
+# Pre:      Client socket is connected, moving is "up", "down" or ""
+# Post:     The input is sent in the negotiated wire format (reliably, in binary, over UDP), returns False if sending failed
+def send_input(client: socket.socket, moving: str, seq: int, codec = JSON_CODEC) -> bool:
+    try:
+        # The server runs the physics, so the paddle direction is all it needs from us
+        data = {"moving": moving, "seq": seq}
+        if udp_channel is not None:
+            # Input is only sent when it changes, so it has to arrive
+            udp_channel.send_reliable(BINARY_CODEC.encode("input", data))
+            return True
+        with send_lock:
+            client.sendall(codec.encode("input", data))
+        return True
+    except Exception as e:
+        print(f"Error sending data: {e}")
+        return False
+
+# Author:   Shelby Scoville
+# Purpose:  Sends a control message (e.g. a ping) to the server over TCP
+# Pre:      Client socket is connected
+# Post:     Returns False if sending failed
+def send_control(client: socket.socket, kind: str, message: dict, codec = JSON_CODEC) -> bool:
+    try:
+        with send_lock:
+            client.sendall(codec.encode(kind, message))
+        return True
+    except Exception as e:
+        print(f"Error sending data: {e}")
+        return False
+
+# Author:   Shelby Scoville
+# Purpose:  Receives the UDP state stream and keeps the reliable channel's resends going
+# Pre:      sock is the client's UDP socket, channel is its UdpChannel to the server
+# Post:     Messages are applied through handle_server_message
+def receive_datagrams(sock: socket.socket, channel: UdpChannel) -> None:
+    # Acks go back on the state stream (latest wins), keyframe requests must arrive
+    def reply(kind: str, message: dict) -> None:
+        if kind == "ack":
+            channel.send_state(BINARY_CODEC.encode(kind, message))
+        else:
+            channel.send_reliable(BINARY_CODEC.encode(kind, message))
+
+    # Wake up regularly even when nothing arrives, so unacked datagrams get resent
+    sock.settimeout(0.02)
+    while True:
+        try:
+            datagram, addr = sock.recvfrom(MAX_DATAGRAM)
+        except socket.timeout:
+            channel.poll()
+            continue
+        except Exception as e:
+            print(f"Error receiving datagram: {e}")
+            break
+        if addr != channel.addr:
+            continue
+        for payload in channel.receive(datagram):
+            data, _ = BINARY_CODEC.decode(payload)
+            if data is not None:
+                handle_server_message(data, reply)
+        channel.poll()
+
+# Author:   Shelby Scoville
+# Purpose:  Opens the UDP state stream the server offered in init_data
+# Pre:      init_data has 'udp_port' and 'udp_token', sendto optionally wraps the socket's sendto
+#           (e.g. a LossyShim for testing)
+# Post:     Hello is sent and a thread receives datagrams; state and input now use UDP
+def start_udp(ip: str, init_data: dict, sendto = None) -> None:
+    global udp_channel
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    addr = (socket.gethostbyname(ip), init_data['udp_port'])
+    channel = UdpChannel(sendto or sock.sendto, addr)
+    channel.send_reliable(BINARY_CODEC.encode("hello", {"hello": init_data['udp_token']}))
+    threading.Thread(target=receive_datagrams, args=(sock, channel), daemon=True).start()
+    udp_channel = channel
+
 # Author:   Shelby Scoville
 # Purpose:  Main game loop handling inputs, rendering, and logic
-# Pre:      Pygame is initialized, connection to server established
+# Pre:      Pygame is initialized, connection to server established.
+#           authoritative is True when the server runs the ball physics, codec is the negotiated
+#           wire format and buffer holds any bytes read past the handshake. tickRate/sendRate are
+#           how fast the server simulates and sends (the original host client runs at 60). The game
+#           steps at tickRate whatever the frame rate; renderFps caps frames (0 = no cap) and
+#           updateRate is how often updates go to a relaying server. profiler, if given, times
+#           every phase of every frame and the receive thread
 # Post:     Game runs until window is closed or error occurs
-def playGame(screenWidth:int, screenHeight:int, playerPaddle:str, client:socket.socket) -> None:
-    global received_state
+def playGame(screenWidth:int, screenHeight:int, playerPaddle:str, client:socket.socket, authoritative:bool = False, codec = JSON_CODEC, buffer:bytes = b"", tickRate:float = 60, sendRate:float = None, renderFps:float = 60, updateRate:float = 60, profiler:FrameProfiler = None) -> None:
+    global received_state, snapshot_buffer
+
+    # Remote things are drawn about two state updates in the past, between states we already have
+    baseDelay = 2.0 / (sendRate or tickRate)
+    snapshot_buffer = SnapshotBuffer(tickRate, delay=baseDelay)
 
     # Start backgroung thread to receive updates from the server
-    receive_thread = threading.Thread(target=receive_updates, args=(client,), daemon=True)
+    receive_thread = threading.Thread(target=receive_updates, args=(client, buffer, profiler), daemon=True)
     receive_thread.start()
     
+    # Fonts and sounds have been loading since launch, usually they are ready by now
+    assets = asset_loader.wait() if asset_loader is not None else GameAssets(openAssets())
+    import pygame
+    from assets.code.helperCode import Paddle, Ball
+    from pongSim import movePaddle, moveBall
+    from pongRender import Renderer
+
     # Pygame inits
     pygame.mixer.pre_init(44100, -16, 2, 2048)
     pygame.init()
 
     # Constants
-    WHITE = (255,255,255)
     clock = pygame.time.Clock()
-    scoreFont = pygame.font.Font("./assets/fonts/pong-score.ttf", 32)
-    winFont = pygame.font.Font("./assets/fonts/visitor.ttf", 48)
-    pointSound = pygame.mixer.Sound("./assets/sounds/point.wav")
-    bounceSound = pygame.mixer.Sound("./assets/sounds/bounce.wav")
+    scoreFont = assets.scoreFont
+    winFont = assets.winFont
+    pointSound = assets.pointSound
+    bounceSound = assets.bounceSound
 
     # Display objects
     screen = pygame.display.set_mode((screenWidth, screenHeight))
-    winMessage = pygame.Rect(0,0,0,0)
     topWall = pygame.Rect(-10,0,screenWidth+20, 10)
     bottomWall = pygame.Rect(-10, screenHeight-10, screenWidth+20, 10)
     centerLine = []
     for i in range(0, screenHeight, 10):
         centerLine.append(pygame.Rect((screenWidth/2)-5,i,5,5))
 
+    # Walls, center line and score are drawn once onto a background, only moving things are redrawn
+    renderer = Renderer(screen, [topWall, bottomWall] + centerLine, scoreFont, winFont)
+
+    # Phases of each frame are timed only when profiling
+    lane = profiler.lane("playGame") if profiler is not None else None
+    renderer.lane = lane
+
     # Paddle properties and init
     paddleHeight = 50
     paddleWidth = 10
@@ -138,11 +331,19 @@ def playGame(screenWidth:int, screenHeight:int, playerPaddle:str, client:socket.
     rScore = 0
 
     sync = 0
+
+    # Authoritative mode only: our paddle moves right away and is reconciled with the server
+    predictor = PaddlePredictor(playerPaddleObj, screenHeight) if authoritative else None
+
+    # The game moves in fixed ticks however long frames take, and updates go out on their own schedule
+    stepper = FixedStep(tickRate)
+    updateCadence = Cadence(updateRate)
+    # Where our paddle and the ball were one tick earlier, to draw them between the last two ticks
+    lastPaddleY = playerPaddleObj.rect.y
+    lastBallPos = ball.rect.topleft
+    reportFirstFrame = launch_time is not None
    
     while True:
-        # Wiping the screen
-        screen.fill((0,0,0))
-
         # Getting keypress events
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -157,31 +358,47 @@ def playGame(screenWidth:int, screenHeight:int, playerPaddle:str, client:socket.
 
             elif event.type == pygame.KEYUP:
                 playerPaddleObj.moving = ""
+        if lane is not None:
+            lane.lap(EVENTS)
 
-        # Update the player paddle location
-        if playerPaddleObj.moving == "down":
-            if playerPaddleObj.rect.bottomleft[1] < screenHeight-10:
-                  playerPaddleObj.rect.y += playerPaddleObj.speed
-        elif playerPaddleObj.moving == "up":
-            if playerPaddleObj.rect.topleft[1] > 10:
-                playerPaddleObj.rect.y -= playerPaddleObj.speed
-        
         # Receive updates from server and apply them
+        now = time.perf_counter()
         with state_lock:
-            if received_state is not None:
+            if lane is not None:
+                lane.lap(LOCK_WAIT)
+            # Where remote things should be drawn right now (between buffered states, or
+            # briefly extrapolated if the next state is late)
+            view = snapshot_buffer.sample(now)
+            if received_state is not None and view is not None:
                 # Update opponent paddle position
                 if playerPaddle == "left":
-                    opponentPaddleObj.rect.y = received_state.get("p2_y", opponentPaddleObj.rect.y)
+                    opponentPaddleObj.rect.y = view["p2_y"]
                 else:
-                    opponentPaddleObj.rect.y = received_state.get("p1_y", opponentPaddleObj.rect.y)
+                    opponentPaddleObj.rect.y = view["p1_y"]
 
                 # Sync Logic:
                 # Left player is the host. They calculate ball physics and score
                 # Right player is the client. They must accept the host's ball/score data
-                if playerPaddle == "right":
+                # With an authoritative server both players accept the server's ball/score data
+                if authoritative:
+                    # The server ran the physics, so play sounds when its state shows a point or bounce
+                    newXVel = received_state.get("ball_dx", ball.xVel)
+                    newYVel = received_state.get("ball_dy", ball.yVel)
+                    if (received_state.get("score1", lScore), received_state.get("score2", rScore)) != (lScore, rScore):
+                        pointSound.play()
+                    elif newXVel * ball.xVel < 0 or (newYVel == -ball.yVel and newYVel != 0):
+                        bounceSound.play()
+
+                    # Our own paddle was predicted locally, check it against the server once the
+                    # server has seen our latest input
+                    ownPaddle = "p1" if playerPaddle == "left" else "p2"
+                    predictor.reconcile(received_state[ownPaddle + "_y"], received_state.get(ownPaddle + "_seq", 0),
+                                        snapshot_buffer.serverTick(now) - received_state["sync"])
+
+                if playerPaddle == "right" or authoritative:
                     # Always update ball and score from server to stay in sync
-                    ball.rect.x = received_state.get("ball_x", ball.rect.x)
-                    ball.rect.y = received_state.get("ball_y", ball.rect.y)
+                    ball.rect.x = view["ball_x"]
+                    ball.rect.y = view["ball_y"]
                     ball.xVel = received_state.get("ball_dx", ball.xVel) 
                     ball.yVel = received_state.get("ball_dy", ball.yVel)
                     lScore = received_state.get("score1", lScore)
@@ -189,82 +406,110 @@ def playGame(screenWidth:int, screenHeight:int, playerPaddle:str, client:socket.
                     
                     # Snap our sync clock to the server's clock
                     sync = received_state.get("sync", sync)
+        if lane is not None:
+            lane.lap(STATE)
 
-        # If the game is over, display the win message
-        if lScore > 10 or rScore > 10:
-            winText = "Player 1 Wins! " if lScore > 4 else "Player 2 Wins! "
-            textSurface = winFont.render(winText, False, WHITE, (0,0,0))
-            textRect = textSurface.get_rect()
-            textRect.center = ((screenWidth/2), screenHeight/2)
-            winMessage = screen.blit(textSurface, textRect)
+        # Run as many game ticks as fit in the time since the last frame
+        for _ in range(stepper.advance(now)):
+            lastPaddleY = playerPaddleObj.rect.y
+            lastBallPos = ball.rect.topleft
 
-        else:
+            # Update the player paddle location
+            movePaddle(playerPaddleObj, screenHeight)
 
             # ==== Ball Logic =====================================================================
-            ball.updatePos()
-
             # If the ball makes it past the edge of the screen, update score, etc.
-            if playerPaddle == "left":
+            # (only the host moves the ball, everyone else draws it where the server says)
+            if playerPaddle == "left" and not authoritative and lScore <= 10 and rScore <= 10:
+                # Bounces happen where the ball touches a paddle or wall (left paddle checked
+                # first, like Simulation.step), so a fast ball can't pass through either
+                for _ in moveBall(ball, [leftPaddle, rightPaddle], [topWall, bottomWall]):
+                    bounceSound.play()
+
                 if ball.rect.x > screenWidth:
                     lScore += 1
                     pointSound.play()
                     ball.reset(nowGoing="left")
+                    lastBallPos = ball.rect.topleft
                 elif ball.rect.x < 0:
                     rScore += 1
                     pointSound.play()
                     ball.reset(nowGoing="right")
-                
-                # If the ball hits a paddle
-                if ball.rect.colliderect(playerPaddleObj.rect):
-                    bounceSound.play()
-                    ball.hitPaddle(playerPaddleObj.rect.center[1])
-                elif ball.rect.colliderect(opponentPaddleObj.rect):
-                    bounceSound.play()
-                    ball.hitPaddle(opponentPaddleObj.rect.center[1])
-                
-                # If the ball hits a wall
-                if ball.rect.colliderect(topWall) or ball.rect.colliderect(bottomWall):
-                    bounceSound.play()
-                    ball.hitWall()
-            
-            pygame.draw.rect(screen, WHITE, ball)
+                    lastBallPos = ball.rect.topleft
             # ==== End Ball Logic =================================================================
 
-        # Drawing the dotted line in the center
-        for i in centerLine:
-            pygame.draw.rect(screen, WHITE, i)
-        
-        # Drawing the player's new location
-        for paddle in [playerPaddleObj, opponentPaddleObj]:
-            pygame.draw.rect(screen, WHITE, paddle)
+            sync += 1
 
-        pygame.draw.rect(screen, WHITE, topWall)
-        pygame.draw.rect(screen, WHITE, bottomWall)
-        scoreRect = updateScore(lScore, rScore, screen, WHITE, scoreFont)
-        pygame.display.update()
-        clock.tick(60)
+            if authoritative:
+                # Only paddle input goes upstream, and only when it changes
+                inputSeq = predictor.inputChanged()
+                if inputSeq is not None:
+                    send_input(client, playerPaddleObj.moving, inputSeq, codec)
+        if lane is not None:
+            lane.lap(PHYSICS)
 
-        sync += 1
-        
-        # Send server update
-        send_update(
-            client,
-            playerPaddleObj.rect.y,
-            ball.rect.x,
-            ball.rect.y,
-            ball.xVel,
-            ball.yVel,
-            lScore,
-            rScore,
-            sync
-        )
+        # If the game is over, display the win message
+        winText = None
+        if lScore > 10 or rScore > 10:
+            winText = "Player 1 Wins! " if lScore > 4 else "Player 2 Wins! "
+
+        # Things we move ourselves are drawn between the last two ticks, so they glide at any frame rate
+        alpha = stepper.alpha()
+        paddleRect = playerPaddleObj.rect.copy()
+        paddleRect.y = lerp(lastPaddleY, playerPaddleObj.rect.y, alpha)
+        ballRect = None
+        if winText is None:
+            ballRect = ball.rect.copy()
+            if playerPaddle == "left" and not authoritative:
+                ballRect.topleft = (lerp(lastBallPos[0], ball.rect.x, alpha), lerp(lastBallPos[1], ball.rect.y, alpha))
+
+        # Drawing the ball (not once the game is over) and both paddles' new locations
+        if playerPaddle == "left":
+            renderer.draw([ballRect, paddleRect, rightPaddle.rect], lScore, rScore, winText)
+        else:
+            renderer.draw([ballRect, leftPaddle.rect, paddleRect], lScore, rScore, winText)
+        if lane is not None:
+            lane.lap(DISPLAY)
+        if reportFirstFrame:
+            print(f"First frame drawn {(time.perf_counter() - launch_time) * 1000:.0f} ms after launch", flush=True)
+            reportFirstFrame = False
+        clock.tick(renderFps)
+        if lane is not None:
+            lane.lap(FRAME_CAP)
+
+        if clock_sync is not None:
+            # Keep measuring the round trip, and draw further in the past on a jittery connection
+            # so the next state has usually arrived by the time it is needed
+            ping = clock_sync.poll()
+            if ping is not None:
+                send_control(client, "ping", ping, codec)
+            if clock_sync.jitter() is not None:
+                snapshot_buffer.delay = baseDelay + 2 * clock_sync.jitter()
+
+        # A relaying server gets our paddle (and the host's ball) updateRate times a second
+        if not authoritative and updateCadence.due(time.perf_counter()):
+            send_update(
+                client,
+                playerPaddleObj.rect.y,
+                ball.rect.x,
+                ball.rect.y,
+                ball.xVel,
+                ball.yVel,
+                lScore,
+                rScore,
+                sync,
+                codec
+            )
+        if lane is not None:
+            lane.lap(SEND)
+            lane.frame()
 
 
 # Author:   Shelby Scoville
 # Purpose:  Connects to server and initiates the game
 # Pre:      User input IP and Port are valid
 # Post:     Connection established and playGame called, or error displayed
-def joinServer(ip:str, port:str, errorLabel:tk.Label, app:tk.Tk) -> None:
+def joinServer(ip:str, port:str, errorLabel:"tk.Label", app:"tk.Tk", renderFps:float = 60, updateRate:float = 60, profiler:FrameProfiler = None) -> None:
     try:
         # Validate inputs
         if not ip or not port:
@@ -286,19 +531,42 @@ def joinServer(ip:str, port:str, errorLabel:tk.Label, app:tk.Tk) -> None:
         errorLabel.update()
 
         # Receive initial game configuration from server
-        buffer = ""
-        while '\n' not in buffer:
-            chunk = client.recv(1024).decode('utf-8')
+        buffer = b""
+        while b'\n' not in buffer:
+            chunk = client.recv(1024)
             if not chunk:
                 raise Exception("Connection closed by server")
             buffer += chunk
         
-        message = buffer.split('\n')[0]
+        # Anything after the first line is already game data, so keep it for the receive thread
+        message, buffer = buffer.split(b'\n', 1)
         init_data = json.loads(message)
         # Extract settings
         screenWidth = init_data['screen_width']
         screenHeight = init_data['screen_height']
         paddle = init_data['paddle']
+        authoritative = init_data.get('authoritative', False)
+
+        # Measure round trips and the server's clock if the server answers pings
+        global snapshot_decoder, clock_sync
+        if init_data.get('clock'):
+            clock_sync = ClockSync()
+
+        # Ask for the most compact wire format the server offers, with delta snapshots
+        # (older servers offer no formats and only speak JSON)
+        codec = JSON_CODEC
+        if init_data.get('formats'):
+            wireFormat = choose_format(init_data['formats'])
+            snapshot_decoder = DeltaDecoder()
+            request = {"format": wireFormat, "delta": True}
+            if player_name:
+                request["name"] = player_name
+            client.sendall(JSON_CODEC.encode("format", request))
+            codec = CODECS[wireFormat]
+
+            # Real-time state over UDP when the server offers it (binary frames only)
+            if codec is BINARY_CODEC and 'udp_port' in init_data:
+                start_udp(ip, init_data)
 
         errorLabel.config(text=f"Starting game as {paddle} paddle...")
         errorLabel.update()
@@ -308,7 +576,8 @@ def joinServer(ip:str, port:str, errorLabel:tk.Label, app:tk.Tk) -> None:
 
         # Close the join window and start game
         app.withdraw()
-        playGame(screenWidth, screenHeight, paddle, client)
+        playGame(screenWidth, screenHeight, paddle, client, authoritative, codec, buffer,
+                 init_data.get('tick_rate', 60), init_data.get('send_rate'), renderFps, updateRate, profiler)
         app.quit()
     except ValueError:
         errorLabel.config(text="Port must be a number")
@@ -323,12 +592,31 @@ def joinServer(ip:str, port:str, errorLabel:tk.Label, app:tk.Tk) -> None:
         errorLabel.config(text=f"Error: {str(e)}")
         errorLabel.update()
 
+class ConsoleStatus:
+    # Author:   Shelby Scoville
+    # Purpose:  Stands in for the start screen's label and window when the client is started from
+    #           the command line, so joinServer's messages go to the console
+    # Pre:      None
+    # Post:     None
+    def config(self, text: str) -> None:
+        print(text, flush=True)
+
+    def update(self) -> None:
+        pass
+
+    def withdraw(self) -> None:
+        pass
+
+    def quit(self) -> None:
+        pass
+
 # This displays the opening screen, you don't need to edit this (but may if you like)
-def startScreen() -> None:
+def startScreen(renderFps:float = 60, updateRate:float = 60, profiler:FrameProfiler = None) -> None:
+    import tkinter as tk
     app = tk.Tk()
     app.title("Server Info")
 
-    image = tk.PhotoImage(file="./assets/images/logo.png")
+    image = tk.PhotoImage(data=logoData(openAssets()))
 
     titleLabel = tk.Label(image=image)
     titleLabel.grid(column=0, row=0, columnspan=2)
@@ -350,10 +638,41 @@ def startScreen() -> None:
     errorLabel = tk.Label(text="")
     errorLabel.grid(column=0, row=4, columnspan=2)
 
-    joinButton = tk.Button(text="Join", command=lambda: joinServer(ipEntry.get(), portEntry.get(), errorLabel, app))
+    joinButton = tk.Button(text="Join", command=lambda: joinServer(ipEntry.get(), portEntry.get(), errorLabel, app, renderFps, updateRate, profiler))
     joinButton.grid(column=0, row=3, columnspan=2)
 
     app.mainloop()
 
 if __name__ == "__main__":
-    startScreen()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Pong client")
+    parser.add_argument("--fps", type=float, default=60, help="frames drawn per second at most (0 = no cap); the game speed does not depend on it")
+    parser.add_argument("--update-rate", type=float, default=60, help="updates per second sent to a relaying server")
+    parser.add_argument("--profile", metavar="TRACE.json", help="time every phase of every frame, save a Chrome trace here and print percentiles on exit")
+    parser.add_argument("--host", help="connect to this server right away, without the start screen")
+    parser.add_argument("--port", default="55555", help="server port when --host is given")
+    parser.add_argument("--headless", action="store_true", help="no window or sound (SDL dummy drivers), with --host")
+    parser.add_argument("--startup-time", action="store_true", help="print how long after launch the first frame was drawn")
+    parser.add_argument("--name", help="player name for the server's match results and leaderboard")
+    args = parser.parse_args()
+    player_name = args.name
+    if args.startup_time:
+        launch_time = time.perf_counter()
+    if args.headless:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    # pygame, the fonts and the sounds load while the player types the address or while we connect
+    asset_loader = AssetLoader()
+    profiler = FrameProfiler() if args.profile else None
+    try:
+        if args.host:
+            status = ConsoleStatus()
+            joinServer(args.host, args.port, status, status, args.fps, args.update_rate, profiler)
+            # joinServer only returns if it could not start the game
+            sys.exit(1)
+        startScreen(args.fps, args.update_rate, profiler)
+    finally:
+        if profiler is not None:
+            profiler.write_trace(args.profile)
+            print(profiler.summary())
+            print(f"Trace saved to {args.profile} (open it in chrome://tracing or ui.perfetto.dev)")
\ No newline at end of file
@@ -0,0 +1,153 @@
+# =================================================================================================
+# Contributing Authors:	    Shelby Scoville
+# Email Addresses:          snsc235@uky.edu
+# Date:                     10/18/2026
+# Purpose:                  Round-trip time and clock offset estimation from ping/pong messages
+# =================================================================================================
+#
+# Either side sends {"ping": n, "t0": send time} now and then, and the other side answers with
+# {"pong": n, "t0": ..., "t1": receive time, "t2": answer time} in its own clock. With t3 the time
+# the pong arrived, like NTP:
+#     round trip = (t3 - t0) - (t2 - t1)
+#     offset     = ((t1 - t0) + (t2 - t3)) / 2      (their clock minus ours)
+# The round trip is smoothed the way TCP does (RFC 6298: srtt and rttvar, which we report as
+# jitter), and gives the retransmission timeout servers wait before resending to a client. The
+# offset is taken from the sample with the lowest round trip among the last few, since that is
+# the one least distorted by queueing.
+#
+# All times on the wire are integer microseconds of time.monotonic(). State messages carry the
+# server's clock in milliseconds as "time"; to_local_us() turns that into our own clock, which is
+# when clients date the states they interpolate between.
+
+import time
+from collections import deque
+
+# Author:   Shelby Scoville
+# Purpose:  This side's clock in whole microseconds
+# Pre:      None
+# Post:     Returns a non-negative integer
+def now_us() -> int:
+    return int(time.monotonic() * 1000000)
+
+# Author:   Shelby Scoville
+# Purpose:  Builds the answer to a peer's ping
+# Pre:      ping is the decoded ping, received is now_us() when it arrived
+# Post:     Returns the pong message
+def answer_ping(ping: dict, received: int) -> dict:
+    return {"pong": ping["ping"], "t0": ping["t0"], "t1": received, "t2": now_us()}
+
+class ClockSync:
+    # Author:   Shelby Scoville
+    # Purpose:  Tracks round trips and the clock offset to one peer
+    # Pre:      interval is seconds between pings, window is how many samples the offset filter keeps
+    # Post:     No estimate yet (rtt(), jitter() and offset_us() return None)
+    def __init__(self, interval: float =1.0, window: int =8, alpha: float =0.125, beta: float =0.25) -> None:
+        self.interval_us = int(interval * 1000000)
+        self.alpha = alpha
+        self.beta = beta
+        self.next_ping = 0
+        self.seq = 0
+        # Pings still waiting for their pong: seq -> t0 (old ones are forgotten, a lost pong is fine)
+        self.outstanding = {}
+        self.srtt = None
+        self.rttvar = None
+        # (round trip, offset) in microseconds, newest last
+        self.samples = deque(maxlen=window)
+        self.offset = None
+
+    # Author:   Shelby Scoville
+    # Purpose:  Returns a ping to send if one is due
+    # Pre:      now is now_us()
+    # Post:     Returns the ping message, or None if it is not time yet
+    def poll(self, now: int =None) -> dict:
+        now = now_us() if now is None else now
+        if now < self.next_ping:
+            return None
+        self.next_ping = now + self.interval_us
+        self.seq += 1
+        self.outstanding[self.seq] = now
+        if len(self.outstanding) > 8:
+            del self.outstanding[min(self.outstanding)]
+        return {"ping": self.seq, "t0": now}
+
+    # Author:   Shelby Scoville
+    # Purpose:  Takes in the answer to one of our pings
+    # Pre:      pong is the decoded pong, received is now_us() when it arrived
+    # Post:     Returns False if it did not answer a ping we are waiting for, else updates the estimates
+    def receive(self, pong: dict, received: int) -> bool:
+        t0 = self.outstanding.pop(pong["pong"], None)
+        if t0 is None or t0 != pong["t0"]:
+            return False
+        t1, t2, t3 = pong["t1"], pong["t2"], received
+        rtt = max(0, (t3 - t0) - (t2 - t1))
+        offset = ((t1 - t0) + (t2 - t3)) / 2
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = (1 - self.beta) * self.rttvar + self.beta * abs(self.srtt - rtt)
+            self.srtt = (1 - self.alpha) * self.srtt + self.alpha * rtt
+        self.samples.append((rtt, offset))
+        self.offset = min(self.samples)[1]
+        return True
+
+    # Author:   Shelby Scoville
+    # Purpose:  Smoothed round trip time
+    # Pre:      None
+    # Post:     Returns seconds, or None before the first pong
+    def rtt(self) -> float:
+        return self.srtt / 1000000 if self.srtt is not None else None
+
+    def jitter(self) -> float:
+        return self.rttvar / 1000000 if self.rttvar is not None else None
+
+    # Author:   Shelby Scoville
+    # Purpose:  How long to wait for an answer before sending again (RFC 6298: srtt + 4 * rttvar)
+    # Pre:      None
+    # Post:     Returns seconds, kept between minimum and maximum, or default before the first pong
+    def retransmit_timeout(self, default: float =0.1, minimum: float =0.02, maximum: float =1.0) -> float:
+        if self.srtt is None:
+            return default
+        return min(maximum, max(minimum, self.rtt() + 4 * self.jitter()))
+
+    def offset_us(self) -> float:
+        return self.offset
+
+    # Author:   Shelby Scoville
+    # Purpose:  The peer's clock right now, as far as we can tell
+    # Pre:      None
+    # Post:     Returns microseconds in the peer's clock (our own clock before the first pong)
+    def remote_now_us(self) -> int:
+        return now_us() + int(self.offset or 0)
+
+    # Author:   Shelby Scoville
+    # Purpose:  Converts a "time" field (peer clock, milliseconds mod 2**32) into our clock
+    # Pre:      remote_ms was stamped within the last ~24 days
+    # Post:     Returns microseconds in our clock
+    def to_local_us(self, remote_ms: int) -> int:
+        remote_now_ms = self.remote_now_us() // 1000
+        # Undo the 32 bit wrap by taking the candidate nearest to the peer's current time
+        delta = (remote_now_ms - remote_ms) % (1 << 32)
+        if delta >= 1 << 31:
+            delta -= 1 << 32
+        return (remote_now_ms - delta) * 1000 - int(self.offset or 0)
+
+# Author:   Shelby Scoville
+# Purpose:  Millisecond timestamp for the "time" field of state messages
+# Pre:      None
+# Post:     Returns this side's clock in milliseconds, wrapped to 32 bits
+def stamp_ms() -> int:
+    return (now_us() // 1000) & 0xFFFFFFFF
+
+# Author:   Shelby Scoville
+# Purpose:  Summarizes the round trip estimates of many clients for a server report
+# Pre:      clocks is an iterable of ClockSync
+# Post:     Returns a one-line summary string
+def rtt_summary(clocks) -> str:
+    clocks = list(clocks)
+    rtts = sorted(clock.srtt for clock in clocks if clock.srtt is not None)
+    if not rtts:
+        return "no round trips measured yet"
+    jitters = [clock.rttvar for clock in clocks if clock.rttvar is not None]
+    return (f"{len(rtts)} clients, rtt median {rtts[len(rtts) // 2] / 1000:.2f}ms max {rtts[-1] / 1000:.2f}ms, "
+            f"jitter mean {sum(jitters) / len(jitters) / 1000:.2f}ms")
@@ -0,0 +1,104 @@
+# =================================================================================================
+# Contributing Authors:	    Shelby Scoville
+# Email Addresses:          snsc235@uky.edu
+# Date:                     10/18/2026
+# Purpose:                  Receive buffer shared by the server and client: recv_into and framing
+# =================================================================================================
+#
+# Bytes are received straight into one preallocated bytearray with recv_into, and frames are found
+# by offset (codec.frame) instead of slicing and re-joining the buffer. When several game states
+# (or host/client updates) are queued back to back only the newest is decoded, the older ones are
+# skipped without parsing them, so a reader that fell behind catches up in one step. Other messages
+# (scores, acks, inputs, the format handshake) are always decoded and kept in order.
+#
+# Skipping snapshots is safe: the server only deltas against snapshots the client acknowledged,
+# and a skipped snapshot is never acknowledged.
+
+import socket
+
+class FrameBuffer:
+    # Author:   Shelby Scoville
+    # Purpose:  Holds received bytes between buffer[start:end]
+    # Pre:      size is the starting capacity (it grows if one frame does not fit)
+    # Post:     Buffer is empty
+    def __init__(self, size: int =4096, latest_wins: bool =True) -> None:
+        self.buffer = bytearray(size)
+        self.view = memoryview(self.buffer)
+        self.start = 0
+        self.end = 0
+        self.latest_wins = latest_wins
+        # Frames skipped because a newer one was right behind them
+        self.skipped = 0
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    # Author:   Shelby Scoville
+    # Purpose:  Makes room for at least needed more bytes at the end of the buffer
+    # Pre:      None
+    # Post:     Unread bytes are moved to the front, and the buffer is doubled until they fit
+    def make_room(self, needed: int =1) -> None:
+        pending = self.end - self.start
+        if self.start:
+            self.buffer[:pending] = self.view[self.start:self.end].tobytes()
+            self.start = 0
+            self.end = pending
+        if len(self.buffer) - self.end < needed:
+            # bytearray can not be resized while a memoryview of it exists
+            self.view.release()
+            while len(self.buffer) - self.end < needed:
+                self.buffer.extend(bytes(len(self.buffer)))
+            self.view = memoryview(self.buffer)
+
+    # Author:   Shelby Scoville
+    # Purpose:  Receives whatever the socket has straight into the free end of the buffer
+    # Pre:      sock is connected
+    # Post:     Returns the number of bytes received, 0 when the peer closed the connection.
+    #           Raises the socket's errors (BlockingIOError on an empty non-blocking socket)
+    def recv_into(self, sock: socket.socket) -> int:
+        if self.end == len(self.buffer):
+            self.make_room()
+        count = sock.recv_into(self.view[self.end:])
+        self.end += count
+        return count
+
+    # Author:   Shelby Scoville
+    # Purpose:  Adds bytes that were received some other way (e.g. after the init_data line)
+    # Pre:      None
+    # Post:     data is appended to the unread bytes
+    def feed(self, data: bytes) -> None:
+        if len(self.buffer) - self.end < len(data):
+            self.make_room(len(data))
+        self.buffer[self.end:self.end + len(data)] = data
+        self.end += len(data)
+
+    # Author:   Shelby Scoville
+    # Purpose:  Decodes the next message to handle, skipping states that a newer one replaces
+    # Pre:      codec is the format the peer is sending in right now (it may change between calls)
+    # Post:     Returns (message, found). found is False when no complete frame is left, message
+    #           is None for a corrupted frame that should be skipped
+    def next_message(self, codec) -> tuple:
+        buffer = self.buffer
+        start = self.start
+        if self.latest_wins:
+            latest, end = codec.frame(buffer, start, self.end)
+            if end == start:
+                return self.empty()
+            # Move on to the last of a run of latest-wins frames
+            while latest:
+                newer, after = codec.frame(buffer, end, self.end)
+                if after == end or not newer:
+                    break
+                self.skipped += 1
+                start, end = end, after
+        data, end = codec.decode(buffer, start, self.end)
+        if end == start:
+            return self.empty()
+        self.start = end
+        return data, True
+
+    def empty(self) -> tuple:
+        if self.start == self.end:
+            # Nothing unread, start over at the front without copying anything
+            self.start = self.end = 0
+        return None, False
@@ -0,0 +1,88 @@
+# =================================================================================================
+# Contributing Authors:	    Shelby Scoville
+# Email Addresses:          snsc235@uky.edu
+# Date:                     10/18/2026
+# Purpose:                  Fixed-timestep game loop pieces for the client
+# =================================================================================================
+#
+# The client used to do one of everything per rendered frame, so a slow frame slowed the game down
+# and a faster screen sent more updates. Now the time each frame took is added to an accumulator and
+# the game steps in whole ticks of 1/tickRate seconds, however many fit (FixedStep). What is left
+# over, as a fraction of a tick, says how far to draw moving things between the last two ticks.
+# Updates to the server go out on their own schedule (Cadence), so neither the frame rate nor a
+# hitch changes how fast the game runs or how much it sends.
+
+class FixedStep:
+    # Author:   Shelby Scoville
+    # Purpose:  Turns elapsed real time into a whole number of game ticks
+    # Pre:      tickRate is ticks per second. After a stall longer than maxCatchUp seconds the
+    #           rest is skipped instead of running a long burst of ticks
+    # Post:     No time has been accumulated
+    def __init__(self, tickRate: float =60.0, maxCatchUp: float =0.25) -> None:
+        self.dt = 1.0 / tickRate
+        self.maxSteps = max(1, int(maxCatchUp * tickRate))
+        self.accumulator = 0.0
+        self.last = None
+        self.ticks = 0
+        # Game time thrown away after stalls, in seconds
+        self.skipped = 0.0
+
+    # Author:   Shelby Scoville
+    # Purpose:  Adds the time since the last call and says how many ticks to run
+    # Pre:      now is time.perf_counter()
+    # Post:     Returns the tick count (0 on the first call); the remainder waits for the next frame
+    def advance(self, now: float) -> int:
+        if self.last is None:
+            self.last = now
+            return 0
+        self.accumulator += now - self.last
+        self.last = now
+        steps = int(self.accumulator / self.dt)
+        if steps > self.maxSteps:
+            self.skipped += (steps - self.maxSteps) * self.dt
+            steps = self.maxSteps
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.dt
+        self.ticks += steps
+        return steps
+
+    # Author:   Shelby Scoville
+    # Purpose:  How far the current moment is between the last tick and the next
+    # Pre:      None
+    # Post:     Returns 0.0 (just ticked) up to nearly 1.0
+    def alpha(self) -> float:
+        return min(1.0, self.accumulator / self.dt)
+
+
+class Cadence:
+    # Author:   Shelby Scoville
+    # Purpose:  Says when something that should happen rate times a second is due
+    # Pre:      rate is per second
+    # Post:     Due on the first check
+    def __init__(self, rate: float) -> None:
+        self.interval = 1.0 / rate
+        self.next = None
+
+    # Author:   Shelby Scoville
+    # Purpose:  Checks whether it is due and books the next time if so
+    # Pre:      now is time.perf_counter()
+    # Post:     Returns True at most rate times a second on average (and at most once per call).
+    #           After a long stall it starts over from now instead of catching up
+    def due(self, now: float) -> bool:
+        if self.next is None:
+            self.next = now
+        if now < self.next:
+            return False
+        self.next += self.interval
+        if now - self.next > 5 * self.interval:
+            self.next = now + self.interval
+        return True
+
+
+# Author:   Shelby Scoville
+# Purpose:  Where something that moved during the last tick should be drawn
+# Pre:      before/after are its positions at the last two ticks, alpha is FixedStep.alpha()
+# Post:     Returns the rounded in-between position
+def lerp(before: int, after: int, alpha: float) -> int:
+    return round(before + (after - before) * alpha)
@@ -0,0 +1,177 @@
+# =================================================================================================
+# Contributing Authors:	    Shelby Scoville
+# Email Addresses:          snsc235@uky.edu
+# Date:                     10/18/2026
+# Purpose:                  Opt-in server metrics served over HTTP in Prometheus text format
+# =================================================================================================
+#
+# Servers only create a Metrics object when --metrics-port is given. Every place that records
+# something checks "if self.metrics is not None" first, and the threaded server only swaps its
+# state_lock for a TimedLock when metrics are on, so a server without metrics does no extra work.
+#
+# Scrape with:  curl http://127.0.0.1:9100/metrics
+
+import threading
+import time
+from bisect import bisect_left
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Histogram bucket upper bounds in seconds: 10us .. 1s
+TIME_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+# name -> (type, help)
+METRICS = {
+    "pong_messages_in_total": ("counter", "Game messages received from clients"),
+    "pong_messages_out_total": ("counter", "Messages queued for clients"),
+    "pong_bytes_in_total": ("counter", "Bytes received from clients over TCP"),
+    "pong_bytes_out_total": ("counter", "Bytes written to clients over TCP"),
+    "pong_decode_seconds": ("histogram", "Time to decode one client message"),
+    "pong_state_lock_wait_seconds": ("histogram", "Time spent waiting to acquire state_lock (threaded server)"),
+    "pong_state_lock_hold_seconds": ("histogram", "Time state_lock was held (threaded server)"),
+    "pong_send_latency_seconds": ("histogram", "Time from queueing a message until the socket took all of it"),
+    "pong_tick_seconds": ("histogram", "Time to step every match once (authoritative mode)"),
+    "pong_connections": ("gauge", "Connected clients"),
+    "pong_matches": ("gauge", "Matches with two players"),
+    "pong_workers": ("gauge", "Worker processes running (sharded mode)"),
+    "pong_worker_restarts_total": ("counter", "Worker processes restarted after exiting (sharded mode)"),
+}
+
+class Histogram:
+    # Author:   Shelby Scoville
+    # Purpose:  Counts observations per bucket like a Prometheus histogram
+    # Pre:      buckets are sorted upper bounds
+    # Post:     Histogram is empty
+    def __init__(self, buckets: tuple =TIME_BUCKETS) -> None:
+        self.buckets = buckets
+        # One count per bucket plus the +Inf bucket, not cumulative
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+class Metrics:
+    # Author:   Shelby Scoville
+    # Purpose:  Holds a server's counters, gauges and histograms
+    # Pre:      None
+    # Post:     Everything is zero
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.values = {name: 0 for name, (kind, _) in METRICS.items() if kind != "histogram"}
+        # (name, label string) -> Histogram
+        self.histograms = {}
+        # Functions called at scrape time that return {name: value}, for numbers the server keeps anyway
+        self.collectors = []
+        self.http = None
+
+    def inc(self, name: str, value: float =1) -> None:
+        with self.lock:
+            self.values[name] += value
+
+    def set(self, name: str, value: float) -> None:
+        self.values[name] = value
+
+    # Author:   Shelby Scoville
+    # Purpose:  Records one observation in a histogram
+    # Pre:      name is a histogram in METRICS, labels is e.g. 'player="1"' or ""
+    # Post:     The histogram for (name, labels) counts value
+    def observe(self, name: str, value: float, labels: str ="") -> None:
+        with self.lock:
+            histogram = self.histograms.get((name, labels))
+            if histogram is None:
+                histogram = self.histograms[(name, labels)] = Histogram()
+            histogram.observe(value)
+
+    def add_collector(self, collector) -> None:
+        self.collectors.append(collector)
+
+    # Author:   Shelby Scoville
+    # Purpose:  Writes every metric in the Prometheus text exposition format
+    # Pre:      None
+    # Post:     Returns the page served at /metrics
+    def render(self) -> str:
+        values = dict(self.values)
+        for collector in self.collectors:
+            values.update(collector())
+        with self.lock:
+            histograms = {key: (list(h.counts), h.sum, h.count) for key, h in self.histograms.items()}
+
+        lines = []
+        for name, (kind, help_text) in METRICS.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind != "histogram":
+                lines.append(f"{name} {values.get(name, 0)}")
+                continue
+            for (hist_name, labels), (counts, total, count) in sorted(histograms.items()):
+                if hist_name != name:
+                    continue
+                prefix = labels + "," if labels else ""
+                cumulative = 0
+                for bound, bucket_count in zip(TIME_BUCKETS + ("+Inf",), counts):
+                    cumulative += bucket_count
+                    lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+                suffix = "{" + labels + "}" if labels else ""
+                lines.append(f"{name}_sum{suffix} {total}")
+                lines.append(f"{name}_count{suffix} {count}")
+        return "\n".join(lines) + "\n"
+
+    # Author:   Shelby Scoville
+    # Purpose:  Serves /metrics from a background thread
+    # Pre:      host:port is free (port 0 picks one)
+    # Post:     Returns the port being served
+    def serve(self, host: str ='127.0.0.1', port: int =9100) -> int:
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                # Scrapes every few seconds would drown out the server's own output
+                pass
+
+        self.http = ThreadingHTTPServer((host, port), Handler)
+        self.http.daemon_threads = True
+        threading.Thread(target=self.http.serve_forever, daemon=True).start()
+        return self.http.server_address[1]
+
+    def close(self) -> None:
+        if self.http is not None:
+            self.http.shutdown()
+            self.http.server_close()
+
+class TimedLock:
+    # Author:   Shelby Scoville
+    # Purpose:  A drop-in for threading.Lock in "with" blocks that records wait and hold times
+    # Pre:      metrics is a Metrics
+    # Post:     Lock is free
+    def __init__(self, metrics: Metrics) -> None:
+        self.lock = threading.Lock()
+        self.metrics = metrics
+        self.acquired_at = 0.0
+
+    def __enter__(self) -> "TimedLock":
+        started = time.perf_counter()
+        self.lock.acquire()
+        self.metrics.observe("pong_state_lock_wait_seconds", time.perf_counter() - started)
+        # Only the holder writes acquired_at, so no extra locking is needed
+        self.acquired_at = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        held = time.perf_counter() - self.acquired_at
+        self.lock.release()
+        self.metrics.observe("pong_state_lock_hold_seconds", held)
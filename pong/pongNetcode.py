@@ -0,0 +1,153 @@
+# =================================================================================================
+# Contributing Authors:	    Shelby Scoville
+# Email Addresses:          snsc235@uky.edu
+# Date:                     10/18/2026
+# Purpose:                  Client-side snapshot interpolation and local paddle prediction
+# =================================================================================================
+#
+# Remote things (the ball, the opponent's paddle) are drawn a little in the past, between two server
+# states we already have, instead of jumping to each state as it arrives. If the newer state is late
+# the ball is extrapolated for a short while. Our own paddle moves immediately and is pulled back
+# onto the server's position once the server has acknowledged our latest input. Both sides move
+# paddles with pongSim.movePaddle, so the prediction follows the same rules as the server.
+#
+# Each state is kept at the time it was sent, in our clock. With a shared clock (pongClock, the
+# state's "time" field) that is exact; without one it is guessed from the state's tick and the
+# quickest arrivals seen so far.
+
+from collections import deque
+
+# Fields drawn from interpolated states
+POSITION_FIELDS = ("ball_x", "ball_y", "p1_y", "p2_y")
+
+class SnapshotBuffer:
+    # Author:   Shelby Scoville
+    # Purpose:  Keeps recent server states with the local time they were sent
+    # Pre:      tickRate turns the state's "sync" tick into seconds, delay is how far in the past
+    #           to draw (about two send intervals), maxExtrapolation caps guessing past the newest state
+    # Post:     Buffer is empty
+    def __init__(self, tickRate: float =60.0, delay: float =0.05, maxExtrapolation: float =0.1, size: int =32) -> None:
+        self.tickRate = tickRate
+        self.delay = delay
+        self.maxExtrapolation = maxExtrapolation
+        # (local time sent, state), oldest first
+        self.states = deque(maxlen=size)
+        # Without a shared clock: estimate of (local clock - tick time) for states that arrive
+        # with no extra delay
+        self.offset = None
+
+    # Author:   Shelby Scoville
+    # Purpose:  Adds a state as it arrives
+    # Pre:      state is a full state, arrival is the local perf_counter() time it arrived, sent is
+    #           when the server sent it in the same clock (from the state's "time"), or None if unknown
+    # Post:     State is buffered (older or repeated ticks are ignored)
+    def push(self, state: dict, arrival: float, sent: float =None) -> None:
+        if self.states and state["sync"] <= self.states[-1][1]["sync"]:
+            return
+        if sent is None:
+            # The quickest arrivals show the real offset; delayed ones only nudge it up slowly,
+            # which also follows any drift between the two clocks
+            serverTime = state["sync"] / self.tickRate
+            sample = arrival - serverTime
+            if self.offset is None or sample < self.offset:
+                self.offset = sample
+            else:
+                self.offset += (sample - self.offset) * 0.01
+            sent = serverTime + self.offset
+        if self.states:
+            # A newer state never goes before an older one, even when the estimate moved back
+            sent = max(sent, self.states[-1][0])
+        self.states.append((sent, state))
+
+    # Author:   Shelby Scoville
+    # Purpose:  Estimates the server's current time in ticks
+    # Pre:      At least one state has been pushed
+    # Post:     Returns the tick the server is at now (as a float)
+    def serverTick(self, now: float) -> float:
+        newestTime, newest = self.states[-1]
+        return newest["sync"] + (now - newestTime) * self.tickRate
+
+    # Author:   Shelby Scoville
+    # Purpose:  Works out where remote things should be drawn right now
+    # Pre:      now is the local perf_counter() time
+    # Post:     Returns a dictionary of POSITION_FIELDS, or None when nothing has arrived yet
+    def sample(self, now: float) -> dict:
+        if not self.states:
+            return None
+        renderTime = now - self.delay
+
+        newestTime, newest = self.states[-1]
+        if renderTime >= newestTime:
+            # Nothing newer has arrived: carry the ball on along its velocity for a little while
+            ahead = min(renderTime - newestTime, self.maxExtrapolation) * self.tickRate
+            view = {field: newest[field] for field in POSITION_FIELDS}
+            view["ball_x"] = round(newest["ball_x"] + newest["ball_dx"] * ahead)
+            view["ball_y"] = round(newest["ball_y"] + newest["ball_dy"] * ahead)
+            return view
+
+        oldestTime, oldest = self.states[0]
+        if renderTime <= oldestTime:
+            return {field: oldest[field] for field in POSITION_FIELDS}
+
+        # Find the two states either side of renderTime, newest pairs first since that is where it usually is
+        for i in range(len(self.states) - 1, 0, -1):
+            beforeTime, before = self.states[i - 1]
+            if beforeTime <= renderTime:
+                afterTime, after = self.states[i]
+                break
+        if before["score1"] != after["score1"] or before["score2"] != after["score2"]:
+            # A point was scored in between and the ball was reset; sliding it across the screen would be wrong
+            return {field: after[field] for field in POSITION_FIELDS}
+        t = (renderTime - beforeTime) / (afterTime - beforeTime)
+        return {field: round(before[field] + (after[field] - before[field]) * t) for field in POSITION_FIELDS}
+
+
+class PaddlePredictor:
+    # Author:   Shelby Scoville
+    # Purpose:  Moves our own paddle right away and reconciles it with the authoritative server
+    # Pre:      paddle is the local player's Paddle
+    # Post:     No input sent yet
+    def __init__(self, paddle, screenHeight: int) -> None:
+        self.paddle = paddle
+        self.screenHeight = screenHeight
+        self.seq = 0
+        self.sentMoving = None
+        # Corrections bigger than this snap straight to the server's position
+        self.snapDistance = 60
+
+    # Author:   Shelby Scoville
+    # Purpose:  Notes the paddle's direction and says whether the server needs to hear about it
+    # Pre:      paddle.moving holds the current input
+    # Post:     Returns the new input sequence number to send, or None if the input has not changed
+    def inputChanged(self):
+        if self.paddle.moving == self.sentMoving:
+            return None
+        self.sentMoving = self.paddle.moving
+        self.seq += 1
+        return self.seq
+
+    # Author:   Shelby Scoville
+    # Purpose:  Pulls our paddle toward where the server says it is
+    # Pre:      serverY and ackedSeq come from a server state that is ticksBehind ticks old
+    # Post:     paddle.rect.y is corrected, unless inputs the server has not seen yet are still in flight
+    def reconcile(self, serverY: int, ackedSeq: int, ticksBehind: float) -> None:
+        if ackedSeq != self.seq:
+            # The server has not applied our latest input yet, so its position cannot be compared
+            return
+
+        # The server has kept moving the paddle since that state, the same way we have
+        direction = {"up": -1, "down": 1}.get(self.paddle.moving, 0)
+        target = serverY + direction * self.paddle.speed * max(0.0, ticksBehind)
+        # movePaddle stops at the walls, so the server's paddle will have too
+        target = max(10, min(self.screenHeight - 10 - self.paddle.rect.height, target))
+        if direction != 0:
+            # Still moving: only correct real mistakes, small differences are just timing
+            if abs(target - self.paddle.rect.y) <= self.paddle.speed * 2:
+                return
+        error = round(target - self.paddle.rect.y)
+        if abs(error) >= self.snapDistance:
+            self.paddle.rect.y += error
+        elif error:
+            # Ease toward the server over a few frames so the correction is not visible as a jump
+            step = error // 4 if abs(error) >= 4 else (1 if error > 0 else -1)
+            self.paddle.rect.y += step
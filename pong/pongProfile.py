@@ -0,0 +1,174 @@
+# =================================================================================================
+# Contributing Authors:	    Shelby Scoville
+# Email Addresses:          snsc235@uky.edu
+# Date:                     10/18/2026
+# Purpose:                  Opt-in per-phase frame profiler for the client, with Chrome trace export
+# =================================================================================================
+#
+# Each thread that is profiled gets its own Lane: preallocated arrays used as a ring buffer, so
+# recording a phase is a clock read and three array stores, with no allocation and no lock. Code
+# marks the end of each phase with lane.lap(PHASE); the phase is timed from the previous lap.
+# lane.frame() then closes the whole frame at the last lap, so a frame's phases add up to it.
+# Only the newest `capacity` spans are kept.
+#
+# The client only creates a FrameProfiler when --profile is given. Every place that records
+# something checks "if lane is not None" first, so a client without it does no extra work.
+#
+# Open the saved trace in chrome://tracing or https://ui.perfetto.dev
+
+import json
+import threading
+import time
+from array import array
+
+# Phases of a client frame, then of the receive thread. Lanes store the index, names are for output
+PHASES = ("frame", "events", "lock wait", "state", "physics", "render", "display update", "frame cap",
+          "send", "recv wait", "parse")
+(FRAME, EVENTS, LOCK_WAIT, STATE, PHYSICS, RENDER, DISPLAY, FRAME_CAP,
+ SEND, RECV_WAIT, PARSE) = range(len(PHASES))
+
+# Spans kept per lane: about 70 seconds of a 60 fps client with 9 spans per frame
+CAPACITY = 1 << 16
+
+# Author:   Shelby Scoville
+# Purpose:  Returns the value at fraction p of a sorted list
+# Pre:      values is sorted
+# Post:     Returns one element of values, or 0.0 if it is empty
+def percentile(values: list, p: float) -> float:
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(p * len(values)))]
+
+class Lane:
+    # Author:   Shelby Scoville
+    # Purpose:  Ring buffer of timed phases for one thread
+    # Pre:      capacity is a power of two. Only the thread it belongs to records into it
+    # Post:     Lane is empty, the first phase is timed from now
+    def __init__(self, name: str, capacity: int =CAPACITY) -> None:
+        self.name = name
+        self.tid = threading.get_ident()
+        self.mask = capacity - 1
+        self.starts = array("d", bytes(8 * capacity))
+        self.ends = array("d", bytes(8 * capacity))
+        self.phases = array("B", bytes(capacity))
+        # Spans recorded so far, including ones that were overwritten
+        self.count = 0
+        self.last = self.frameStart = time.perf_counter()
+
+    # Author:   Shelby Scoville
+    # Purpose:  Records that a phase just ended
+    # Pre:      phase is one of the PHASES constants
+    # Post:     The phase is stored as running from the previous lap until now
+    def lap(self, phase: int) -> None:
+        now = time.perf_counter()
+        i = self.count & self.mask
+        self.starts[i] = self.last
+        self.ends[i] = now
+        self.phases[i] = phase
+        self.count += 1
+        self.last = now
+
+    # Author:   Shelby Scoville
+    # Purpose:  Records that a frame ended with the last lap, the next one starts there
+    # Pre:      None
+    # Post:     A FRAME span from the end of the previous frame to the last lap is stored
+    def frame(self) -> None:
+        i = self.count & self.mask
+        self.starts[i] = self.frameStart
+        self.ends[i] = self.last
+        self.phases[i] = FRAME
+        self.count += 1
+        self.frameStart = self.last
+
+    # Author:   Shelby Scoville
+    # Purpose:  The spans still in the buffer, oldest first
+    # Pre:      The owning thread is not recording (or a torn last span does not matter)
+    # Post:     Returns a list of (phase, start, end) in perf_counter seconds
+    def spans(self) -> list:
+        count = self.count
+        first = max(0, count - self.mask - 1)
+        return [(self.phases[i & self.mask], self.starts[i & self.mask], self.ends[i & self.mask])
+                for i in range(first, count)]
+
+class FrameProfiler:
+    # Author:   Shelby Scoville
+    # Purpose:  Holds the lanes of every profiled thread
+    # Pre:      None
+    # Post:     No lanes yet
+    def __init__(self, capacity: int =CAPACITY) -> None:
+        self.capacity = capacity
+        self.lanes = []
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+
+    # Author:   Shelby Scoville
+    # Purpose:  Makes a lane for the calling thread
+    # Pre:      Called from the thread that will record into it
+    # Post:     Returns the new Lane
+    def lane(self, name: str) -> Lane:
+        lane = Lane(name, self.capacity)
+        with self.lock:
+            self.lanes.append(lane)
+        return lane
+
+    # Author:   Shelby Scoville
+    # Purpose:  Builds a Chrome trace-event document of everything recorded
+    # Pre:      None
+    # Post:     Returns a dict ready for json.dump, times in microseconds since the profiler started
+    def trace(self) -> dict:
+        events = [{"name": "process_name", "ph": "M", "pid": 1, "args": {"name": "pongClient"}}]
+        with self.lock:
+            lanes = list(self.lanes)
+        for lane in lanes:
+            events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": lane.tid, "args": {"name": lane.name}})
+            for phase, start, end in lane.spans():
+                events.append({"name": PHASES[phase], "ph": "X", "pid": 1, "tid": lane.tid,
+                               "ts": round((start - self.started) * 1e6, 3), "dur": round((end - start) * 1e6, 3)})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    # Author:   Shelby Scoville
+    # Purpose:  Saves the Chrome trace to a file
+    # Pre:      path is writable
+    # Post:     File holds the trace as JSON
+    def write_trace(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump(self.trace(), f)
+
+    # Author:   Shelby Scoville
+    # Purpose:  Per-phase duration percentiles of everything still in the buffers
+    # Pre:      None
+    # Post:     Returns {lane name: {phase name: {"count", "p50", "p90", "p99", "max", "total"}}}, times in ms
+    def percentiles(self) -> dict:
+        with self.lock:
+            lanes = list(self.lanes)
+        result = {}
+        for lane in lanes:
+            durations = {}
+            for phase, start, end in lane.spans():
+                durations.setdefault(PHASES[phase], []).append((end - start) * 1000)
+            stats = {}
+            for name, values in durations.items():
+                values.sort()
+                stats[name] = {"count": len(values), "p50": percentile(values, 0.50), "p90": percentile(values, 0.90),
+                               "p99": percentile(values, 0.99), "max": values[-1], "total": sum(values)}
+            result[lane.name] = stats
+        return result
+
+    # Author:   Shelby Scoville
+    # Purpose:  A readable table of percentiles() with each phase's share of its lane's time
+    # Pre:      None
+    # Post:     Returns the table as a string
+    def summary(self) -> str:
+        lines = []
+        for laneName, stats in self.percentiles().items():
+            lines.append(f"{laneName}: {'count':>7} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8} {'share':>6}  (ms)")
+            # Phases add up to the frames they were in; lanes without frames share out their phases
+            whole = stats["frame"]["total"] if "frame" in stats else sum(s["total"] for s in stats.values())
+            for name in PHASES:
+                if name not in stats:
+                    continue
+                s = stats[name]
+                share = s["total"] / whole * 100 if whole else 0.0
+                lines.append(f"  {name:<15} {s['count']:>7} {s['p50']:8.3f} {s['p90']:8.3f} {s['p99']:8.3f} "
+                             f"{s['max']:8.3f} {share:5.1f}%")
+        return "\n".join(lines)
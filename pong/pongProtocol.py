@@ -0,0 +1,345 @@
+# =================================================================================================
+# Contributing Authors:	    Shelby Scoville
+# Email Addresses:          snsc235@uky.edu
+# Date:                     10/18/2026
+# Purpose:                  Wire formats shared by the server and client (JSON lines and binary frames)
+# =================================================================================================
+#
+# Every message is still a plain dictionary in the game code; a codec only decides how it goes on the
+# wire. The server offers the formats it supports in init_data, the client answers with a JSON
+# {"format": ...} line and the server confirms with the same line before switching. Anything that
+# does not take part in the handshake keeps speaking JSON lines.
+#
+# Binary frame layout (network byte order):
+#     uint8  type tag
+#     uint16 payload length
+#     payload (fixed struct layout per type tag)
+#
+# Clients that ask for "delta" in the handshake get "snapshot" messages instead of full states.
+# A snapshot carries its own number ("snap") and the number of the acknowledged snapshot it is
+# relative to ("base"), plus only the fields that changed since then. base 0 marks a keyframe that
+# carries every field. The client acks each snapshot it rebuilds and can ask for a keyframe.
+# In binary the snapshot payload is: uint32 snap, uint8 snap-base distance (0 for a keyframe),
+# uint16 field mask, changed fields.
+
+import json
+import struct
+from operator import itemgetter
+
+FORMAT_JSON = "json"
+FORMAT_BINARY = "binary"
+# Formats the server offers, best first
+SUPPORTED_FORMATS = [FORMAT_BINARY, FORMAT_JSON]
+
+# Message kinds: (type tag, payload layout, field names in payload order)
+MESSAGE_LAYOUTS = {
+    # Server -> client: the full game state (pN_seq: last paddle input the server applied per player,
+    # time: server clock in milliseconds when it was sent, see pongClock)
+    "state": (1, struct.Struct("!hhhhhhHHIIII"),
+              ("ball_x", "ball_y", "ball_dx", "ball_dy", "p1_y", "p2_y", "score1", "score2", "sync",
+               "p1_seq", "p2_seq", "time")),
+    # Client -> server: the original host/client update
+    "update": (2, struct.Struct("!hhhhhHHI"),
+               ("paddle_y", "ball_x", "ball_y", "ball_dx", "ball_dy", "score1", "score2", "sync")),
+    # Client -> server: paddle input for an authoritative server
+    "input": (3, struct.Struct("!BI"), ("moving", "seq")),
+    # Client -> server: the newest snapshot the client has rebuilt
+    "ack": (5, struct.Struct("!I"), ("ack",)),
+    # Client -> server: please send a full snapshot next
+    "keyframe": (6, struct.Struct("!B"), ("keyframe",)),
+    # Server -> client over the reliable UDP channel: the score changed
+    "score": (7, struct.Struct("!HH"), ("score_left", "score_right")),
+    # Client -> server over UDP: ties the UDP address to the TCP connection with the same token
+    "hello": (8, struct.Struct("!I"), ("hello",)),
+    # Either direction: clock/round trip probe and its answer (microsecond clocks, see pongClock)
+    "ping": (9, struct.Struct("!IQ"), ("ping", "t0")),
+    "pong": (10, struct.Struct("!IQQQ"), ("pong", "t0", "t1", "t2")),
+}
+
+# Server -> client: delta snapshot (variable layout, see above)
+SNAPSHOT_TAG = 4
+SNAPSHOT_HEADER = struct.Struct("!IBH")
+# Furthest back a delta may reach, so the distance fits in its uint8
+MAX_BASE_DISTANCE = 255
+STATE_FIELDS = MESSAGE_LAYOUTS["state"][2]
+# struct format character of each state field, in STATE_FIELDS order
+STATE_FIELD_FORMATS = MESSAGE_LAYOUTS["state"][1].format[1:]
+
+HEADER = struct.Struct("!BH")
+
+# Smallest and largest integer each struct format character used above can carry
+FORMAT_RANGES = {"B": (0, 0xFF), "h": (-0x8000, 0x7FFF), "H": (0, 0xFFFF), "I": (0, 0xFFFFFFFF),
+                 "Q": (0, 0xFFFFFFFFFFFFFFFF)}
+# Range of each state field in binary frames: whatever a server stores in a state must fit these
+STATE_FIELD_RANGES = {field: FORMAT_RANGES[code] for field, code in zip(STATE_FIELDS, STATE_FIELD_FORMATS)}
+
+# "moving" travels as a small number in binary frames
+MOVING_CODES = {"": 0, "up": 1, "down": 2}
+MOVING_NAMES = {code: name for name, code in MOVING_CODES.items()}
+
+# Messages where only the newest of several queued back to back matters: full states, snapshots
+# and the original host/client updates. Found without decoding by type tag or, in JSON, by a key
+# only these messages carry ("sync" in states and updates, "snap" in snapshots).
+LATEST_WINS_TAGS = frozenset((MESSAGE_LAYOUTS["state"][0], MESSAGE_LAYOUTS["update"][0], SNAPSHOT_TAG))
+LATEST_WINS_KEYS = (b'"sync"', b'"snap"')
+
+# Author:   Shelby Scoville
+# Purpose:  Builds a function that pulls the given fields out of a message as a tuple
+# Pre:      fields is a non-empty tuple of keys
+# Post:     Returns the getter (itemgetter alone returns a bare value for a single field)
+def fields_getter(fields: tuple):
+    if len(fields) == 1:
+        field = fields[0]
+        return lambda data: (data[field],)
+    return itemgetter(*fields)
+
+class JsonCodec:
+    # Author:   Shelby Scoville
+    # Purpose:  The original newline-delimited JSON format
+    # Pre:      None
+    # Post:     None
+    name = FORMAT_JSON
+
+    def encode(self, kind: str, data: dict) -> bytes:
+        return (json.dumps(data) + '\n').encode('utf-8')
+
+    # Author:   Shelby Scoville
+    # Purpose:  Finds where the JSON line at offset start ends without parsing it
+    # Pre:      buffer[:stop] holds received bytes (stop defaults to the whole buffer)
+    # Post:     Returns (latest_wins, end), end == start if the line is not complete yet
+    def frame(self, buffer, start: int =0, stop: int =None) -> tuple:
+        end = buffer.find(b'\n', start, stop)
+        if end == -1:
+            return False, start
+        latest = any(buffer.find(key, start, end) != -1 for key in LATEST_WINS_KEYS)
+        return latest, end + 1
+
+    # Author:   Shelby Scoville
+    # Purpose:  Decodes the JSON line that starts at offset start
+    # Pre:      buffer[:stop] holds received bytes (stop defaults to the whole buffer)
+    # Post:     Returns (message, end). end == start means the line is not complete yet,
+    #           message is None for a corrupted line that should be skipped
+    def decode(self, buffer, start: int =0, stop: int =None) -> tuple:
+        end = buffer.find(b'\n', start, stop)
+        if end == -1:
+            return None, start
+        try:
+            return json.loads(buffer[start:end]), end + 1
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return None, end + 1
+
+
+class BinaryCodec:
+    # Author:   Shelby Scoville
+    # Purpose:  Fixed-layout struct frames with a type tag and length prefix
+    # Pre:      None
+    # Post:     Lookup tables are built from MESSAGE_LAYOUTS
+    name = FORMAT_BINARY
+
+    def __init__(self) -> None:
+        self.by_tag = {tag: (kind, layout, fields) for kind, (tag, layout, fields) in MESSAGE_LAYOUTS.items()}
+        # Header + payload packed in one call, with the fields pulled out in payload order
+        self.by_kind = {kind: (struct.Struct(HEADER.format + layout.format[1:]), tag, layout.size, fields_getter(fields))
+                        for kind, (tag, layout, fields) in MESSAGE_LAYOUTS.items()}
+        # Snapshot field mask -> (payload layout of the changed fields, their names)
+        self.snapshot_layouts = {}
+
+    # Author:   Shelby Scoville
+    # Purpose:  Looks up (and caches) the payload layout for a snapshot field mask
+    # Pre:      mask has one bit per entry of STATE_FIELDS
+    # Post:     Returns (struct for the changed fields, their names)
+    def snapshot_layout(self, mask: int) -> tuple:
+        entry = self.snapshot_layouts.get(mask)
+        if entry is None:
+            present = [i for i in range(len(STATE_FIELDS)) if mask & (1 << i)]
+            entry = (struct.Struct("!" + "".join(STATE_FIELD_FORMATS[i] for i in present)),
+                     tuple(STATE_FIELDS[i] for i in present))
+            self.snapshot_layouts[mask] = entry
+        return entry
+
+    # Author:   Shelby Scoville
+    # Purpose:  Packs a delta snapshot with only the fields it carries
+    # Pre:      data has "snap", "base" and any subset of STATE_FIELDS
+    # Post:     Returns the frame bytes
+    def encode_snapshot(self, data: dict) -> bytes:
+        mask = 0
+        values = []
+        for i, field in enumerate(STATE_FIELDS):
+            if field in data:
+                mask |= 1 << i
+                values.append(data[field])
+        layout = self.snapshot_layout(mask)[0]
+        length = SNAPSHOT_HEADER.size + layout.size
+        distance = data["snap"] - data["base"] if data["base"] else 0
+        return (HEADER.pack(SNAPSHOT_TAG, length) + SNAPSHOT_HEADER.pack(data["snap"], distance, mask)
+                + layout.pack(*values))
+
+    # Author:   Shelby Scoville
+    # Purpose:  Unpacks a delta snapshot payload
+    # Pre:      buffer[start:end] is a snapshot payload
+    # Post:     Returns the message dictionary, or None if the payload is malformed
+    def decode_snapshot(self, buffer, start: int, end: int) -> dict:
+        if end - start < SNAPSHOT_HEADER.size:
+            return None
+        snap, distance, mask = SNAPSHOT_HEADER.unpack_from(buffer, start)
+        layout, fields = self.snapshot_layout(mask)
+        if end - start != SNAPSHOT_HEADER.size + layout.size:
+            return None
+        message = dict(zip(fields, layout.unpack_from(buffer, start + SNAPSHOT_HEADER.size)))
+        message["snap"] = snap
+        message["base"] = snap - distance if distance else 0
+        return message
+
+    # Author:   Shelby Scoville
+    # Purpose:  Packs one message into a binary frame
+    # Pre:      kind is a key of MESSAGE_LAYOUTS and data has all of its fields as integers
+    # Post:     Returns the frame bytes
+    def encode(self, kind: str, data: dict) -> bytes:
+        if kind == "snapshot":
+            return self.encode_snapshot(data)
+        frame, tag, size, getter = self.by_kind[kind]
+        if kind == "input":
+            return frame.pack(tag, size, MOVING_CODES.get(data["moving"], 0), data["seq"])
+        return frame.pack(tag, size, *getter(data))
+
+    # Author:   Shelby Scoville
+    # Purpose:  Finds where the frame at offset start ends from its header alone
+    # Pre:      buffer[:stop] holds received bytes (stop defaults to the whole buffer)
+    # Post:     Returns (latest_wins, end) the same way JsonCodec.frame does
+    def frame(self, buffer, start: int =0, stop: int =None) -> tuple:
+        if stop is None:
+            stop = len(buffer)
+        if stop - start < HEADER.size:
+            return False, start
+        tag, length = HEADER.unpack_from(buffer, start)
+        end = start + HEADER.size + length
+        if stop < end:
+            return False, start
+        return tag in LATEST_WINS_TAGS, end
+
+    # Author:   Shelby Scoville
+    # Purpose:  Decodes the frame that starts at offset start
+    # Pre:      buffer[:stop] holds received bytes (stop defaults to the whole buffer)
+    # Post:     Returns (message, end) the same way JsonCodec.decode does
+    def decode(self, buffer, start: int =0, stop: int =None) -> tuple:
+        if stop is None:
+            stop = len(buffer)
+        if stop - start < HEADER.size:
+            return None, start
+        tag, length = HEADER.unpack_from(buffer, start)
+        end = start + HEADER.size + length
+        if stop < end:
+            return None, start
+        if tag == SNAPSHOT_TAG:
+            return self.decode_snapshot(buffer, start + HEADER.size, end), end
+        entry = self.by_tag.get(tag)
+        if entry is None or entry[1].size != length:
+            # Unknown or malformed frame, the length prefix still lets us skip it
+            return None, end
+        kind, layout, fields = entry
+        message = dict(zip(fields, layout.unpack_from(buffer, start + HEADER.size)))
+        if kind == "input":
+            message["moving"] = MOVING_NAMES.get(message["moving"], "")
+        return message, end
+
+
+JSON_CODEC = JsonCodec()
+BINARY_CODEC = BinaryCodec()
+CODECS = {FORMAT_JSON: JSON_CODEC, FORMAT_BINARY: BINARY_CODEC}
+
+# Author:   Shelby Scoville
+# Purpose:  Picks the wire format to use from the formats a server offered
+# Pre:      offered is the 'formats' list from init_data, or None for an older server
+# Post:     Returns the chosen format name
+def choose_format(offered: list) -> str:
+    for name in SUPPORTED_FORMATS:
+        if offered and name in offered:
+            return name
+    return FORMAT_JSON
+
+
+class DeltaEncoder:
+    # Author:   Shelby Scoville
+    # Purpose:  Server side of delta snapshots for one client
+    # Pre:      keyframe_interval is how many snapshots may pass between full ones,
+    #           history is how many unacknowledged snapshots are kept as possible bases
+    # Post:     The first snapshot will be a keyframe
+    def __init__(self, keyframe_interval: int =60, history: int =64) -> None:
+        self.keyframe_interval = keyframe_interval
+        self.history = history
+        self.snap = 0
+        self.acked = 0
+        self.last_keyframe = 0
+        self.keyframe_requested = True
+        # snap -> full state that was sent with that number, oldest first
+        self.sent = {}
+
+    # Author:   Shelby Scoville
+    # Purpose:  Records that the client has rebuilt a snapshot, so it can be used as a base
+    # Pre:      snap came from an "ack" message
+    # Post:     Older snapshots are forgotten
+    def ack(self, snap: int) -> None:
+        if snap <= self.acked or snap not in self.sent:
+            return
+        self.acked = snap
+        for old in [s for s in self.sent if s < snap]:
+            del self.sent[old]
+
+    def request_keyframe(self) -> None:
+        self.keyframe_requested = True
+
+    # Author:   Shelby Scoville
+    # Purpose:  Turns a full state into the next snapshot message for this client
+    # Pre:      state holds every field of STATE_FIELDS
+    # Post:     Returns a keyframe or a delta against the last acknowledged snapshot
+    def encode(self, state: dict) -> dict:
+        self.snap += 1
+        base = self.sent.get(self.acked)
+        if (base is None or self.keyframe_requested or self.snap - self.acked > MAX_BASE_DISTANCE
+                or self.snap - self.last_keyframe >= self.keyframe_interval):
+            message = dict(state)
+            message["base"] = 0
+            self.last_keyframe = self.snap
+            self.keyframe_requested = False
+        else:
+            message = {field: value for field, value in state.items() if base.get(field) != value}
+            message["base"] = self.acked
+        message["snap"] = self.snap
+
+        self.sent[self.snap] = dict(state)
+        if len(self.sent) > self.history:
+            # Dictionaries keep insertion order, so the first key is the oldest snapshot
+            del self.sent[next(iter(self.sent))]
+        return message
+
+
+class DeltaDecoder:
+    # Author:   Shelby Scoville
+    # Purpose:  Client side of delta snapshots, rebuilds full states
+    # Pre:      history is how many rebuilt snapshots to keep as possible bases
+    # Post:     No snapshots known yet
+    def __init__(self, history: int =64) -> None:
+        self.history = history
+        self.states = {}
+
+    # Author:   Shelby Scoville
+    # Purpose:  Rebuilds the full state carried by a snapshot message
+    # Pre:      message came from the server with "snap" and "base"
+    # Post:     Returns the full state (do not modify it), or None when the base is unknown
+    #           and a keyframe has to be requested
+    def decode(self, message: dict) -> dict:
+        snap = message.pop("snap")
+        base = message.pop("base")
+        if base == 0:
+            state = message
+        else:
+            previous = self.states.get(base)
+            if previous is None:
+                return None
+            state = previous.copy()
+            state.update(message)
+
+        self.states[snap] = state
+        if len(self.states) > self.history:
+            del self.states[next(iter(self.states))]
+        return state
@@ -0,0 +1,180 @@
+# =================================================================================================
+# Contributing Authors:	    Shelby Scoville
+# Email Addresses:          snsc235@uky.edu
+# Date:                     10/18/2026
+# Purpose:                  Draws the Pong screen by only updating the parts that changed
+# =================================================================================================
+#
+# Everything that rarely changes (walls, center line, score, win message) is drawn once onto a
+# background layer. Each frame the ball and paddles are erased by copying that layer back over
+# where they were, drawn at their new positions, and only those rectangles are pushed to the
+# window. The layer is only rebuilt when the score or win message changes, and rendered score
+# text is kept so each score is only rendered once.
+
+import pygame
+
+from pongSim import WIN_SCORE
+from pongProfile import RENDER
+
+WHITE = (255,255,255)
+BLACK = (0,0,0)
+
+class Renderer:
+    # Author:   Shelby Scoville
+    # Purpose:  Holds the background layer and what was drawn last frame
+    # Pre:      screen is the display surface, staticRects are the walls and center line
+    # Post:     Nothing has been drawn yet, the first draw() redraws the whole window
+    def __init__(self, screen: pygame.Surface, staticRects: list, scoreFont: pygame.font.Font,
+                 winFont: pygame.font.Font, dirtyRects: bool =True) -> None:
+        self.screen = screen
+        self.staticRects = staticRects
+        self.scoreFont = scoreFont
+        self.winFont = winFont
+        self.dirtyRects = dirtyRects
+        self.screenRect = screen.get_rect()
+        self.layer = pygame.Surface(screen.get_size()).convert()
+        self.layerKey = None
+        self.scoreCache = {}
+        self.winCache = {}
+        # Rectangles of the moving things as drawn last frame
+        self.lastRects = []
+        # Ball and paddles for drawState, laid out like playGame does
+        width, height = screen.get_size()
+        self.stateRects = [pygame.Rect(width/2, height/2, 5, 5), pygame.Rect(10, 0, 10, 50),
+                           pygame.Rect(width-20, 0, 10, 50)]
+        # Profiler lane of the drawing thread (pongProfile), so drawing and pushing to the window
+        # are timed apart
+        self.lane = None
+
+    # Author:   Shelby Scoville
+    # Purpose:  Returns the rendered score text and where it goes, rendering it the first time only
+    # Pre:      None
+    # Post:     Surface is kept for the next time this score is shown
+    def scoreSurface(self, lScore: int, rScore: int) -> tuple:
+        key = (lScore, rScore)
+        if key not in self.scoreCache:
+            # Same text and position as updateScore
+            surface = self.scoreFont.render(f"{lScore}   {rScore}", False, WHITE).convert_alpha()
+            rect = surface.get_rect()
+            rect.center = ((self.screenRect.width/2)+5, 50)
+            self.scoreCache[key] = (surface, rect)
+        return self.scoreCache[key]
+
+    def winSurface(self, winText: str) -> tuple:
+        if winText not in self.winCache:
+            surface = self.winFont.render(winText, False, WHITE, BLACK).convert()
+            rect = surface.get_rect()
+            rect.center = ((self.screenRect.width/2), self.screenRect.height/2)
+            self.winCache[winText] = (surface, rect)
+        return self.winCache[winText]
+
+    # Author:   Shelby Scoville
+    # Purpose:  Redraws the background layer for a new score or win message
+    # Pre:      None
+    # Post:     layer holds the win message, center line, walls and score (in the order playGame drew them)
+    def buildLayer(self, lScore: int, rScore: int, winText: str =None) -> None:
+        self.layer.fill(BLACK)
+        if winText:
+            self.layer.blit(*self.winSurface(winText))
+        for rect in self.staticRects:
+            pygame.draw.rect(self.layer, WHITE, rect)
+        self.layer.blit(*self.scoreSurface(lScore, rScore))
+        self.layerKey = (lScore, rScore, winText)
+
+    # Author:   Shelby Scoville
+    # Purpose:  Draws one frame
+    # Pre:      movingRects are the ball (or None once the game is over) and the paddles, always in
+    #           the same order
+    # Post:     Window shows the frame, returns the list of rectangles that were pushed to it
+    def draw(self, movingRects: list, lScore: int, rScore: int, winText: str =None) -> list:
+        if not self.dirtyRects:
+            return self.drawFull(movingRects, lScore, rScore, winText)
+
+        rects = [rect.copy() if rect is not None else None for rect in movingRects]
+        if (lScore, rScore, winText) != self.layerKey or len(rects) != len(self.lastRects):
+            # Score or message changed: start over from a fresh layer
+            self.buildLayer(lScore, rScore, winText)
+            self.screen.blit(self.layer, (0,0))
+            dirty = [self.screenRect]
+        else:
+            dirty = []
+            for old, new in zip(self.lastRects, rects):
+                if old == new:
+                    continue
+                if old is not None:
+                    self.screen.blit(self.layer, old, old)
+                if old is None:
+                    dirty.append(new)
+                elif new is None:
+                    dirty.append(old)
+                else:
+                    dirty.append(old.union(new))
+
+        # Redraw everything that moves, things that did not move may have been partly erased by a
+        # neighbour's old rectangle. Only the changed areas get pushed to the window.
+        for rect in rects:
+            if rect is not None:
+                pygame.draw.rect(self.screen, WHITE, rect)
+        self.lastRects = rects
+
+        dirty = [rect.clip(self.screenRect) for rect in dirty]
+        if self.lane is not None:
+            self.lane.lap(RENDER)
+        if dirty:
+            pygame.display.update(dirty)
+        return dirty
+
+    # Author:   Shelby Scoville
+    # Purpose:  Draws a game state as it is sent by the server (for replays and spectators)
+    # Pre:      state has the ball, paddle and score fields of a full game state
+    # Post:     Same as draw()
+    def drawState(self, state: dict) -> list:
+        ball, leftPaddle, rightPaddle = self.stateRects
+        ball.x, ball.y = state["ball_x"], state["ball_y"]
+        leftPaddle.y = state["p1_y"]
+        rightPaddle.y = state["p2_y"]
+        lScore, rScore = state["score1"], state["score2"]
+        winText = None
+        if lScore > WIN_SCORE or rScore > WIN_SCORE:
+            winText = "Player 1 Wins! " if lScore > rScore else "Player 2 Wins! "
+        return self.draw([ball if winText is None else None, leftPaddle, rightPaddle], lScore, rScore, winText)
+
+    # Author:   Shelby Scoville
+    # Purpose:  Draws one frame the original way: clear, draw everything, push the whole window
+    # Pre:      Same as draw()
+    # Post:     Window shows the frame, returns the whole screen rectangle
+    def drawFull(self, movingRects: list, lScore: int, rScore: int, winText: str =None) -> list:
+        self.screen.fill(BLACK)
+        if winText:
+            textSurface = self.winFont.render(winText, False, WHITE, BLACK)
+            textRect = textSurface.get_rect()
+            textRect.center = ((self.screenRect.width/2), self.screenRect.height/2)
+            self.screen.blit(textSurface, textRect)
+        for rect in movingRects:
+            if rect is not None:
+                pygame.draw.rect(self.screen, WHITE, rect)
+        for rect in self.staticRects:
+            pygame.draw.rect(self.screen, WHITE, rect)
+        textSurface = self.scoreFont.render(f"{lScore}   {rScore}", False, WHITE)
+        textRect = textSurface.get_rect()
+        textRect.center = ((self.screenRect.width/2)+5, 50)
+        self.screen.blit(textSurface, textRect)
+        if self.lane is not None:
+            self.lane.lap(RENDER)
+        pygame.display.update()
+        return [self.screenRect]
+
+# Author:   Shelby Scoville
+# Purpose:  Opens a game window for watching states (replays and spectating) rather than playing
+# Pre:      Run from the pong/ folder (for the fonts)
+# Post:     Returns a Renderer for the window, with the same walls, center line and fonts as playGame
+def openWindow(screenWidth: int, screenHeight: int, caption: str ="Pong") -> Renderer:
+    pygame.init()
+    screen = pygame.display.set_mode((screenWidth, screenHeight))
+    pygame.display.set_caption(caption)
+    scoreFont = pygame.font.Font("./assets/fonts/pong-score.ttf", 32)
+    winFont = pygame.font.Font("./assets/fonts/visitor.ttf", 48)
+    staticRects = [pygame.Rect(-10, 0, screenWidth+20, 10), pygame.Rect(-10, screenHeight-10, screenWidth+20, 10)]
+    for i in range(0, screenHeight, 10):
+        staticRects.append(pygame.Rect((screenWidth/2)-5, i, 5, 5))
+    return Renderer(screen, staticRects, scoreFont, winFont)
@@ -0,0 +1,450 @@
+# =================================================================================================
+# Contributing Authors:	    Shelby Scoville
+# Email Addresses:          snsc235@uky.edu
+# Date:                     10/18/2026
+# Purpose:                  Records matches to compact binary replay files and plays them back
+# =================================================================================================
+#
+# A replay file is (network byte order):
+#     header: 8s magic "PONGREP1", uint16 version, uint16 keyframe interval, float64 wall clock
+#             time the recording started, uint32 match (room) number
+#     records, one per state transition: uint16 field mask, then the fields it marks, packed the
+#             same way as a binary delta snapshot (see pongProtocol). Record 0 and every keyframe
+#             interval'th record after it carry every field; the rest only what changed.
+#     footer (written when the recording is closed): per keyframe uint64 file offset and uint32
+#             time, then uint32 keyframe count, uint64 record count, 8s magic "PONGIDX1"
+#
+# The "time" field of a recorded state is milliseconds since the recording started. Records are
+# packed into memory on the game loop and handed to a ReplayWriter thread in large chunks, so the
+# server never waits on the disk. Replay memory-maps a file and uses the keyframe index to rebuild
+# the state at any tick from one keyframe and at most interval - 1 deltas. A file whose recording
+# never got closed (the server crashed) has no footer; its index is rebuilt by one scan.
+#
+# Play a replay:  python pongReplay.py match.pongrep [--at 90] [--speed 4] [--headless]
+
+import argparse
+import json
+import mmap
+import os
+import queue
+import struct
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_right
+from operator import itemgetter
+
+from pongProtocol import BINARY_CODEC, STATE_FIELDS
+
+REPLAY_MAGIC = b"PONGREP1"
+INDEX_MAGIC = b"PONGIDX1"
+REPLAY_VERSION = 1
+FILE_HEADER = struct.Struct("!8sHHdI")
+RECORD_MASK = struct.Struct("!H")
+INDEX_ENTRY = struct.Struct("!QI")
+FOOTER = struct.Struct("!IQ8s")
+
+FULL_MASK = (1 << len(STATE_FIELDS)) - 1
+TIME_INDEX = STATE_FIELDS.index("time")
+TIME_BIT = 1 << TIME_INDEX
+STATE_GETTER = itemgetter(*STATE_FIELDS)
+
+# Field mask -> (struct for the mask and the marked fields, getter for those fields' values,
+# their positions in STATE_FIELDS)
+RECORD_LAYOUTS = {}
+
+# Author:   Shelby Scoville
+# Purpose:  Looks up (and caches) how to pack and unpack a record with the given field mask
+# Pre:      mask has one bit per entry of STATE_FIELDS and is not 0
+# Post:     Returns (record struct, getter that pulls the marked values out of a full value list,
+#           positions of the marked fields)
+def record_layout(mask: int) -> tuple:
+    entry = RECORD_LAYOUTS.get(mask)
+    if entry is None:
+        layout = BINARY_CODEC.snapshot_layout(mask)[0]
+        present = tuple(i for i in range(len(STATE_FIELDS)) if mask & (1 << i))
+        getter = itemgetter(*present) if len(present) > 1 else (lambda values, i=present[0]: (values[i],))
+        entry = (struct.Struct(RECORD_MASK.format + layout.format[1:]), getter, present)
+        RECORD_LAYOUTS[mask] = entry
+    return entry
+
+class ReplayWriter:
+    # Author:   Shelby Scoville
+    # Purpose:  Background thread that does all of the replay file writing for a server
+    # Pre:      None
+    # Post:     The thread starts with the first chunk submitted
+    def __init__(self) -> None:
+        self.jobs = queue.Queue()
+        self.thread = None
+        self.bytes_written = 0
+
+    # Author:   Shelby Scoville
+    # Purpose:  Hands a chunk of bytes to the writer thread
+    # Pre:      file is open for writing, close=True only for its last chunk
+    # Post:     The chunk is written (and the file closed) in the background
+    def submit(self, file, data: bytes, close: bool =False) -> None:
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+        self.jobs.put((file, data, close))
+
+    def run(self) -> None:
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            write_chunk(*job)
+            self.bytes_written += len(job[1])
+
+    # Author:   Shelby Scoville
+    # Purpose:  Waits for everything submitted so far to reach the disk and stops the thread
+    # Pre:      No more chunks will be submitted
+    # Post:     All files handed over with close=True are closed
+    def close(self) -> None:
+        if self.thread is not None:
+            self.jobs.put(None)
+            self.thread.join()
+            self.thread = None
+
+# Author:   Shelby Scoville
+# Purpose:  Writes one chunk to a replay file
+# Pre:      file is open for writing
+# Post:     The chunk is written and the file closed if asked; a failing disk only loses the replay
+def write_chunk(file, data: bytes, close: bool) -> None:
+    try:
+        if data:
+            file.write(data)
+        if close:
+            file.close()
+    except (OSError, ValueError) as e:
+        print(f"Replay {file.name}: write failed, {e}")
+
+class Recorder:
+    # Author:   Shelby Scoville
+    # Purpose:  Records one match's states to a replay file
+    # Pre:      The folder of path exists. writer (optional) writes in the background, without one
+    #           chunks are written right away. chunk_size and max_age (seconds) decide how much is
+    #           kept in memory before it is written
+    # Post:     The file is created and its header written
+    def __init__(self, path: str, writer: ReplayWriter =None, keyframe_interval: int =60, match: int =0,
+                 chunk_size: int =32768, max_age: float =5.0) -> None:
+        self.path = path
+        self.writer = writer
+        self.keyframe_interval = keyframe_interval
+        self.chunk_size = chunk_size
+        self.max_age = max_age
+        self.file = open(path, "wb")
+        self.started = time.monotonic()
+        self.last_flush = self.started
+        self.buffer = bytearray(FILE_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, keyframe_interval, time.time(), match))
+        # File offset of the start of buffer
+        self.offset = 0
+        self.last = None
+        self.records = 0
+        self.keyframes = array("Q")
+        self.keyframe_times = array("I")
+        self.closed = False
+
+    # Author:   Shelby Scoville
+    # Purpose:  Appends a state if anything but its time changed since the last one recorded
+    # Pre:      state holds every field of STATE_FIELDS as integers, now is time.monotonic()
+    # Post:     Returns True if a record was added
+    def record(self, state: dict, now: float =None) -> bool:
+        now = time.monotonic() if now is None else now
+        values = list(STATE_GETTER(state))
+        values[TIME_INDEX] = elapsed = int((now - self.started) * 1000) & 0xFFFFFFFF
+        last = self.last
+        if self.records % self.keyframe_interval == 0:
+            if last is not None and all(a == b for i, (a, b) in enumerate(zip(values, last)) if i != TIME_INDEX):
+                return False
+            mask = FULL_MASK
+            self.keyframes.append(self.offset + len(self.buffer))
+            self.keyframe_times.append(elapsed)
+        else:
+            mask = 0
+            for i, (a, b) in enumerate(zip(values, last)):
+                if a != b:
+                    mask |= 1 << i
+            if not mask & ~TIME_BIT:
+                return False
+        layout, getter, _ = record_layout(mask)
+        self.buffer += layout.pack(mask, *getter(values))
+        self.last = values
+        self.records += 1
+        if len(self.buffer) >= self.chunk_size or now - self.last_flush >= self.max_age:
+            self.flush(now)
+        return True
+
+    # Author:   Shelby Scoville
+    # Purpose:  Hands what is buffered to the writer
+    # Pre:      Recorder is open
+    # Post:     buffer is empty
+    def flush(self, now: float =None, close: bool =False) -> None:
+        self.last_flush = time.monotonic() if now is None else now
+        data = bytes(self.buffer)
+        self.offset += len(data)
+        self.buffer.clear()
+        if self.writer is not None:
+            self.writer.submit(self.file, data, close)
+        else:
+            write_chunk(self.file, data, close)
+
+    # Author:   Shelby Scoville
+    # Purpose:  Finishes the file with its keyframe index
+    # Pre:      None
+    # Post:     The recording is complete and will be closed by the writer
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        for offset, elapsed in zip(self.keyframes, self.keyframe_times):
+            self.buffer += INDEX_ENTRY.pack(offset, elapsed)
+        self.buffer += FOOTER.pack(len(self.keyframes), self.records, INDEX_MAGIC)
+        self.flush(close=True)
+
+# Author:   Shelby Scoville
+# Purpose:  Picks the file name for a match's replay
+# Pre:      folder exists
+# Post:     Returns a path that sorts by the time the match started
+def replay_path(folder: str, match: int) -> str:
+    return os.path.join(folder, f"match-{time.strftime('%Y%m%d-%H%M%S')}-{match}.pongrep")
+
+class Replay:
+    # Author:   Shelby Scoville
+    # Purpose:  Read-only view of a replay file
+    # Pre:      path is a replay file (complete, or cut short by a crash)
+    # Post:     The file is memory-mapped and its keyframe index loaded. Raises ValueError if it is
+    #           not a replay
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as file:
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.data) < FILE_HEADER.size:
+            raise ValueError(f"{path} is not a replay")
+        magic, version, self.keyframe_interval, self.started_at, self.match = FILE_HEADER.unpack_from(self.data)
+        if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+            raise ValueError(f"{path} is not a version {REPLAY_VERSION} replay")
+        self.end = len(self.data)
+        self.keyframes = array("Q")
+        self.keyframe_times = array("I")
+        self.complete = self.read_index()
+        if not self.complete:
+            self.scan()
+
+    # Author:   Shelby Scoville
+    # Purpose:  Loads the keyframe index from the footer
+    # Pre:      None
+    # Post:     Returns False if there is no valid footer
+    def read_index(self) -> bool:
+        if len(self.data) < FILE_HEADER.size + FOOTER.size:
+            return False
+        count, records, magic = FOOTER.unpack_from(self.data, len(self.data) - FOOTER.size)
+        index_start = len(self.data) - FOOTER.size - count * INDEX_ENTRY.size
+        if magic != INDEX_MAGIC or index_start < FILE_HEADER.size:
+            return False
+        for offset, elapsed in INDEX_ENTRY.iter_unpack(self.data[index_start:len(self.data) - FOOTER.size]):
+            self.keyframes.append(offset)
+            self.keyframe_times.append(elapsed)
+        self.records = records
+        self.end = index_start
+        return True
+
+    # Author:   Shelby Scoville
+    # Purpose:  Rebuilds the keyframe index of a file without a footer by reading every record
+    # Pre:      None
+    # Post:     A partly written last record is ignored
+    def scan(self) -> None:
+        data = self.data
+        offset = FILE_HEADER.size
+        records = 0
+        while offset + RECORD_MASK.size <= len(data):
+            mask = RECORD_MASK.unpack_from(data, offset)[0]
+            if not mask:
+                break
+            layout = record_layout(mask)[0]
+            if offset + layout.size > len(data):
+                break
+            if records % self.keyframe_interval == 0:
+                self.keyframes.append(offset)
+                self.keyframe_times.append(layout.unpack_from(data, offset)[1 + TIME_INDEX])
+            offset += layout.size
+            records += 1
+        self.records = records
+        self.end = offset
+
+    def __len__(self) -> int:
+        return self.records
+
+    # Author:   Shelby Scoville
+    # Purpose:  Applies the record at offset to a list of field values
+    # Pre:      offset is the start of a record
+    # Post:     values is updated in place, returns the offset of the next record
+    def apply(self, offset: int, values: list) -> int:
+        layout, _, present = record_layout(RECORD_MASK.unpack_from(self.data, offset)[0])
+        unpacked = layout.unpack_from(self.data, offset)
+        for index, value in zip(present, unpacked[1:]):
+            values[index] = value
+        return offset + layout.size
+
+    # Author:   Shelby Scoville
+    # Purpose:  Rebuilds the field values at a tick
+    # Pre:      0 <= tick < len(self)
+    # Post:     Returns (values in STATE_FIELDS order, offset of the next record); reads one keyframe
+    #           and at most interval - 1 deltas
+    def seek(self, tick: int) -> tuple:
+        if not 0 <= tick < self.records:
+            raise IndexError(f"tick {tick} is not in the replay")
+        keyframe, skip = divmod(tick, self.keyframe_interval)
+        values = [0] * len(STATE_FIELDS)
+        offset = self.apply(self.keyframes[keyframe], values)
+        for _ in range(skip):
+            offset = self.apply(offset, values)
+        return values, offset
+
+    def state_at(self, tick: int) -> dict:
+        return dict(zip(STATE_FIELDS, self.seek(tick)[0]))
+
+    # Author:   Shelby Scoville
+    # Purpose:  Steps through the states in order
+    # Pre:      0 <= start
+    # Post:     Yields (tick, state) from start up to (not including) stop
+    def states(self, start: int =0, stop: int =None):
+        stop = self.records if stop is None else min(stop, self.records)
+        if start >= stop:
+            return
+        values, offset = self.seek(start)
+        yield start, dict(zip(STATE_FIELDS, values))
+        for tick in range(start + 1, stop):
+            offset = self.apply(offset, values)
+            yield tick, dict(zip(STATE_FIELDS, values))
+
+    # Author:   Shelby Scoville
+    # Purpose:  Finds the tick being shown a given time into the recording
+    # Pre:      ms is milliseconds since the recording started
+    # Post:     Returns the last tick recorded at or before ms (0 if ms is before the first)
+    def tick_at(self, ms: int) -> int:
+        keyframe = max(0, bisect_right(self.keyframe_times, ms) - 1)
+        tick = keyframe * self.keyframe_interval
+        for next_tick, state in self.states(tick + 1, tick + self.keyframe_interval):
+            if state["time"] > ms:
+                break
+            tick = next_tick
+        return min(tick, max(0, self.records - 1))
+
+    def duration_ms(self) -> int:
+        return self.state_at(self.records - 1)["time"] if self.records else 0
+
+    def close(self) -> None:
+        self.data.close()
+
+# Author:   Shelby Scoville
+# Purpose:  Plays a replay without a window, printing each state as a JSON line
+# Pre:      speed is how many times faster than real time to go, 0 for as fast as possible
+# Post:     Every state from start on has been written to out
+def play_headless(replay: Replay, start: int =0, speed: float =1.0, out=sys.stdout) -> None:
+    started = time.perf_counter()
+    base = None
+    for tick, state in replay.states(start):
+        if speed > 0:
+            if base is None:
+                base = state["time"]
+            due = (state["time"] - base) / 1000 / speed - (time.perf_counter() - started)
+            if due > 0:
+                time.sleep(due)
+        state["tick"] = tick
+        out.write(json.dumps(state) + "\n")
+
+# Author:   Shelby Scoville
+# Purpose:  Plays a replay in a window with the game's own renderer
+# Pre:      Run from the pong/ folder (for the fonts), speed > 0
+# Post:     Returns when the window is closed. Space pauses, left/right jump 5 seconds, up/down
+#           double or halve the speed
+def play_window(replay: Replay, start: int =0, speed: float =1.0, screenWidth: int =640, screenHeight: int =480) -> None:
+    # Only the window needs pygame, servers that record never load it through this module
+    import pygame
+    from pongRender import openWindow
+
+    renderer = openWindow(screenWidth, screenHeight)
+
+    tick = start
+    state = replay.state_at(tick)
+    # Position in the recording in milliseconds, states are shown once it reaches their time
+    playhead = state["time"]
+    stream = replay.states(tick + 1)
+    upcoming = next(stream, None)
+    clock = pygame.time.Clock()
+    paused = False
+    caption = None
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                pygame.quit()
+                return
+            if event.type != pygame.KEYDOWN:
+                continue
+            if event.key == pygame.K_SPACE:
+                paused = not paused
+            elif event.key == pygame.K_UP:
+                speed *= 2
+            elif event.key == pygame.K_DOWN:
+                speed /= 2
+            elif event.key in (pygame.K_LEFT, pygame.K_RIGHT):
+                jump = 5000 if event.key == pygame.K_RIGHT else -5000
+                tick = replay.tick_at(max(0, int(playhead) + jump))
+                state = replay.state_at(tick)
+                playhead = state["time"]
+                stream = replay.states(tick + 1)
+                upcoming = next(stream, None)
+
+        elapsed = clock.tick(60)
+        if not paused:
+            playhead += elapsed * speed
+            while upcoming is not None and upcoming[1]["time"] <= playhead:
+                tick, state = upcoming
+                upcoming = next(stream, None)
+
+        renderer.drawState(state)
+
+        newCaption = (f"Replay of match {replay.match}: {state['time'] // 1000}s, tick {tick}/{len(replay)}, "
+                      f"x{speed:g}{' (paused)' if paused else ''}")
+        if newCaption != caption:
+            pygame.display.set_caption(newCaption)
+            caption = newCaption
+
+# Author:   Shelby Scoville
+# Purpose:  Describes what a replay file holds
+# Pre:      None
+# Post:     Returns a few lines of text
+def describe(replay: Replay) -> str:
+    size = len(replay.data)
+    started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(replay.started_at))
+    return (f"match {replay.match}, recorded {started}, {replay.duration_ms() / 1000:.1f}s\n"
+            f"{len(replay)} states, {len(replay.keyframes)} keyframes (every {replay.keyframe_interval}), "
+            f"{size} bytes ({size / max(1, len(replay)):.1f} per state)\n"
+            + ("index: footer" if replay.complete else "index: rebuilt by scanning (recording was not closed)"))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play back a recorded match")
+    parser.add_argument("replay", help="a .pongrep file written by a server started with --record")
+    parser.add_argument("--tick", type=int, default=0, help="start at this tick")
+    parser.add_argument("--at", type=float, default=None, help="start this many seconds into the match")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="times real time (headless: 0 prints as fast as possible)")
+    parser.add_argument("--headless", action="store_true", help="print states as JSON lines instead of drawing them")
+    parser.add_argument("--info", action="store_true", help="only describe the file")
+    args = parser.parse_args()
+
+    replay = Replay(args.replay)
+    start = replay.tick_at(int(args.at * 1000)) if args.at is not None else args.tick
+    try:
+        if args.info or not len(replay):
+            print(describe(replay))
+        elif args.headless:
+            play_headless(replay, start, args.speed)
+        else:
+            play_window(replay, start, args.speed or 1.0)
+    except (KeyboardInterrupt, BrokenPipeError):
+        pass
+    finally:
+        replay.close()
@@ -7,14 +7,248 @@
 
 import socket
 import threading
-import json
+import selectors
+import select
+import argparse
+import time
+import random
+import os
+
+from pongSim import Simulation, TickStats
+from pongProtocol import (JSON_CODEC, BINARY_CODEC, CODECS, SUPPORTED_FORMATS, choose_format, DeltaEncoder,
+                          STATE_FIELD_RANGES)
+from pongFraming import FrameBuffer
+from pongBroadcast import OutboundQueue, queue_summary
+from pongMetrics import Metrics, TimedLock
+from pongClock import ClockSync, answer_ping, now_us, stamp_ms, rtt_summary
+from pongReplay import Recorder, ReplayWriter, replay_path
+from pongSpectate import SpectatorHub
+from pongStats import StatsWriter
+from pongShard import ShardedServer, receive_connections, send_report
+from pongUdp import UdpChannel, LossyShim, MAX_DATAGRAM, DATAGRAM_HEADER, CHANNEL_RELIABLE
+
+SCREEN_WIDTH = 640
+SCREEN_HEIGHT = 480
+# A client's socket may stay backed up for this many retransmission timeouts (TCP backs off
+# 1 + 2 + 4 of them over three lost segments) before it is evicted, if that is over --stall-timeout
+STALL_TIMEOUTS = 8
+
+# Author:   Shelby Scoville
+# Purpose:  Builds the starting game state for a single match
+# Pre:      None
+# Post:     Returns a fresh game state dictionary
+def new_game_state() -> dict:
+    return {
+        "ball_x": 320,
+        "ball_y": 240,
+        "ball_dx": -5,
+        "ball_dy": 0,
+        "p1_y": 215,
+        "p2_y": 215,
+        "score1": 0,
+        "score2": 0,
+        "sync" : 0,
+        "p1_seq": 0,
+        "p2_seq": 0,
+        "time": 0
+    }
+
+# Ball and score fields a host update may carry, stored under the same names in the game state
+UPDATE_FIELDS = ("ball_x", "ball_y", "ball_dx", "ball_dy", "score1", "score2", "sync")
+
+# Author:   Shelby Scoville
+# Purpose:  Checks one number a client sent before it goes into a game state
+# Pre:      field is a state field
+# Post:     Returns value clamped to what field can carry in a binary frame, or None if it is not an int
+def wire_int(value, field: str) -> int:
+    if type(value) is not int:
+        return None
+    low, high = STATE_FIELD_RANGES[field]
+    return min(high, max(low, value))
+
+# Author:   Shelby Scoville
+# Purpose:  Merges one client update into a match's game state
+# Pre:      data is a decoded client message, player_id is 1 or 2
+# Post:     game_state holds the player's paddle and any newer ball/score data, and returns True.
+#           An update with a value that is not an int changes nothing and returns False; the rest
+#           are clamped to the binary state layout, so every peer can always be sent the state
+def merge_update(game_state: dict, player_id: int, data: dict) -> bool:
+    paddle = "p1_y" if player_id == 1 else "p2_y"
+    values = {}
+    for field, stored in (("paddle_y", paddle),) + tuple(zip(UPDATE_FIELDS, UPDATE_FIELDS)):
+        if field in data:
+            value = wire_int(data[field], stored)
+            if value is None:
+                return False
+            values[stored] = value
+
+    # Update the specific paddle position for this player
+    game_state[paddle] = values.get(paddle, game_state[paddle])
+
+    # Sync logic: Only update ball/score if the client is "newer"
+    # This prevents an old message from overwriting a newer one.
+    if values.get("sync", 0) >= game_state["sync"]:
+        for field in UPDATE_FIELDS:
+            game_state[field] = values.get(field, game_state[field])
+    return True
+
+# Author:   Shelby Scoville
+# Purpose:  Builds the configuration message sent to a client when it connects
+# Pre:      paddle is "left" or "right", tick_rate/send_rate are set when the server runs the simulation,
+#           udp_port/udp_token are set when the server offers the UDP state stream
+# Post:     Returns the init_data dictionary
+def make_init_data(paddle: str, tick_rate: float =None, udp_port: int =None, udp_token: int =None,
+                   send_rate: float =None) -> dict:
+    init_data = {
+        'screen_width': SCREEN_WIDTH,
+        'screen_height': SCREEN_HEIGHT,
+        'paddle': paddle,
+        # Wire formats this server speaks; the client may ask to switch to one of them
+        'formats': SUPPORTED_FORMATS,
+        # The server answers pings, and pings back clients that ping it (see pongClock)
+        'clock': True
+    }
+    if tick_rate is not None:
+        # Tells the client to send only paddle input and take ball/score from the server
+        init_data['authoritative'] = True
+        init_data['tick_rate'] = tick_rate
+        # How often state is sent, so the client can size its interpolation buffer
+        init_data['send_rate'] = send_rate or tick_rate
+    if udp_port is not None:
+        # Binary clients may send a hello with this token to that port to get state over UDP
+        init_data['udp_port'] = udp_port
+        init_data['udp_token'] = udp_token
+    return init_data
+
+# Author:   Shelby Scoville
+# Purpose:  Starts recording a match if the server was asked to
+# Pre:      folder is the --record folder or None
+# Post:     Returns a Recorder, or None when not recording or the file could not be created
+def open_recorder(folder: str, writer: ReplayWriter, match: int) -> Recorder:
+    if folder is None:
+        return None
+    try:
+        return Recorder(replay_path(folder, match), writer, match=match)
+    except OSError as e:
+        print(f"Could not record match {match}: {e}")
+        return None
+
+class Connection:
+    # Author:   Shelby Scoville
+    # Purpose:  Per-socket state (wire format, snapshots, and buffers for the event loop server)
+    # Pre:      sock is a connected socket
+    # Post:     Empty receive buffer and outbound queue
+    def __init__(self, sock: socket.socket, addr, max_queue: int =64, stall_timeout: float =5.0,
+                 metrics: Metrics =None) -> None:
+        self.sock = sock
+        self.addr = addr
+        self.frames = FrameBuffer()
+        self.outbound = OutboundQueue(max_queue, stall_timeout, metrics)
+        self.stall_timeout = stall_timeout
+        # Threaded server only: the client's thread and the broadcast thread both encode for it
+        self.lock = threading.RLock()
+        self.room = None
+        self.player_id = 0
+        self.closed = False
+        # Every client starts on JSON and may switch during the handshake
+        self.codec = JSON_CODEC
+        # Set when the client asked for delta snapshots
+        self.delta = None
+        # Set once the client's UDP hello arrives; state then goes over UDP instead of TCP
+        self.udp = None
+        self.udp_token = None
+        self.last_score = None
+        # Round trip and clock offset to this client; we only ping clients that ping us
+        self.clock = ClockSync()
+        self.answers_pings = False
+        # Player name the client sent in the format handshake, for match results
+        self.name = None
+
+    # Author:   Shelby Scoville
+    # Purpose:  Takes in the answer to one of our pings and fits the timeouts to the round trip
+    # Pre:      pong is the decoded pong, received is now_us() when it arrived
+    # Post:     clock is updated. UDP resends wait one retransmission timeout, and the socket may stay
+    #           backed up for as long as TCP could spend resending (never less than stall_timeout)
+    def receive_pong(self, pong: dict, received: int) -> None:
+        if not self.clock.receive(pong, received):
+            return
+        timeout = self.clock.retransmit_timeout()
+        if self.udp is not None:
+            self.udp.resend_interval = timeout
+        self.outbound.stall_timeout = max(self.stall_timeout, STALL_TIMEOUTS * timeout)
+
+# Author:   Shelby Scoville
+# Purpose:  Handles the messages that manage a connection rather than the game
+# Pre:      conn sent data, send(message) answers the client in its current format
+# Post:     Returns True when data was a control message (format handshake, snapshot ack,
+#           keyframe request, ping or pong) and has been dealt with. send(message, kind) may be
+#           called with kind "control" (JSON handshake) or "pong"
+def handle_control(conn: Connection, data: dict, send) -> bool:
+    # Format handshake: confirm in JSON, then switch for everything after
+    if "format" in data and conn.codec is JSON_CODEC:
+        chosen = choose_format([data["format"]])
+        confirm = {"format": chosen}
+        if data.get("delta"):
+            conn.delta = DeltaEncoder()
+            confirm["delta"] = True
+        if data.get("name"):
+            conn.name = str(data["name"])[:32]
+        send(confirm, "control")
+        conn.codec = CODECS[chosen]
+        return True
+    if "ping" in data:
+        # A client that pings us knows how to answer our pings too
+        conn.answers_pings = True
+        send(answer_ping(data, now_us()), "pong")
+        return True
+    if "pong" in data:
+        conn.receive_pong(data, now_us())
+        return True
+    if "ack" in data:
+        if conn.delta is not None:
+            conn.delta.ack(data["ack"])
+        return True
+    if "keyframe" in data:
+        if conn.delta is not None:
+            conn.delta.request_keyframe()
+        return True
+    return False
+
+# Author:   Shelby Scoville
+# Purpose:  The name a player's results are saved under
+# Pre:      None
+# Post:     Returns the name the client sent, or its IP address if it sent none
+def player_name(conn: Connection) -> str:
+    if conn.name:
+        return conn.name
+    if isinstance(conn.addr, tuple):
+        return conn.addr[0]
+    return "unknown"
+
+# Message kinds where a newer one replaces an older one still waiting in a client's queue
+LATEST_WINS_KINDS = ("state", "snapshot")
+
+# Author:   Shelby Scoville
+# Purpose:  Picks how a state goes out to a client: as a full state or as a delta snapshot
+# Pre:      state is a full game state
+# Post:     Returns (message kind, message)
+def outgoing_state(conn: Connection, state: dict) -> tuple:
+    if conn.delta is not None:
+        return "snapshot", conn.delta.encode(state)
+    return "state", state
 
 class Server:
     # Author:   Shelby Scoville
     # Purpose:  Initialize the server socket and game state
-    # Pre:      Port is available
+    # Pre:      Port is available. send_rate is how many states per second each client gets,
+    #           max_queue and stall_timeout decide when a client that is not keeping up is evicted.
+    #           metrics (optional) is filled in as the game runs. record_dir (optional) is a folder
+    #           to save a replay of the match in. spectators (optional, started) gets every state sent.
+    #           stats_path (optional) is a SQLite file the match result is saved to
     # Post:     Server is listening for connections
-    def __init__(self, host: str ='0.0.0.0', port: int =55555) -> None:
+    def __init__(self, host: str ='0.0.0.0', port: int =55555, send_rate: float =60.0, max_queue: int =64,
+                 stall_timeout: float =5.0, metrics: Metrics =None, record_dir: str =None,
+                 spectators: SpectatorHub =None, stats_path: str =None) -> None:
         self.host = host
         self.port = port
         # Create a TCP socket
@@ -26,97 +260,187 @@ class Server:
 
         # List to stor connected client sockets
         self.clients = []
-        # Lock to prevent data corruption
-        self.state_lock = threading.Lock()
+        # Lock to prevent data corruption (timed only when metrics are on)
+        self.metrics = metrics
+        self.state_lock = TimedLock(metrics) if metrics is not None else threading.Lock()
 
         # The master game state
         # This dictionary hold the official truth of where everything is
-        self.game_state = {
-            "ball_x": 320,
-            "ball_y": 240,
-            "ball_dx": -5,
-            "ball_dy": 0,
-            "p1_y": 215,
-            "p2_y": 215,
-            "score1": 0,
-            "score2": 0,
-            "sync" : 0
-        }
-
-    # Author:   Shelby Scoville
-    # Purpose:  Sends JSON data to a specific client
-    # Pre:      Client socket is open
+        self.game_state = new_game_state()
+
+        # State goes out on a fixed schedule from per-client queues instead of as replies
+        self.send_rate = send_rate
+        self.max_queue = max_queue
+        self.stall_timeout = stall_timeout
+        self.connections = []
+        self.evictions = 0
+        self.running = False
+
+        # Every state sent out is also recorded when a record folder is given
+        self.record_dir = record_dir
+        self.replay_writer = ReplayWriter()
+        self.recorder = None
+        self.spectators = spectators
+        # The result is saved in the background when the match ends
+        self.stats = StatsWriter(stats_path) if stats_path is not None else None
+        self.started_at = None
+
+    # Author:   Shelby Scoville
+    # Purpose:  Sends data to a specific client in the client's wire format
+    # Pre:      Client socket is open and blocking (only used for init_data)
     # Post:     Data is sent encoded as bytes
-    def send_data(self, client: socket.socket, data: dict) -> bool:
+    def send_data(self, client: socket.socket, data: dict, codec=JSON_CODEC, kind: str ="state") -> bool:
         try:
-            # Convert dictionary to JSON string and add newline delimiter
-            message = json.dumps(data) + '\n'
+            # Encode the dictionary (a JSON line unless the client asked for binary)
+            message = codec.encode(kind, data)
             # Send data over the network
-            client.sendall(message.encode('utf-8'))
+            client.sendall(message)
             return True
         except:
             # If sending fails (client disconnected), return False
             return False
 
     # Author:   Shelby Scoville
-    # Purpose:  Handles communication loop for a single client (Receives updates, sends state)
-    # Pre:      Client is connected and identified by player_id
+    # Purpose:  Queues a message for a client and writes what its socket will take without waiting
+    # Pre:      conn's socket is non-blocking
+    # Post:     The client is evicted if its queue overflowed or its connection broke
+    def queue_data(self, conn: Connection, data: dict, kind: str ="state") -> None:
+        with conn.lock:
+            if conn.closed:
+                return
+            if self.metrics is not None:
+                self.metrics.inc("pong_messages_out_total")
+            if not conn.outbound.push(conn.codec.encode(kind, data), kind in LATEST_WINS_KINDS):
+                self.evict(conn, "outbound queue overflowed")
+                return
+            try:
+                conn.outbound.flush(conn.sock)
+            except OSError:
+                self.evict(conn, "connection broke")
+
+    # Author:   Shelby Scoville
+    # Purpose:  Drops a client that is not keeping up
+    # Pre:      None
+    # Post:     The client's socket is shut down, which ends its handle_client thread
+    def evict(self, conn: Connection, reason: str) -> None:
+        with conn.lock:
+            if conn.closed:
+                return
+            conn.closed = True
+        self.evictions += 1
+        print(f"Evicting player {conn.player_id}: {reason}")
+        try:
+            conn.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    # Author:   Shelby Scoville
+    # Purpose:  Receives what a client sent and merges its updates into the game state
+    # Pre:      conn's socket is non-blocking and has data (or was closed)
+    # Post:     Returns False when the client closed the connection. Raises BlockingIOError if
+    #           there was nothing to read after all
+    def receive_messages(self, conn: Connection) -> bool:
+        # 1. Receive Data
+        count = conn.frames.recv_into(conn.sock)
+        if not count:
+            # Connection closed by client
+            return False
+        if self.metrics is not None:
+            self.metrics.inc("pong_bytes_in_total", count)
+
+        # 2. Process ALL complete messages currently in the buffer (older updates that
+        #    a newer one replaces are skipped)
+        while True:
+            started = time.perf_counter() if self.metrics is not None else 0
+            data, found = conn.frames.next_message(conn.codec)
+            if not found:
+                # The rest of the buffer is a partial message
+                break
+            if self.metrics is not None:
+                self.metrics.observe("pong_decode_seconds", time.perf_counter() - started)
+            if not isinstance(data, dict):
+                # If a message is corrupted (or not an object), just skip it and keep going
+                continue
+
+            # Handshake and snapshot acks are not game updates
+            with conn.lock:
+                if handle_control(conn, data, lambda message, kind: self.queue_data(conn, message, kind)):
+                    continue
+
+            if self.metrics is not None:
+                self.metrics.inc("pong_messages_in_total")
+
+            # 3. Update Game State (the broadcast thread sends it out)
+            with self.state_lock:
+                merge_update(self.game_state, conn.player_id, data)
+        return True
+
+    # Author:   Shelby Scoville
+    # Purpose:  Handles communication loop for a single client (Receives updates)
+    # Pre:      Client is connected, non-blocking and identified by conn.player_id
     # Post:     Client loop ends upon disconnection
-    def handle_client(self, client: socket.socket, player_id: int) -> None:
-        # buffer to store partial messages
-        buffer = "" 
+    def handle_client(self, conn: Connection) -> None:
+        client = conn.sock
+        player_id = conn.player_id
 
         # Loop forever while client is connected
         while True:
             try:
-                # 1. Receive Data
-                chunk = client.recv(1024).decode('utf-8')
-                if not chunk:
-                    # Connection closed by client
-                    break
-                
-                buffer += chunk
-
-                # 2. Process ALL complete messages currently in the buffer
-                while '\n' in buffer:
-                    message, buffer = buffer.split('\n', 1)
-                    
-                    try:
-                        data = json.loads(message)
-                    except json.JSONDecodeError:
-                        # If a message is corrupted, just skip it and keep going
-                        continue
-
-                    # 3. Update Game State
-                    with self.state_lock:
-                        # Update the specific paddle position for this player
-                        if player_id == 1:
-                            self.game_state["p1_y"] = data.get("paddle_y", self.game_state["p1_y"])
-                        else:
-                            self.game_state["p2_y"] = data.get("paddle_y", self.game_state["p2_y"])
-
-                        # Sync logic: Only update ball/score if the client is "newer"
-                        # This prevents an old message from overwriting a newer one.
-                        if data.get("sync", 0) >= self.game_state["sync"]:
-                            self.game_state["ball_x"] = data.get("ball_x", self.game_state["ball_x"])
-                            self.game_state["ball_y"] = data.get("ball_y", self.game_state["ball_y"])
-                            self.game_state["ball_dx"] = data.get("ball_dx", self.game_state["ball_dx"])
-                            self.game_state["ball_dy"] = data.get("ball_dy", self.game_state["ball_dy"])
-                            self.game_state["score1"] = data.get("score1", self.game_state["score1"])
-                            self.game_state["score2"] = data.get("score2", self.game_state["score2"])
-                            self.game_state["sync"] = data["sync"]
-                
-                # 4. Send the updated state back to the client
-                response = self.game_state.copy()
-                if not self.send_data(client, response):
-                    break   
-
+                # Wait until there is something to read, the socket itself never blocks
+                select.select([client], [], [])
+                try:
+                    if not self.receive_messages(conn):
+                        break
+                except (BlockingIOError, InterruptedError):
+                    continue
             except Exception as e:
                 print(f"Error with player {player_id}: {e}")
                 break
         
         print(f"Player {player_id} disconnected")
+        conn.closed = True
         client.close()      
+        if self.metrics is not None:
+            self.metrics.set("pong_connections", sum(1 for c in self.connections if not c.closed))
+            self.metrics.set("pong_matches", 0)
+
+    # Author:   Shelby Scoville
+    # Purpose:  Sends the current game state to every client at send_rate
+    # Pre:      Clients are connected
+    # Post:     Runs until the server stops. Clients that stay backed up are evicted
+    def broadcast_loop(self) -> None:
+        interval = 1.0 / self.send_rate
+        next_send = time.perf_counter()
+        while self.running:
+            with self.state_lock:
+                state = self.game_state.copy()
+            if self.recorder is not None:
+                self.recorder.record(state)
+            if self.spectators is not None:
+                self.spectators.publish(1, state)
+            # Server clock when the state went out, clients convert it with their ClockSync
+            state["time"] = stamp_ms()
+            now = time.monotonic()
+            for conn in self.connections:
+                with conn.lock:
+                    if conn.closed:
+                        continue
+                    ping = conn.clock.poll() if conn.answers_pings else None
+                    if ping is not None:
+                        self.queue_data(conn, ping, "ping")
+                    # A client that has not caught up yet only ever has the newest state waiting
+                    kind, message = outgoing_state(conn, state)
+                    self.queue_data(conn, message, kind)
+                    if conn.outbound.stalled(now):
+                        self.evict(conn, f"socket backed up for over {conn.outbound.stall_timeout:g}s")
+
+            next_send += interval
+            delay = next_send - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            elif delay < -5 * interval:
+                # Fell far behind, skip ahead instead of sending a burst
+                next_send = time.perf_counter()
     
     # Author:   Shelby Scoville
     # Purpose:  Main server loop to accept incoming connections
@@ -136,28 +460,820 @@ class Server:
             # Assign paddle: Player 1 is Left, Player 2 is Right
             paddle = "left" if player_id == 1 else "right"
             # Send initial configuration to the client
-            init_data = {
-                'screen_width': 640,
-                'screen_height': 480,
-                'paddle': paddle
-            }
+            init_data = make_init_data(paddle)
             self.send_data(c, init_data)
 
+            # From here on nothing waits on this socket, slow clients only fill their own queue
+            c.setblocking(False)
+            conn = Connection(c, addr, self.max_queue, self.stall_timeout, self.metrics)
+            conn.player_id = conn.outbound.player = player_id
+            self.connections.append(conn)
+            if self.metrics is not None:
+                self.metrics.set("pong_connections", len(self.connections))
+
             print(f"Player {player_id} connected from {addr} as {paddle} paddle")
 
         # Start a new thread for each client so they can talk to the server simultanueously
-        threading.Thread(target=self.handle_client, args=(self.clients[0], 1), daemon=True).start()
-        threading.Thread(target=self.handle_client, args=(self.clients[1], 2), daemon=True).start()
+        threads = [threading.Thread(target=self.handle_client, args=(conn,), daemon=True) for conn in self.connections]
+        self.recorder = open_recorder(self.record_dir, self.replay_writer, 1)
+        if self.spectators is not None:
+            self.spectators.start_match(1)
+        self.running = True
+        self.started_at = time.time()
+        broadcaster = threading.Thread(target=self.broadcast_loop, daemon=True)
+        for t in threads + [broadcaster]:
+            t.start()
+        if self.metrics is not None:
+            self.metrics.set("pong_matches", 1)
 
-        print("Both players connected! Game starting...")
+        print(f"Both players connected! Game starting, sending state {self.send_rate:g} times per second...")
 
-        # Keep the main thread alive to allow background threads to run
+        # Keep the main thread alive to allow background threads to run.
+        # join() with a timeout sleeps instead of spinning a core, and still lets Ctrl+C through
+        last_report = time.perf_counter()
         try: 
+            while any(t.is_alive() for t in threads):
+                for t in threads:
+                    t.join(0.5)
+                if time.perf_counter() - last_report >= 10:
+                    print(f"Send queues: {queue_summary([c.outbound for c in self.connections], self.evictions)}")
+                    print(f"Round trips: {rtt_summary(c.clock for c in self.connections)}")
+                    if self.spectators is not None:
+                        print(f"Spectators: {self.spectators.summary()}")
+                    last_report = time.perf_counter()
+        except KeyboardInterrupt:
+            print("\nServer shutting down...")
+            self.server.close()
+        self.running = False
+        broadcaster.join(1.0)
+        if self.spectators is not None:
+            self.spectators.end_match(1)
+        if self.recorder is not None:
+            self.recorder.close()
+            self.replay_writer.close()
+            print(f"Replay saved to {self.recorder.path}")
+        if self.stats is not None:
+            with self.state_lock:
+                score1, score2 = self.game_state["score1"], self.game_state["score2"]
+            self.stats.record(1, self.started_at, time.time(), player_name(self.connections[0]),
+                              player_name(self.connections[1]), score1, score2)
+            self.stats.close()
+            print(f"Result saved to {self.stats.path}")
+
+class Room:
+    # Author:   Shelby Scoville
+    # Purpose:  Holds one match: its two players and its own game state
+    # Pre:      room_id is unique within the server
+    # Post:     Room is empty and waiting for players
+    def __init__(self, room_id: int, authoritative: bool =False) -> None:
+        self.room_id = room_id
+        self.game_state = new_game_state()
+        # Only set when the server runs the physics instead of the left client
+        self.simulation = Simulation(SCREEN_WIDTH, SCREEN_HEIGHT) if authoritative else None
+        # Index 0 is player 1 (left), index 1 is player 2 (right)
+        self.players = [None, None]
+        # Set once the match starts if the server records replays
+        self.recorder = None
+        # time.time() when the second player joined
+        self.started_at = None
+
+    # Author:   Shelby Scoville
+    # Purpose:  Seats a connection in the first free slot
+    # Pre:      Room is not full
+    # Post:     Returns the player_id (1 or 2) the connection was given
+    def add_player(self, conn: "Connection") -> int:
+        slot = 0 if self.players[0] is None else 1
+        self.players[slot] = conn
+        return slot + 1
+
+    def is_full(self) -> bool:
+        return self.players[0] is not None and self.players[1] is not None
+
+
+class EventServer:
+    # Author:   Shelby Scoville
+    # Purpose:  Single-threaded server that pairs connections into rooms and hosts many matches at once
+    # Pre:      Port is available. Passing tick_rate makes the server run every match's physics itself.
+    #           Passing udp_port (0 = same number as the TCP port) offers the UDP state stream, and
+    #           udp_shim(sendto) may wrap outgoing datagrams, e.g. in a LossyShim for testing.
+    #           send_rate (authoritative mode) sends state less often than every tick. max_queue and
+    #           stall_timeout decide when a client that is not keeping up is evicted. metrics
+    #           (optional) is filled in as the server runs. record_dir (optional) is a folder to
+    #           save a replay of every match in. spectators (optional, started) gets every match's
+    #           states. stats_path (optional) is a SQLite file every match result is saved to.
+    #           port=None opens no listening socket, connections are then handed in with add_client
+    # Post:     Server is listening for connections in non-blocking mode
+    def __init__(self, host: str ='0.0.0.0', port: int =55555, backlog: int =1024, tick_rate: float =None,
+                 udp_port: int =None, udp_shim=None, send_rate: float =None, max_queue: int =64,
+                 stall_timeout: float =5.0, metrics: Metrics =None, record_dir: str =None,
+                 spectators: SpectatorHub =None, stats_path: str =None) -> None:
+        self.host = host
+        self.selector = selectors.DefaultSelector()
+        self.server = None
+        self.port = None
+        if port is not None:
+            self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self.server.bind((host, port))
+            self.server.listen(backlog)
+            self.server.setblocking(False)
+            # Port 0 asks the OS for a free port, so read back the real one
+            self.port = self.server.getsockname()[1]
+            self.selector.register(self.server, selectors.EVENT_READ, None)
+
+        # room_id -> Room for every match that has at least one player
+        self.rooms = {}
+        # The room the next connection will be placed in
+        self.waiting_room = None
+        self.next_room_id = 1
+        # Sharded workers number their rooms 1, 1 + workers, ... so room ids stay unique across them
+        self.room_id_step = 1
+        self.running = False
+
+        # Fixed tick loop, only used in authoritative mode
+        self.tick_rate = tick_rate
+        self.tick_stats = TickStats(tick_rate) if tick_rate else None
+        self.next_tick = None
+        # State goes out every send_every ticks; clients interpolate in between
+        self.send_rate = min(send_rate or tick_rate, tick_rate) if tick_rate else None
+        self.send_every = max(1, round(tick_rate / self.send_rate)) if tick_rate else 1
+
+        # Optional UDP state stream
+        self.udp = None
+        self.udp_port = None
+        # UDP address -> Connection, and hello token -> Connection still waiting for its hello
+        self.udp_peers = {}
+        self.udp_tokens = {}
+        if udp_port is not None:
+            self.udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self.udp.bind((host, udp_port or self.port or 0))
+            self.udp.setblocking(False)
+            self.udp_port = self.udp.getsockname()[1]
+            self.udp_sendto = self.udp.sendto if udp_shim is None else udp_shim(self.udp.sendto)
+            self.selector.register(self.udp, selectors.EVENT_READ, None)
+            self.next_resend_check = 0.0
+
+        # Clients' round trip clocks are checked for due pings this often
+        self.next_ping_check = 0.0
+
+        # Per-client outbound queues; backlogged holds the clients whose socket is backed up
+        self.max_queue = max_queue
+        self.stall_timeout = stall_timeout
+        self.backlogged = set()
+        self.next_stall_check = 0.0
+
+        # Simple counters so benchmarks can see what the server did
+        self.connections_total = 0
+        self.messages_in = 0
+        self.messages_out = 0
+        self.evictions = 0
+        # Stale frames dropped by clients that have since left (live clients count their own)
+        self.frames_dropped = 0
+        # Kept up to date so a metrics scrape from another thread never walks self.rooms
+        self.connected = 0
+        self.matches = 0
+
+        # One writer thread does the disk writes for every match being recorded
+        self.record_dir = record_dir
+        self.replay_writer = ReplayWriter()
+        self.spectators = spectators
+        # One writer thread saves every match's result when the match ends
+        self.stats = StatsWriter(stats_path) if stats_path is not None else None
+
+        self.metrics = metrics
+        if metrics is not None:
+            metrics.add_collector(lambda: {"pong_messages_in_total": self.messages_in,
+                                           "pong_messages_out_total": self.messages_out,
+                                           "pong_connections": self.connected,
+                                           "pong_matches": self.matches})
+
+    # Author:   Shelby Scoville
+    # Purpose:  Number of rooms that currently have two players
+    # Pre:      None
+    # Post:     Returns the count of full rooms
+    def active_matches(self) -> int:
+        return sum(1 for room in self.rooms.values() if room.is_full())
+
+    # Author:   Shelby Scoville
+    # Purpose:  Accepts every pending connection and seats it in the lobby
+    # Pre:      Listening socket is readable
+    # Post:     New connections are registered and sent their init_data
+    def accept_clients(self) -> None:
+        while True:
+            try:
+                sock, addr = self.server.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            self.add_client(sock, addr)
+
+    # Author:   Shelby Scoville
+    # Purpose:  Seats one connected client in the lobby
+    # Pre:      sock is a connected TCP socket
+    # Post:     The client is registered and sent its init_data; two clients in a row share a match
+    def add_client(self, sock: socket.socket, addr) -> None:
+        sock.setblocking(False)
+        # Messages are tiny and latency matters more than packing them together
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        conn = Connection(sock, addr, self.max_queue, self.stall_timeout, self.metrics)
+        self.connections_total += 1
+        self.connected += 1
+        self.selector.register(sock, selectors.EVENT_READ, conn)
+
+        # Lobby: fill the waiting room, then open a new one once it is full
+        if self.waiting_room is None:
+            self.waiting_room = Room(self.next_room_id, self.tick_rate is not None)
+            self.rooms[self.next_room_id] = self.waiting_room
+            self.next_room_id += self.room_id_step
+        room = self.waiting_room
+        conn.room = room
+        conn.player_id = conn.outbound.player = room.add_player(conn)
+        if room.is_full():
+            self.waiting_room = None
+            self.matches += 1
+            room.started_at = time.time()
+            room.recorder = open_recorder(self.record_dir, self.replay_writer, room.room_id)
+            if self.spectators is not None:
+                self.spectators.start_match(room.room_id)
+
+        if self.udp is not None:
+            conn.udp_token = random.getrandbits(32)
+            while conn.udp_token in self.udp_tokens:
+                conn.udp_token = random.getrandbits(32)
+            self.udp_tokens[conn.udp_token] = conn
+
+        paddle = "left" if conn.player_id == 1 else "right"
+        self.queue_data(conn, make_init_data(paddle, self.tick_rate, self.udp_port, conn.udp_token, self.send_rate),
+                        "control")
+
+    # Author:   Shelby Scoville
+    # Purpose:  Queues a message for a client and writes as much as the socket will take
+    # Pre:      conn is open, kind names the message layout used by binary clients
+    # Post:     Unsent frames stay in conn.outbound (a newer state replaces an unsent older one)
+    #           and the socket is watched for writability. A client whose queue overflows is evicted
+    def queue_data(self, conn: Connection, data: dict, kind: str ="state") -> None:
+        if conn.closed:
+            return
+        self.messages_out += 1
+        if not conn.outbound.push(conn.codec.encode(kind, data), kind in LATEST_WINS_KINDS):
+            self.evict(conn, "outbound queue overflowed")
+            return
+        if conn not in self.backlogged:
+            # Once backed up, the selector tells us when the socket can take more
+            self.flush_client(conn)
+
+    # Author:   Shelby Scoville
+    # Purpose:  Queues a game state, as a delta snapshot if the client asked for them
+    # Pre:      state is a full game state
+    # Post:     The state is queued for the client
+    def queue_state(self, conn: Connection, state: dict) -> None:
+        if conn.closed:
+            return
+        # Server clock when the state went out, clients convert it with their ClockSync
+        state["time"] = stamp_ms()
+        kind, message = outgoing_state(conn, state)
+        if conn.udp is None:
+            self.queue_data(conn, message, kind)
+            return
+
+        self.messages_out += 1
+        conn.udp.send_state(BINARY_CODEC.encode(kind, message))
+        # A lost state datagram is fine, a lost point is not, so score changes also go reliably
+        score = (state["score1"], state["score2"])
+        if score != conn.last_score:
+            conn.last_score = score
+            conn.udp.send_reliable(BINARY_CODEC.encode("score", {"score_left": score[0], "score_right": score[1]}))
+
+    # Author:   Shelby Scoville
+    # Purpose:  Writes queued output as far as the socket will take it
+    # Pre:      conn is open
+    # Post:     The socket is watched for writability while output is left over, and not after
+    def flush_client(self, conn: Connection) -> None:
+        try:
+            done = conn.outbound.flush(conn.sock)
+        except OSError:
+            self.close_client(conn)
+            return
+        if done and conn in self.backlogged:
+            self.backlogged.discard(conn)
+            self.selector.modify(conn.sock, selectors.EVENT_READ, conn)
+        elif not done and conn not in self.backlogged:
+            self.backlogged.add(conn)
+            self.selector.modify(conn.sock, selectors.EVENT_READ | selectors.EVENT_WRITE, conn)
+
+    # Author:   Shelby Scoville
+    # Purpose:  Drops a client that is not keeping up
+    # Pre:      None
+    # Post:     The client is closed (which ends its match, like any disconnect)
+    def evict(self, conn: Connection, reason: str) -> None:
+        if conn.closed:
+            return
+        self.evictions += 1
+        print(f"Room {conn.room.room_id}: evicting player {conn.player_id}, {reason}")
+        self.close_client(conn)
+
+    # Author:   Shelby Scoville
+    # Purpose:  Sends a ping to every client that answers pings and is due one
+    # Pre:      None
+    # Post:     Pings are queued; their pongs update each client's conn.clock
+    def ping_clients(self) -> None:
+        clock_now = now_us()
+        for key in list(self.selector.get_map().values()):
+            conn = key.data
+            if isinstance(conn, Connection) and conn.answers_pings:
+                ping = conn.clock.poll(clock_now)
+                if ping is not None:
+                    self.queue_data(conn, ping, "ping")
+
+    # Author:   Shelby Scoville
+    # Purpose:  One line about the outbound queues for the periodic report
+    # Pre:      None
+    # Post:     Returns the summary string
+    def queue_report(self) -> str:
+        queues = [key.data.outbound for key in self.selector.get_map().values() if isinstance(key.data, Connection)]
+        return queue_summary(queues, self.evictions, self.frames_dropped)
+
+    # Author:   Shelby Scoville
+    # Purpose:  Reads from a client, merges every complete message into its room and replies
+    # Pre:      conn is readable
+    # Post:     Room state is updated and the latest state is queued for the client
+    def read_client(self, conn: Connection) -> None:
+        try:
+            count = conn.frames.recv_into(conn.sock)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            count = 0
+        if not count:
+            self.close_client(conn)
+            return
+        if self.metrics is not None:
+            self.metrics.inc("pong_bytes_in_total", count)
+
+        try:
+            got_message = False
             while True:
-                pass
+                started = time.perf_counter() if self.metrics is not None else 0
+                data, found = conn.frames.next_message(conn.codec)
+                if not found:
+                    break
+                if self.metrics is not None:
+                    self.metrics.observe("pong_decode_seconds", time.perf_counter() - started)
+                if self.handle_message(conn, data):
+                    got_message = True
+
+            # Same reply rule as the threaded server: one state per batch of messages received.
+            # In authoritative mode the tick loop pushes state instead
+            if got_message and conn.room.simulation is None:
+                self.state_changed(conn.room, conn.room.game_state)
+                self.queue_state(conn, conn.room.game_state)
+        except Exception as e:
+            # Whatever this client sent, it only ends this client's connection, not every match
+            print(f"Error with client {conn.addr}: {e!r}")
+            self.close_client(conn)
+
+    # Author:   Shelby Scoville
+    # Purpose:  Hands a match's new state to its replay recorder and spectators, if it has them
+    # Pre:      state is the room's full game state
+    # Post:     state is recorded and published (both keep their own copy)
+    def state_changed(self, room: Room, state: dict) -> None:
+        if room.recorder is not None:
+            room.recorder.record(state)
+        if self.spectators is not None:
+            self.spectators.publish(room.room_id, state)
+
+    # Author:   Shelby Scoville
+    # Purpose:  Applies one decoded message from a client, whichever transport it came over
+    # Pre:      conn is open, data is whatever the codec decoded
+    # Post:     Returns True when it was a game update (paddle input or host update). Anything that
+    #           is not an object (a corrupt message, or JSON like 5 or [1]) is ignored
+    def handle_message(self, conn: Connection, data: dict) -> bool:
+        if not isinstance(data, dict):
+            return False
+        # Handshake and snapshot acks are not game updates
+        if handle_control(conn, data, lambda message, kind: self.queue_data(conn, message, kind)):
+            return False
+        self.messages_in += 1
+        room = conn.room
+        if room.simulation is not None:
+            # Authoritative clients only send which way their paddle is moving
+            seq = wire_int(data.get("seq", 0), "p1_seq")
+            if seq is None:
+                return False
+            room.simulation.setInput(conn.player_id, data.get("moving", ""), seq)
+            return True
+        return merge_update(room.game_state, conn.player_id, data)
+
+    # Author:   Shelby Scoville
+    # Purpose:  Reads every waiting datagram and hands its messages to the matching client
+    # Pre:      UDP socket is readable
+    # Post:     Hellos attach UDP channels to connections, other messages are applied
+    def read_datagrams(self) -> None:
+        while True:
+            try:
+                datagram, addr = self.udp.recvfrom(MAX_DATAGRAM)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                continue
+            conn = self.udp_peers.get(addr)
+            if conn is None:
+                conn = self.attach_udp(addr, datagram)
+                if conn is None:
+                    continue
+
+            try:
+                got_message = False
+                for payload in conn.udp.receive(datagram):
+                    data, _ = BINARY_CODEC.decode(payload)
+                    if not isinstance(data, dict) or "hello" in data:
+                        continue
+                    if self.handle_message(conn, data):
+                        got_message = True
+                if got_message and conn.room.simulation is None:
+                    self.state_changed(conn.room, conn.room.game_state)
+                    self.queue_state(conn, conn.room.game_state)
+            except Exception as e:
+                print(f"Error with client {conn.addr}: {e!r}")
+                self.close_client(conn)
+
+    # Author:   Shelby Scoville
+    # Purpose:  Ties a new UDP address to a TCP connection when it sends a valid hello
+    # Pre:      addr is not known yet
+    # Post:     Returns the connection, or None if the datagram was not a valid hello
+    def attach_udp(self, addr, datagram: bytes) -> Connection:
+        if len(datagram) < DATAGRAM_HEADER.size or datagram[0] != CHANNEL_RELIABLE:
+            return None
+        data, _ = BINARY_CODEC.decode(datagram, DATAGRAM_HEADER.size)
+        if data is None or "hello" not in data:
+            return None
+        conn = self.udp_tokens.pop(data["hello"], None)
+        if conn is None or conn.closed:
+            return None
+        conn.udp = UdpChannel(self.udp_sendto, addr, conn.clock.retransmit_timeout())
+        self.udp_peers[addr] = conn
+        return conn
+
+    # Author:   Shelby Scoville
+    # Purpose:  Closes a client and tears down its room
+    # Pre:      None
+    # Post:     The client and its opponent (if any) are closed and the room is removed
+    def close_client(self, conn: Connection) -> None:
+        if conn.closed:
+            return
+        conn.closed = True
+        self.connected -= 1
+        self.backlogged.discard(conn)
+        self.frames_dropped += conn.outbound.dropped
+        try:
+            self.selector.unregister(conn.sock)
+        except (KeyError, ValueError):
+            pass
+        conn.sock.close()
+        self.udp_tokens.pop(conn.udp_token, None)
+        if conn.udp is not None:
+            self.udp_peers.pop(conn.udp.addr, None)
+
+        room = conn.room
+        if room is None:
+            return
+        if self.waiting_room is room:
+            self.waiting_room = None
+        if self.rooms.pop(room.room_id, None) is not None:
+            if room.is_full():
+                self.matches -= 1
+            print(f"Room {room.room_id}: player {conn.player_id} disconnected, closing match")
+            if room.recorder is not None:
+                room.recorder.close()
+                print(f"Room {room.room_id}: replay saved to {room.recorder.path}")
+            if self.spectators is not None:
+                self.spectators.end_match(room.room_id)
+            if self.stats is not None and room.is_full():
+                self.record_result(room)
+        for other in room.players:
+            if other is not None and other is not conn:
+                self.close_client(other)
+
+    # Author:   Shelby Scoville
+    # Purpose:  Hands a match that just ended to the stats writer
+    # Pre:      room had two players and stats are on
+    # Post:     The result is queued, the disk write happens on the writer's thread
+    def record_result(self, room: Room) -> None:
+        if room.simulation is not None:
+            score1, score2 = room.simulation.lScore, room.simulation.rScore
+        else:
+            score1, score2 = room.game_state["score1"], room.game_state["score2"]
+        self.stats.record(room.room_id, room.started_at, time.time(), player_name(room.players[0]),
+                          player_name(room.players[1]), score1, score2)
+
+    # Author:   Shelby Scoville
+    # Purpose:  Steps every full match one tick and pushes the new state to both players
+    # Pre:      Server is in authoritative mode
+    # Post:     Each room's game_state holds the latest simulated state
+    def tick(self) -> None:
+        started = time.perf_counter()
+        for room in list(self.rooms.values()):
+            # A match only starts once both players are in
+            if not room.is_full():
+                continue
+            room.simulation.step()
+            # Replays get every tick, clients every send_every'th
+            sending = room.simulation.tick % self.send_every == 0
+            if not sending and room.recorder is None:
+                continue
+            state = room.simulation.getState()
+            if room.recorder is not None:
+                room.recorder.record(state)
+            if not sending:
+                continue
+            room.game_state = state
+            if self.spectators is not None:
+                self.spectators.publish(room.room_id, state)
+            for conn in room.players:
+                self.queue_state(conn, room.game_state)
+        elapsed = time.perf_counter() - started
+        self.tick_stats.record(elapsed)
+        if self.metrics is not None:
+            self.metrics.observe("pong_tick_seconds", elapsed)
+
+    # Author:   Shelby Scoville
+    # Purpose:  Runs one pass of the event loop
+    # Pre:      Server is open
+    # Post:     Every ready socket has been serviced and any due ticks have run
+    def serve_once(self, timeout: float =None) -> None:
+        if self.tick_rate:
+            now = time.perf_counter()
+            if self.next_tick is None:
+                self.next_tick = now
+            timeout = max(0.0, min(timeout if timeout is not None else 1.0, self.next_tick - now))
+
+        for key, mask in self.selector.select(timeout):
+            conn = key.data
+            if conn is None:
+                if key.fileobj is self.udp:
+                    self.read_datagrams()
+                else:
+                    self.accept_clients()
+                continue
+            if mask & selectors.EVENT_READ:
+                self.read_client(conn)
+            if mask & selectors.EVENT_WRITE and not conn.closed:
+                self.flush_client(conn)
+
+        # Evict clients whose socket has stayed backed up for too long
+        now = time.monotonic()
+        if self.backlogged and now >= self.next_stall_check:
+            for conn in list(self.backlogged):
+                if conn.outbound.stalled(now):
+                    self.evict(conn, f"socket backed up for over {conn.outbound.stall_timeout:g}s")
+            self.next_stall_check = now + 0.5
+
+        if now >= self.next_ping_check:
+            self.ping_clients()
+            self.next_ping_check = now + 0.25
+
+        if self.udp is not None:
+            # Resend reliable datagrams whose ack is overdue
+            if now >= self.next_resend_check:
+                for conn in list(self.udp_peers.values()):
+                    conn.udp.poll(now)
+                self.next_resend_check = now + 0.02
+
+        if self.tick_rate:
+            interval = 1.0 / self.tick_rate
+            now = time.perf_counter()
+            if now >= self.next_tick:
+                self.tick()
+                self.next_tick += interval
+                # If we fell far behind, skip ahead instead of running a burst of catch-up ticks
+                if now - self.next_tick > 5 * interval:
+                    self.next_tick = now + interval
+
+    # Author:   Shelby Scoville
+    # Purpose:  Main loop for the event loop server
+    # Pre:      Server socket is listening
+    # Post:     Serves matches until stop() is called or Ctrl+C
+    def run(self) -> None:
+        print(f"Server started on {self.host}:{self.port}", flush=True)
+        print("Event loop mode: pairing players into matches as they connect", flush=True)
+        if self.tick_rate:
+            print(f"Authoritative simulation at {self.tick_rate:g} ticks per second", flush=True)
+        self.running = True
+        last_report = time.perf_counter()
+        try:
+            while self.running:
+                self.serve_once(0.5)
+                # Report how close the tick loop is to its budget so hosts can be sized, and how
+                # well clients keep up with what we send them
+                if time.perf_counter() - last_report >= 10:
+                    if self.tick_stats:
+                        print(f"Tick stats ({self.active_matches()} matches): {self.tick_stats.summary()}", flush=True)
+                        self.tick_stats.reset()
+                    print(f"Send queues: {self.queue_report()}", flush=True)
+                    clocks = [key.data.clock for key in self.selector.get_map().values() if isinstance(key.data, Connection)]
+                    print(f"Round trips: {rtt_summary(clocks)}", flush=True)
+                    if self.spectators is not None:
+                        print(f"Spectators: {self.spectators.summary()}", flush=True)
+                    if self.stats is not None:
+                        print(f"Stats: {self.stats.summary()}", flush=True)
+                    last_report = time.perf_counter()
         except KeyboardInterrupt:
             print("\nServer shutting down...")
+        finally:
+            self.close()
+
+    def stop(self) -> None:
+        self.running = False
+
+    # Author:   Shelby Scoville
+    # Purpose:  Closes every client and the listening socket
+    # Pre:      None
+    # Post:     All sockets are closed
+    def close(self) -> None:
+        for key in list(self.selector.get_map().values()):
+            if isinstance(key.data, Connection):
+                self.close_client(key.data)
+        self.selector.close()
+        if self.server is not None:
             self.server.close()
+        if self.udp is not None:
+            self.udp.close()
+        # Rooms closed above handed over their last chunk, wait for it to reach the disk
+        self.replay_writer.close()
+        if self.stats is not None:
+            self.stats.close()
+
+class ShardWorker(EventServer):
+    # Author:   Shelby Scoville
+    # Purpose:  One worker process of a sharded server: an event loop server fed by the parent
+    # Pre:      channel is this worker's end of its pongShard socket pair, index counts from 0 up to
+    #           workers. options are EventServer keyword arguments (besides host and port)
+    # Post:     Ready to run(), with no listening socket of its own
+    def __init__(self, channel: socket.socket, index: int, workers: int, **options) -> None:
+        super().__init__(port=None, **options)
+        self.channel = channel
+        self.channel.setblocking(False)
+        self.selector.register(channel, selectors.EVENT_READ, None)
+        self.next_room_id = index + 1
+        self.room_id_step = workers
+        # Connections the parent has passed over, so it can tell when its view of the lobby is current
+        self.received = 0
+
+    # Author:   Shelby Scoville
+    # Purpose:  Seats the connections the parent passed over, in the order it accepted them
+    # Pre:      The channel is readable
+    # Post:     Clients are added to the lobby; the worker stops once the parent closes the channel
+    def accept_clients(self) -> None:
+        socks, still_open = receive_connections(self.channel)
+        for sock in socks:
+            self.received += 1
+            if sock is None:
+                continue
+            try:
+                addr = sock.getpeername()
+            except OSError:
+                # Gone before it got here
+                sock.close()
+                continue
+            self.add_client(sock, addr)
+        if not still_open:
+            self.running = False
+
+    def close_client(self, conn: Connection) -> None:
+        waiting = self.waiting_room
+        super().close_client(conn)
+        # A player waiting for an opponent left, tell the parent before it pairs someone with nobody
+        if waiting is not None and self.waiting_room is None and self.running:
+            self.report()
+
+    # Author:   Shelby Scoville
+    # Purpose:  Sends this worker's counters to the parent
+    # Pre:      None
+    # Post:     A report line is sent and the tick stats start over
+    def report(self) -> None:
+        report = {"received": self.received, "waiting": self.waiting_room is not None,
+                  "connected": self.connected, "matches": self.matches,
+                  "connections_total": self.connections_total, "messages_in": self.messages_in,
+                  "messages_out": self.messages_out, "evictions": self.evictions, "cpu": time.process_time()}
+        if self.tick_stats:
+            report.update(ticks=self.tick_stats.ticks, tick_busy=self.tick_stats.busy,
+                          tick_worst=self.tick_stats.worst, overruns=self.tick_stats.overruns)
+            self.tick_stats.reset()
+        send_report(self.channel, report)
+
+    # Author:   Shelby Scoville
+    # Purpose:  Main loop of a worker
+    # Pre:      Started by pongShard.ShardedServer
+    # Post:     Serves until the parent closes the channel, reporting every second
+    def run(self) -> None:
+        self.running = True
+        next_report = 0.0
+        try:
+            while self.running:
+                self.serve_once(0.25)
+                now = time.monotonic()
+                if now >= next_report:
+                    self.report()
+                    next_report = now + 1.0
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        super().close()
+        self.channel.close()
+
+# Author:   Shelby Scoville
+# Purpose:  Raises the open file limit so one process can hold thousands of sockets
+# Pre:      None
+# Post:     Soft limit is raised to the hard limit where the platform allows it
+def raise_file_limit() -> None:
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if hard == resource.RLIM_INFINITY or hard > soft:
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (hard if hard != resource.RLIM_INFINITY else 65536, hard))
+        except (ValueError, OSError):
+            pass
 
 if __name__ == "__main__":
-    Server().run()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Pong server")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=55555)
+    parser.add_argument("--mode", choices=["threaded", "event"], default="threaded",
+                        help="threaded: one two-player game (original). event: many matches on one event loop")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="event mode only: worker processes sharing the port (0 = one per CPU core)")
+    parser.add_argument("--authoritative", action="store_true",
+                        help="event mode only: the server runs the ball physics and clients send only paddle input")
+    parser.add_argument("--tick-rate", type=float, default=60.0, help="simulation ticks per second in authoritative mode")
+    parser.add_argument("--send-rate", type=float, default=None,
+                        help="state updates per second (default: every tick in authoritative mode, 60 in threaded mode)")
+    parser.add_argument("--max-queue", type=int, default=64,
+                        help="messages that may wait for one client before it is evicted")
+    parser.add_argument("--stall-timeout", type=float, default=5.0,
+                        help="seconds a client's socket may stay backed up before it is evicted")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="serve Prometheus metrics at http://METRICS_HOST:PORT/metrics (off by default)")
+    parser.add_argument("--metrics-host", default="127.0.0.1")
+    parser.add_argument("--spectator-port", type=int, default=None,
+                        help="accept read-only spectators on this port (off by default)")
+    parser.add_argument("--max-spectators", type=int, default=1000, help="spectators allowed per match")
+    parser.add_argument("--record", metavar="DIR", default=None,
+                        help="save a replay of every match in this folder (play them with pongReplay.py)")
+    parser.add_argument("--stats", metavar="FILE", default=None,
+                        help="save match results and player stats to this SQLite file (see pongStats.py)")
+    parser.add_argument("--udp", action="store_true", help="event mode only: offer the UDP state stream")
+    parser.add_argument("--udp-port", type=int, default=0, help="UDP port (default: same number as --port)")
+    parser.add_argument("--udp-loss", type=float, default=0.0, help="testing: fraction of outgoing datagrams to drop")
+    parser.add_argument("--udp-delay", type=float, default=0.0, help="testing: seconds to delay outgoing datagrams")
+    parser.add_argument("--udp-jitter", type=float, default=0.0, help="testing: +/- seconds of random extra delay")
+    args = parser.parse_args()
+    workers = args.workers or os.cpu_count() or 1
+    if workers > 1:
+        if args.mode != "event":
+            parser.error("--workers needs --mode event (the threaded server hosts a single match)")
+        if args.spectator_port is not None:
+            parser.error("--spectator-port does not work with --workers yet")
+        if not hasattr(socket, "send_fds"):
+            parser.error("--workers needs a Unix system (connections are passed between processes)")
+
+    metrics = None
+    if args.metrics_port is not None:
+        metrics = Metrics()
+        metrics_port = metrics.serve(args.metrics_host, args.metrics_port)
+        print(f"Metrics at http://{args.metrics_host}:{metrics_port}/metrics", flush=True)
+    if args.record is not None:
+        os.makedirs(args.record, exist_ok=True)
+    spectators = None
+    if args.spectator_port is not None:
+        spectator_rate = args.send_rate or (args.tick_rate if args.authoritative else 60.0)
+        spectators = SpectatorHub(args.host, args.spectator_port, spectator_rate, args.max_spectators, args.stall_timeout)
+        spectators.start()
+        print(f"Spectators can watch on port {spectators.port}", flush=True)
+
+    if args.mode == "event":
+        raise_file_limit()
+        udp_shim = None
+        if args.udp_loss or args.udp_delay or args.udp_jitter:
+            udp_shim = lambda sendto: LossyShim(sendto, args.udp_loss, args.udp_delay, args.udp_jitter)
+    if workers > 1:
+        # Each worker needs its own UDP port: worker i uses the base port + i
+        udp_base = args.udp_port or args.port
+
+        def run_worker(index: int, channel: socket.socket) -> None:
+            udp_port = (udp_base + index if udp_base else 0) if args.udp else None
+            ShardWorker(channel, index, workers, host=args.host, tick_rate=args.tick_rate if args.authoritative else None,
+                        udp_port=udp_port, udp_shim=udp_shim, send_rate=args.send_rate, max_queue=args.max_queue,
+                        stall_timeout=args.stall_timeout, record_dir=args.record, stats_path=args.stats).run()
+
+        ShardedServer(args.host, args.port, workers, run_worker, metrics=metrics).run()
+    elif args.mode == "event":
+        EventServer(args.host, args.port, tick_rate=args.tick_rate if args.authoritative else None,
+                    udp_port=args.udp_port if args.udp else None, udp_shim=udp_shim, send_rate=args.send_rate,
+                    max_queue=args.max_queue, stall_timeout=args.stall_timeout, metrics=metrics, record_dir=args.record, spectators=spectators,
+                    stats_path=args.stats).run()
+    else:
+        Server(args.host, args.port, args.send_rate or 60.0, args.max_queue, args.stall_timeout, metrics, args.record,
+               spectators, args.stats).run()
\ No newline at end of file
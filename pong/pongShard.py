@@ -0,0 +1,415 @@
+# =================================================================================================
+# Contributing Authors:	    Shelby Scoville
+# Email Addresses:          snsc235@uky.edu
+# Date:                     10/18/2026
+# Purpose:                  Spreads matches over worker processes that share one listening port
+# =================================================================================================
+#
+# One process is held to one core by the GIL, so a ShardedServer runs several workers. The parent
+# owns the listening socket, accepts every connection and passes it straight on to a worker over a
+# Unix socket pair (socket.send_fds), then forgets it. If a busy worker's channel is full, the
+# connection waits in a queue for that worker and is passed on as soon as the channel drains.
+# SO_REUSEPORT is not used: the kernel spreads connections over the listeners by address hash,
+# which would put the two players of a match in different processes. Instead the parent pairs
+# connections the way the event loop lobby does (1st and 2nd play each other, 3rd and 4th, ...) and
+# sends both players of a pair to the same worker, choosing the least loaded worker for each new pair.
+#
+# Workers send a JSON line with their counters back over the same socket pair every second (and
+# straight away when a waiting player leaves, so the next connection is not paired with nobody).
+# The parent restarts workers that die, adds the counters up for its report every 10 seconds and
+# for /metrics, and keeps what a dead worker had counted so totals never go backwards. Unix only.
+
+import json
+import multiprocessing
+import selectors
+import signal
+import socket
+import time
+
+# Worker counters that keep growing, summed over dead workers too
+COUNTERS = ("connections_total", "messages_in", "messages_out", "evictions")
+
+# Author:   Shelby Scoville
+# Purpose:  Passes a connected socket to a worker
+# Pre:      channel is the parent's end of a worker's socket pair
+# Post:     Returns False if the channel is full (try again once it drains); raises OSError if the
+#           worker is gone. The caller closes its own copy once it has been passed on
+def hand_off(channel: socket.socket, sock: socket.socket) -> bool:
+    try:
+        # One byte per connection, so the worker reads exactly one descriptor per receive
+        socket.send_fds(channel, [b"c"], [sock.fileno()])
+    except (BlockingIOError, InterruptedError):
+        return False
+    return True
+
+# Author:   Shelby Scoville
+# Purpose:  Takes every connection the parent has passed over so far
+# Pre:      channel is the worker's non-blocking end of its socket pair
+# Post:     Returns (sockets, still open). A None stands for a connection whose descriptor did not
+#           arrive (out of file descriptors), so every connection the parent sent is counted
+def receive_connections(channel: socket.socket) -> tuple:
+    socks = []
+    while True:
+        try:
+            data, fds, _, _ = socket.recv_fds(channel, 1, 1)
+        except (BlockingIOError, InterruptedError):
+            return socks, True
+        except OSError:
+            return socks, False
+        if not data:
+            return socks, False
+        socks.append(socket.socket(fileno=fds[0]) if fds else None)
+
+# Author:   Shelby Scoville
+# Purpose:  Sends a worker's counters to the parent
+# Pre:      report is JSON serializable
+# Post:     One JSON line is written, or nothing if the parent is gone
+def send_report(channel: socket.socket, report: dict) -> None:
+    try:
+        # A few hundred bytes a second into a socket the parent keeps reading never blocks
+        channel.sendall((json.dumps(report) + "\n").encode("utf-8"))
+    except OSError:
+        pass
+
+class WorkerSlot:
+    # Author:   Shelby Scoville
+    # Purpose:  The parent's view of one worker, kept across restarts
+    # Pre:      index counts from 0
+    # Post:     No process yet
+    def __init__(self, index: int) -> None:
+        self.index = index
+        self.process = None
+        self.channel = None
+        self.buffer = b""
+        self.started = 0.0
+        self.restart_at = None
+        # Connections handed over, and whether the last one is still waiting for an opponent
+        self.sent = 0
+        self.waiting = False
+        # Connections meant for this worker that its full channel has not taken yet, oldest first
+        self.queued = []
+        # The worker's latest report
+        self.report = {}
+        # Tick totals and the CPU reading since the parent's last summary
+        self.ticks = 0
+        self.tick_busy = 0.0
+        self.tick_worst = 0.0
+        self.overruns = 0
+        self.cpu_mark = 0.0
+
+    def alive(self) -> bool:
+        return self.channel is not None
+
+    # Author:   Shelby Scoville
+    # Purpose:  How busy the worker is, for choosing where the next match goes
+    # Pre:      None
+    # Post:     Returns its connections, counting ones handed over (or queued) that it has not reported yet
+    def load(self) -> int:
+        return self.report.get("connected", 0) + self.sent - self.report.get("received", 0) + len(self.queued)
+
+    # Author:   Shelby Scoville
+    # Purpose:  Takes in one report from the worker
+    # Pre:      report is a decoded report line
+    # Post:     Latest report and tick totals are updated. Whether a player is waiting is only taken
+    #           from the report when no connection is still on its way to (or queued for) the worker
+    def add_report(self, report: dict) -> None:
+        self.report = report
+        self.ticks += report.get("ticks", 0)
+        self.tick_busy += report.get("tick_busy", 0.0)
+        self.tick_worst = max(self.tick_worst, report.get("tick_worst", 0.0))
+        self.overruns += report.get("overruns", 0)
+        if report.get("received") == self.sent and not self.queued:
+            self.waiting = report.get("waiting", False)
+
+class ShardedServer:
+    # Author:   Shelby Scoville
+    # Purpose:  Parent process of a sharded server: accepts, pairs and supervises
+    # Pre:      Port is available. worker_main(index, channel) runs one worker until its channel
+    #           closes (in a forked child). metrics (optional) is given the summed worker counters
+    # Post:     Listening, workers are started by run()
+    def __init__(self, host: str, port: int, workers: int, worker_main, backlog: int =1024, metrics=None) -> None:
+        self.host = host
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server.bind((host, port))
+        self.server.listen(backlog)
+        self.server.setblocking(False)
+        self.port = self.server.getsockname()[1]
+
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.server, selectors.EVENT_READ, None)
+        self.worker_main = worker_main
+        self.slots = [WorkerSlot(index) for index in range(workers)]
+        # Workers are forked so they start instantly and inherit what the parent set up
+        self.context = multiprocessing.get_context("fork")
+        self.running = False
+
+        self.restarts = 0
+        self.handoff_failures = 0
+        # What workers that have since died had counted
+        self.retired = dict.fromkeys(COUNTERS, 0)
+
+        if metrics is not None:
+            metrics.add_collector(self.collect)
+
+    # Author:   Shelby Scoville
+    # Purpose:  Starts (or restarts) the worker for a slot
+    # Pre:      The slot has no live worker
+    # Post:     The worker runs and its channel and exit are watched
+    def start_worker(self, slot: WorkerSlot) -> None:
+        parent_end, child_end = socket.socketpair()
+        slot.process = self.context.Process(target=self.worker_process, args=(slot.index, child_end), daemon=True)
+        slot.process.start()
+        child_end.close()
+        parent_end.setblocking(False)
+        slot.channel = parent_end
+        slot.buffer = b""
+        slot.started = time.monotonic()
+        slot.sent = 0
+        slot.waiting = False
+        slot.report = {}
+        slot.cpu_mark = 0.0
+        self.selector.register(parent_end, selectors.EVENT_READ, slot)
+        self.selector.register(slot.process.sentinel, selectors.EVENT_READ, slot)
+
+    # Author:   Shelby Scoville
+    # Purpose:  Body of a worker process
+    # Pre:      Runs in the forked child
+    # Post:     Drops the parent's sockets and runs worker_main until the parent closes the channel
+    def worker_process(self, index: int, channel: socket.socket) -> None:
+        # Ctrl+C reaches the whole process group; the parent shuts workers down by closing channels
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        self.server.close()
+        for slot in self.slots:
+            if slot.channel is not None:
+                slot.channel.close()
+        self.worker_main(index, channel)
+
+    # Author:   Shelby Scoville
+    # Purpose:  Picks the worker for the next connection
+    # Pre:      None
+    # Post:     Returns a worker with a player waiting for an opponent, otherwise the least loaded
+    #           one, or None when no worker is up
+    def pick_worker(self) -> WorkerSlot:
+        live = [slot for slot in self.slots if slot.alive()]
+        for slot in live:
+            if slot.waiting:
+                return slot
+        return min(live, key=WorkerSlot.load) if live else None
+
+    # Author:   Shelby Scoville
+    # Purpose:  Accepts every pending connection and passes it to a worker
+    # Pre:      Listening socket is readable
+    # Post:     Connections are in the workers' hands, queued for a worker whose channel is full,
+    #           or closed if no worker is up
+    def accept_clients(self) -> None:
+        while True:
+            try:
+                sock, _ = self.server.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            slot = self.pick_worker()
+            if slot is None:
+                self.handoff_failures += 1
+                sock.close()
+                continue
+            # The worker is chosen now so the pair stays together even if it has to wait
+            slot.waiting = not slot.waiting
+            slot.queued.append(sock)
+            self.send_queued(slot)
+
+    # Author:   Shelby Scoville
+    # Purpose:  Passes a worker the connections queued for it, in the order they came
+    # Pre:      The slot has a live worker
+    # Post:     Sent connections are closed on this side. Whatever the channel could not take stays
+    #           queued, and the channel is watched for room until the queue is empty
+    def send_queued(self, slot: WorkerSlot) -> None:
+        while slot.queued:
+            try:
+                if not hand_off(slot.channel, slot.queued[0]):
+                    break
+            except OSError:
+                # The worker is gone; worker_exited drops what is still queued
+                break
+            slot.queued.pop(0).close()
+            slot.sent += 1
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if slot.queued else 0)
+        if self.selector.get_key(slot.channel).events != events:
+            self.selector.modify(slot.channel, events, slot)
+
+    # Author:   Shelby Scoville
+    # Purpose:  Reads a worker's report lines
+    # Pre:      The worker's channel is readable
+    # Post:     Reports are taken in; a closed channel means the worker is gone
+    def read_reports(self, slot: WorkerSlot) -> None:
+        try:
+            chunk = slot.channel.recv(65536)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            chunk = b""
+        if not chunk:
+            self.worker_exited(slot)
+            return
+        slot.buffer += chunk
+        while b"\n" in slot.buffer:
+            line, slot.buffer = slot.buffer.split(b"\n", 1)
+            try:
+                slot.add_report(json.loads(line))
+            except ValueError:
+                continue
+
+    # Author:   Shelby Scoville
+    # Purpose:  Cleans up after a worker that exited and schedules its restart
+    # Pre:      None
+    # Post:     Its counters are kept in retired; it restarts at once, or after a second if it
+    #           had not run for long (so a worker that keeps crashing does not spin)
+    def worker_exited(self, slot: WorkerSlot) -> None:
+        if not slot.alive():
+            return
+        self.selector.unregister(slot.channel)
+        self.selector.unregister(slot.process.sentinel)
+        slot.channel.close()
+        slot.channel = None
+        # Their opponents (if any) were in the worker's matches, which have ended too
+        self.handoff_failures += len(slot.queued)
+        for sock in slot.queued:
+            sock.close()
+        slot.queued = []
+        slot.process.join(1.0)
+        for name in COUNTERS:
+            self.retired[name] += slot.report.get(name, 0)
+        slot.report = {}
+        if self.running:
+            ran = time.monotonic() - slot.started
+            print(f"Worker {slot.index} exited (code {slot.process.exitcode}) after {ran:.0f}s, restarting", flush=True)
+            slot.restart_at = time.monotonic() + (1.0 if ran < 5 else 0.0)
+
+    # Author:   Shelby Scoville
+    # Purpose:  Counters summed over every worker, live and dead
+    # Pre:      None
+    # Post:     Returns a dict with COUNTERS plus "connected" and "matches"
+    def totals(self) -> dict:
+        totals = dict(self.retired, connected=0, matches=0)
+        for slot in self.slots:
+            report = slot.report
+            for name in totals:
+                totals[name] += report.get(name, 0)
+        return totals
+
+    def collect(self) -> dict:
+        totals = self.totals()
+        return {"pong_messages_in_total": totals["messages_in"],
+                "pong_messages_out_total": totals["messages_out"],
+                "pong_connections": totals["connected"],
+                "pong_matches": totals["matches"],
+                "pong_workers": sum(1 for slot in self.slots if slot.alive()),
+                "pong_worker_restarts_total": self.restarts}
+
+    # Author:   Shelby Scoville
+    # Purpose:  One line about all the workers for the periodic report
+    # Pre:      elapsed is the time since the last summary
+    # Post:     Returns the summary; per-worker tick totals start over
+    def summary(self, elapsed: float) -> str:
+        totals = self.totals()
+        live = sum(1 for slot in self.slots if slot.alive())
+        matches = "/".join(str(slot.report.get("matches", 0)) for slot in self.slots)
+        parts = [f"{live}/{len(self.slots)} up, {self.restarts} restarts",
+                 f"{totals['connected']} connections, {totals['matches']} matches ({matches})",
+                 f"{totals['messages_in']} messages in, {totals['messages_out']} out"]
+        ticks = sum(slot.ticks for slot in self.slots)
+        if ticks:
+            busy = sum(slot.tick_busy for slot in self.slots)
+            worst = max(slot.tick_worst for slot in self.slots)
+            overruns = sum(slot.overruns for slot in self.slots)
+            parts.append(f"tick avg {busy / ticks * 1000:.3f}ms worst {worst * 1000:.3f}ms overruns {overruns}")
+        cpu = []
+        for slot in self.slots:
+            used = slot.report.get("cpu", slot.cpu_mark)
+            cpu.append(f"{(used - slot.cpu_mark) / elapsed * 100:.0f}%")
+            slot.cpu_mark = used
+            slot.ticks, slot.tick_busy, slot.tick_worst, slot.overruns = 0, 0.0, 0.0, 0
+        parts.append(f"cpu {' '.join(cpu)}")
+        queued = sum(len(slot.queued) for slot in self.slots)
+        if queued:
+            parts.append(f"{queued} connections waiting for a worker")
+        if self.handoff_failures:
+            parts.append(f"{self.handoff_failures} connections refused")
+        return ", ".join(parts)
+
+    # Author:   Shelby Scoville
+    # Purpose:  Runs one pass of the parent's loop
+    # Pre:      Workers were started
+    # Post:     New connections are handed off, reports read and dead workers restarted when due
+    def serve_once(self, timeout: float =None) -> None:
+        now = time.monotonic()
+        for slot in self.slots:
+            if slot.restart_at is not None:
+                if now >= slot.restart_at:
+                    slot.restart_at = None
+                    self.restarts += 1
+                    self.start_worker(slot)
+                else:
+                    timeout = min(timeout if timeout is not None else 1.0, slot.restart_at - now)
+        for key, events in self.selector.select(timeout):
+            slot = key.data
+            if slot is None:
+                self.accept_clients()
+            elif key.fileobj is slot.channel:
+                if events & selectors.EVENT_WRITE:
+                    self.send_queued(slot)
+                if events & selectors.EVENT_READ and slot.alive():
+                    self.read_reports(slot)
+            else:
+                self.worker_exited(slot)
+
+    # Author:   Shelby Scoville
+    # Purpose:  Main loop for the sharded server
+    # Pre:      Server socket is listening
+    # Post:     Serves until stop(), Ctrl+C or SIGTERM, then shuts the workers down
+    def run(self) -> None:
+        print(f"Server started on {self.host}:{self.port}", flush=True)
+        print(f"Sharded mode: {len(self.slots)} worker processes, both players of a match on the same one", flush=True)
+        for slot in self.slots:
+            self.start_worker(slot)
+        self.running = True
+        signal.signal(signal.SIGTERM, lambda signum, frame: self.stop())
+        last_report = time.perf_counter()
+        try:
+            while self.running:
+                self.serve_once(0.5)
+                elapsed = time.perf_counter() - last_report
+                if elapsed >= 10:
+                    print(f"Workers: {self.summary(elapsed)}", flush=True)
+                    last_report = time.perf_counter()
+        except KeyboardInterrupt:
+            print("\nServer shutting down...")
+        finally:
+            self.close()
+
+    def stop(self) -> None:
+        self.running = False
+
+    # Author:   Shelby Scoville
+    # Purpose:  Stops accepting and shuts every worker down
+    # Pre:      None
+    # Post:     Workers have closed their matches and exited (or were terminated after 5 seconds)
+    def close(self) -> None:
+        self.running = False
+        self.selector.close()
+        self.server.close()
+        # A closed channel tells a worker to close its matches and exit
+        for slot in self.slots:
+            for sock in slot.queued:
+                sock.close()
+            slot.queued = []
+            if slot.channel is not None:
+                slot.channel.close()
+                slot.channel = None
+        for slot in self.slots:
+            if slot.process is not None:
+                slot.process.join(5.0)
+                if slot.process.is_alive():
+                    slot.process.terminate()
+                    slot.process.join()
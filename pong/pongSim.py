@@ -0,0 +1,272 @@
+# =================================================================================================
+# Contributing Authors:	    Shelby Scoville
+# Email Addresses:          snsc235@uky.edu
+# Date:                     10/18/2026
+# Purpose:                  Server-side Pong simulation that runs at a fixed tick rate
+# =================================================================================================
+
+import math
+import os
+import time
+
+# pygame prints a banner on import, which would end up in the server log
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import pygame
+
+from assets.code.helperCode import Paddle, Ball
+
+# A player wins once their score goes past this
+WIN_SCORE = 10
+
+# Most bounces worked out within one tick; a ball fast enough to need more waits out the rest of the tick
+MAX_BOUNCES = 64
+
+# A touch this little (in ticks) after the end of a sweep counts as at the end, so rounding can't
+# decide whether a ball resting against a wall bounces this tick or the next
+TOUCH_SLACK = 1e-9
+
+# Where the ball touched a paddle is a whole pixel or a fraction of one over the ball's x speed, so
+# this much float error (in pixels) is rounded away before picking the pixel row it hit on
+PIXEL_SLACK = 1e-6
+
+# Author:   Shelby Scoville
+# Purpose:  Moves a paddle one tick in its current direction, keeping it between the walls
+# Pre:      paddle.moving is "up", "down" or ""
+# Post:     paddle.rect is updated
+def movePaddle(paddle: Paddle, screenHeight: int) -> None:
+    if paddle.moving == "down":
+        if paddle.rect.bottomleft[1] < screenHeight-10:
+            paddle.rect.y += paddle.speed
+    elif paddle.moving == "up":
+        if paddle.rect.topleft[1] > 10:
+            paddle.rect.y -= paddle.speed
+
+# Author:   Shelby Scoville
+# Purpose:  When a moving square first touches a rectangle
+# Pre:      The square's top-left corner is at (x, y), it has sides of size and moves (dx, dy) per
+#           tick. rect is (left, top, width, height) or a pygame.Rect
+# Post:     Returns the time in ticks from now, 0 if it already overlaps and is heading further in,
+#           or None if it never touches
+def timeOfImpact(x: float, y: float, dx: float, dy: float, size: int, rect: tuple) -> float:
+    left, top, width, height = rect
+    # The corner touches the rectangle grown by the square's size; overlapping is strictly inside it
+    enter = -math.inf
+    leave = math.inf
+    for pos, vel, low, high in ((x, dx, left - size, left + width), (y, dy, top - size, top + height)):
+        if vel == 0:
+            if not low < pos < high:
+                return None
+            continue
+        near = (low - pos) / vel
+        far = (high - pos) / vel
+        if near > far:
+            near, far = far, near
+        enter = max(enter, near)
+        leave = min(leave, far)
+    if enter >= leave or leave <= 0:
+        return None
+    if enter < 0:
+        # Already overlapping (a paddle moved into it, or a hair of rounding after a bounce): it
+        # is touching the side it is least far into, and bounces only if going further in there
+        depthX = min(x - (left - size), left + width - x)
+        depthY = min(y - (top - size), top + height - y)
+        if depthX <= depthY:
+            heading = dx * (left + width / 2 - x - size / 2)
+        else:
+            heading = dy * (top + height / 2 - y - size / 2)
+        return 0.0 if heading > 0 else None
+    return enter
+
+# Author:   Shelby Scoville
+# Purpose:  Moves the ball for some time, bouncing off paddles and walls at the moment it touches them
+# Pre:      (x, y) is the ball's top-left corner, (dx, dy) its velocity per tick. paddles and walls
+#           are (left, top, width, height) tuples or pygame.Rects, checked in that order when two are hit at once
+# Post:     Returns (x, y, dx, dy, hits) where hits lists (kind, index, time, x, y) for every
+#           bounce, kind being "paddle" or "wall". Positions are not rounded, so moving for 0.5 and
+#           then 0.5 gives the same result as moving for 1
+def sweepBall(x: float, y: float, dx: int, dy: int, size: int, paddles: list, walls: list,
+              duration: float =1.0) -> tuple:
+    hits = []
+    elapsed = 0.0
+    for _ in range(MAX_BOUNCES):
+        remaining = duration - elapsed
+        # The box the ball sweeps over the rest of the tick (and a pixel more), to skip rectangles
+        # it can't reach
+        endX = x + dx * remaining
+        endY = y + dy * remaining
+        lowX, highX = (x - 1, endX + size + 1) if dx >= 0 else (endX - 1, x + size + 1)
+        lowY, highY = (y - 1, endY + size + 1) if dy >= 0 else (endY - 1, y + size + 1)
+        first = None
+        for kind, rects in (("wall", walls), ("paddle", paddles)):
+            for index, rect in enumerate(rects):
+                left, top, width, height = rect
+                if highX < left or lowX > left + width or highY < top or lowY > top + height:
+                    continue
+                t = timeOfImpact(x, y, dx, dy, size, rect)
+                if t is not None and t <= remaining + TOUCH_SLACK and (first is None or t < first[0]):
+                    first = (t, kind, index)
+        if first is None:
+            return endX, endY, dx, dy, hits
+        t, kind, index = first
+        t = min(t, remaining)
+        x += dx * t
+        y += dy * t
+        elapsed += t
+        hits.append((kind, index, elapsed, x, y))
+        if kind == "wall":
+            dy = -dy
+        else:
+            # Ball.hitPaddle, with the ball's centre where it touched the paddle
+            _, top, _, height = paddles[index]
+            dx = -dx
+            dy = (math.floor(y + PIXEL_SLACK) + size // 2 - (top + height // 2)) // 2
+    # Too many bounces for one tick, it stays where the last one left it
+    return x, y, dx, dy, hits
+
+# Author:   Shelby Scoville
+# Purpose:  Moves a Ball one tick with swept collisions, for Simulation and the host client
+# Pre:      paddles are Paddle objects (left first), walls are pygame.Rects (top first)
+# Post:     ball.rect, xVel and yVel are updated (the position rounded to whole pixels). Returns the
+#           hits from sweepBall, so the caller can play a sound for each
+def moveBall(ball: Ball, paddles: list, walls: list) -> list:
+    rect = ball.rect
+    dx = ball.xVel
+    dy = ball.yVel
+    # The usual case: the whole move stays in the open field between the paddles and the walls
+    lowX, highX = (rect.x, rect.right + dx) if dx >= 0 else (rect.x + dx, rect.right)
+    lowY, highY = (rect.y, rect.bottom + dy) if dy >= 0 else (rect.y + dy, rect.bottom)
+    if (lowX > paddles[0].rect.right + 1 and highX < paddles[-1].rect.left - 1
+            and lowY > walls[0].bottom + 1 and highY < walls[-1].top - 1):
+        rect.x += dx
+        rect.y += dy
+        return []
+    x, y, ball.xVel, ball.yVel, hits = sweepBall(rect.x, rect.y, ball.xVel, ball.yVel, rect.width,
+                                                 [paddle.rect for paddle in paddles], walls)
+    rect.x = math.floor(x + 0.5)
+    rect.y = math.floor(y + 0.5)
+    return hits
+
+class Simulation:
+    # Author:   Shelby Scoville
+    # Purpose:  Builds the walls, paddles and ball for one match, laid out like playGame does
+    # Pre:      None
+    # Post:     Match is at tick 0 with a 0-0 score
+    def __init__(self, screenWidth: int =640, screenHeight: int =480) -> None:
+        self.screenWidth = screenWidth
+        self.screenHeight = screenHeight
+        self.topWall = pygame.Rect(-10, 0, screenWidth+20, 10)
+        self.bottomWall = pygame.Rect(-10, screenHeight-10, screenWidth+20, 10)
+
+        paddleHeight = 50
+        paddleWidth = 10
+        paddleStartPosY = (screenHeight/2)-(paddleHeight/2)
+        self.leftPaddle = Paddle(pygame.Rect(10, paddleStartPosY, paddleWidth, paddleHeight))
+        self.rightPaddle = Paddle(pygame.Rect(screenWidth-20, paddleStartPosY, paddleWidth, paddleHeight))
+        self.ball = Ball(pygame.Rect(screenWidth/2, screenHeight/2, 5, 5), -5, 0)
+
+        self.lScore = 0
+        self.rScore = 0
+        self.tick = 0
+        # Sequence number of the last input applied for each player, sent back so clients can reconcile
+        self.inputSeq = {1: 0, 2: 0}
+
+    # Author:   Shelby Scoville
+    # Purpose:  Records which way a player is holding their paddle
+    # Pre:      playerId is 1 (left) or 2 (right), moving is "up", "down" or "", seq is the input's number
+    # Post:     The paddle moves that way on every following tick
+    def setInput(self, playerId: int, moving: str, seq: int =0) -> None:
+        if moving not in ("up", "down"):
+            moving = ""
+        paddle = self.leftPaddle if playerId == 1 else self.rightPaddle
+        paddle.moving = moving
+        self.inputSeq[playerId] = seq
+
+    def isOver(self) -> bool:
+        return self.lScore > WIN_SCORE or self.rScore > WIN_SCORE
+
+    # Author:   Shelby Scoville
+    # Purpose:  Advances the match by one tick using the same rules as the host client in playGame
+    # Pre:      None
+    # Post:     Paddles, ball and scores are updated and the tick counter goes up by one
+    def step(self) -> None:
+        movePaddle(self.leftPaddle, self.screenHeight)
+        movePaddle(self.rightPaddle, self.screenHeight)
+
+        if not self.isOver():
+            ball = self.ball
+            # Bounces off paddles and walls happen where the ball touches them, however fast it goes
+            moveBall(ball, [self.leftPaddle, self.rightPaddle], [self.topWall, self.bottomWall])
+
+            # If the ball makes it past the edge of the screen, update score, etc.
+            if ball.rect.x > self.screenWidth:
+                self.lScore += 1
+                ball.reset(nowGoing="left")
+            elif ball.rect.x < 0:
+                self.rScore += 1
+                ball.reset(nowGoing="right")
+
+        self.tick += 1
+
+    # Author:   Shelby Scoville
+    # Purpose:  Exports the match in the same layout as the server's game_state
+    # Pre:      None
+    # Post:     Returns a new dictionary, with the tick number as "sync"
+    def getState(self) -> dict:
+        return {
+            "ball_x": self.ball.rect.x,
+            "ball_y": self.ball.rect.y,
+            "ball_dx": self.ball.xVel,
+            "ball_dy": self.ball.yVel,
+            "p1_y": self.leftPaddle.rect.y,
+            "p2_y": self.rightPaddle.rect.y,
+            "score1": self.lScore,
+            "score2": self.rScore,
+            "sync": self.tick,
+            "p1_seq": self.inputSeq[1],
+            "p2_seq": self.inputSeq[2],
+            # Stamped with the server's clock when the state is sent
+            "time": 0
+        }
+
+
+class TickStats:
+    # Author:   Shelby Scoville
+    # Purpose:  Tracks how much of each tick's time budget the server actually uses
+    # Pre:      tickRate is the number of ticks per second
+    # Post:     Counters start at zero
+    def __init__(self, tickRate: float) -> None:
+        self.budget = 1.0 / tickRate
+        self.reset()
+
+    def reset(self) -> None:
+        self.ticks = 0
+        self.busy = 0.0
+        self.worst = 0.0
+        self.overruns = 0
+        self.started = time.perf_counter()
+
+    # Author:   Shelby Scoville
+    # Purpose:  Records how long one tick took to simulate and send
+    # Pre:      seconds is the measured tick duration
+    # Post:     Totals, worst case and overrun count are updated
+    def record(self, seconds: float) -> None:
+        self.ticks += 1
+        self.busy += seconds
+        if seconds > self.worst:
+            self.worst = seconds
+        if seconds > self.budget:
+            self.overruns += 1
+
+    # Author:   Shelby Scoville
+    # Purpose:  Fraction of the tick budget left over on an average tick
+    # Pre:      None
+    # Post:     Returns 1.0 when idle, 0.0 or less once the server cannot keep up
+    def headroom(self) -> float:
+        if self.ticks == 0:
+            return 1.0
+        return 1.0 - (self.busy / self.ticks) / self.budget
+
+    def summary(self) -> str:
+        avg = (self.busy / self.ticks) if self.ticks else 0.0
+        return (f"ticks={self.ticks} avg={avg*1000:.3f}ms worst={self.worst*1000:.3f}ms "
+                f"budget={self.budget*1000:.3f}ms headroom={self.headroom()*100:.1f}% overruns={self.overruns}")
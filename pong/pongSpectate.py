@@ -0,0 +1,618 @@
+# =================================================================================================
+# Contributing Authors:	    Shelby Scoville
+# Email Addresses:          snsc235@uky.edu
+# Date:                     10/18/2026
+# Purpose:                  Read-only spectator connections, fed from one encode per state
+# =================================================================================================
+#
+# Spectators connect to their own port and are served by a SpectatorHub on its own thread, so the
+# players' path only ever hands the hub the latest state of a match that has watchers (a dict copy
+# and assignment, plus a one byte wakeup when the hub is idle). As soon as a state is waiting, and
+# at most send_rate times a second, the hub takes each match's newest state, encodes it once per wire
+# format in use and offers that same immutable bytes object to every watcher of the match. Each
+# watcher is written with non-blocking sends (one sendmsg per watcher where the platform has it, so
+# the rest of a half-sent frame and the newest frame go out in one call). A watcher whose socket is
+# backed up keeps at most one waiting frame, which each newer state replaces, and one that stays
+# backed up for stall_timeout seconds is dropped.
+#
+# Handshake: the hub sends a JSON init line with "spectator": True, the live "matches" and the
+# "formats" it speaks. A watcher may answer with one JSON line holding "watch" (a match, 0 or
+# nothing for whichever match is running) and "format" (confirmed like the player handshake, but
+# without delta snapshots). It then receives "state" messages until its match ends and the hub
+# closes the connection. Anything else it sends is ignored. A watcher is only attached once that
+# line has been read, or after WATCH_GRACE seconds without one (then to the first live match).
+# Asking for a match that is not being played gets the newest live one. A watcher whose match
+# already has max_per_match watchers is disconnected. JSON watchers are told which match they got
+# ({"watching": match}, before the first state) or why they were turned away ({"error": reason});
+# binary frames have no layout for these, so binary watchers only see the states or the close.
+#
+# Watch a match:  python pongSpectate.py 127.0.0.1 55556 [--match 3] [--headless]
+
+import argparse
+import json
+import selectors
+import socket
+import sys
+import threading
+import time
+
+from pongProtocol import JSON_CODEC, CODECS, SUPPORTED_FORMATS, choose_format
+from pongFraming import FrameBuffer
+from pongClock import stamp_ms
+
+# Seconds a new watcher has to say which match it wants before it is put on the first live one
+WATCH_GRACE = 1.0
+
+# Author:   Shelby Scoville
+# Purpose:  Writes several buffers in one non-blocking call where the platform allows it
+# Pre:      sock is non-blocking, buffers is a non-empty list of bytes-like objects
+# Post:     Returns the number of bytes written (from the start of the first buffer on)
+def send_buffers(sock: socket.socket, buffers: list) -> int:
+    if len(buffers) > 1 and hasattr(sock, "sendmsg"):
+        return sock.sendmsg(buffers)
+    return sock.send(buffers[0])
+
+class Spectator:
+    # Author:   Shelby Scoville
+    # Purpose:  One read-only watcher and what is waiting to be written to it
+    # Pre:      sock is connected and non-blocking
+    # Post:     Nothing queued, watching whichever match is running until told otherwise
+    def __init__(self, sock: socket.socket, addr, stall_timeout: float =5.0) -> None:
+        self.sock = sock
+        self.addr = addr
+        self.stall_timeout = stall_timeout
+        self.frames = FrameBuffer(1024)
+        self.codec = JSON_CODEC
+        # Match asked for (0 for any), whether the watcher has said yet, and the match being
+        # watched (None until attached)
+        self.wants = 0
+        self.asked = False
+        self.match = None
+        self.since = time.monotonic()
+        # Bytes that must go out in order (the rest of a frame already started first)
+        self.committed = []
+        # Newest state frame, shared with every other watcher and not started yet
+        self.pending = None
+        self.blocked_since = None
+        self.closed = False
+        self.offered = 0
+        self.dropped = 0
+
+    # Author:   Shelby Scoville
+    # Purpose:  Makes frame the next state this watcher gets
+    # Pre:      frame is an encoded state in this watcher's format, it is not copied or changed
+    # Post:     A waiting older state is dropped in favour of this one
+    def offer(self, frame: bytes) -> None:
+        if self.pending is not None:
+            self.dropped += 1
+        self.pending = frame
+        self.offered += 1
+
+    # Author:   Shelby Scoville
+    # Purpose:  Queues a handshake message, which always arrives
+    # Pre:      None
+    # Post:     A waiting state (encoded before this message) goes out first
+    def send_control(self, data: dict) -> None:
+        if self.pending is not None:
+            self.committed.append(memoryview(self.pending))
+            self.pending = None
+        self.committed.append(memoryview(JSON_CODEC.encode("control", data)))
+
+    # Author:   Shelby Scoville
+    # Purpose:  Writes as much as the socket takes without waiting
+    # Pre:      now is a time.monotonic() time
+    # Post:     Returns True once nothing is waiting. Raises OSError if the connection broke
+    def flush(self, now: float) -> bool:
+        if not self.committed:
+            if self.pending is None:
+                self.blocked_since = None
+                return True
+            # Usual case: only the newest frame is waiting, a plain send will do
+            try:
+                sent = self.sock.send(self.pending)
+            except (BlockingIOError, InterruptedError):
+                sent = 0
+            if sent == len(self.pending):
+                self.pending = None
+                self.blocked_since = None
+                return True
+            if sent:
+                self.committed.append(memoryview(self.pending)[sent:])
+                self.pending = None
+            if self.blocked_since is None:
+                self.blocked_since = now
+            return False
+        buffers = self.committed if self.pending is None else self.committed + [self.pending]
+        try:
+            sent = send_buffers(self.sock, buffers)
+        except (BlockingIOError, InterruptedError):
+            sent = 0
+        if self.pending is not None and sent > sum(len(view) for view in self.committed):
+            # The newest frame has started going out, it can no longer be replaced
+            self.committed.append(memoryview(self.pending))
+            self.pending = None
+        while sent:
+            first = self.committed[0]
+            if sent < len(first):
+                self.committed[0] = first[sent:]
+                break
+            sent -= len(first)
+            del self.committed[0]
+        if self.committed or self.pending is not None:
+            if self.blocked_since is None:
+                self.blocked_since = now
+            return False
+        self.blocked_since = None
+        return True
+
+    def stalled(self, now: float) -> bool:
+        return self.blocked_since is not None and now - self.blocked_since > self.stall_timeout
+
+    # Author:   Shelby Scoville
+    # Purpose:  Reads and applies the handshake messages the watcher sent
+    # Pre:      The socket is readable
+    # Post:     Returns False once the watcher has disconnected
+    def read(self) -> bool:
+        try:
+            if not self.frames.recv_into(self.sock):
+                return False
+        except (BlockingIOError, InterruptedError):
+            return True
+        except OSError:
+            return False
+        while True:
+            data, found = self.frames.next_message(self.codec)
+            if not found:
+                return True
+            if not isinstance(data, dict):
+                continue
+            if "format" in data and self.codec is JSON_CODEC:
+                # Same handshake as players, but everyone gets full states (no delta snapshots)
+                chosen = choose_format([data["format"]])
+                self.send_control({"format": chosen})
+                self.codec = CODECS[chosen]
+            if "watch" in data:
+                self.asked = True
+                if isinstance(data["watch"], int):
+                    self.wants = data["watch"]
+
+    def close(self) -> None:
+        self.closed = True
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+class SpectatorHub:
+    # Author:   Shelby Scoville
+    # Purpose:  Accepts spectators and fans each match's newest state out to its watchers
+    # Pre:      host:port is free (port 0 picks one). send_rate is states per second per watcher,
+    #           max_per_match caps the watchers of one match
+    # Post:     Listening; start() runs the hub thread
+    def __init__(self, host: str ='0.0.0.0', port: int =55556, send_rate: float =60.0, max_per_match: int =1000,
+                 stall_timeout: float =5.0, screen_width: int =640, screen_height: int =480) -> None:
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.server.bind((host, port))
+        self.server.listen(1024)
+        self.server.setblocking(False)
+        self.port = self.server.getsockname()[1]
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.server, selectors.EVENT_READ, None)
+        # The server thread wakes the hub through this pair when it publishes a state
+        self.wake_reader, self.wake_writer = socket.socketpair()
+        self.wake_reader.setblocking(False)
+        self.wake_writer.setblocking(False)
+        self.selector.register(self.wake_reader, selectors.EVENT_READ, self.wake_reader)
+        self.woken = False
+        self.send_rate = send_rate
+        self.max_per_match = max_per_match
+        self.stall_timeout = stall_timeout
+        self.screen = (screen_width, screen_height)
+
+        # Shared with the game server's thread: live matches (under lock), matches that ended
+        # (under lock) and the latest published state per watched match (plain assignments)
+        self.lock = threading.Lock()
+        self.live = set()
+        self.ended = []
+        self.latest = {}
+        # Matches with at least one watcher, replaced (never changed) so the server can read it freely
+        self.watched = frozenset()
+
+        # Hub thread only: match -> its watchers, watchers not attached to a match yet, and the
+        # state each match was last sent. next_attach is when the next new watcher's grace runs out
+        self.audiences = {}
+        self.waiting = []
+        self.sent = {}
+        self.next_attach = None
+        self.thread = None
+        self.running = False
+
+        self.spectators = 0
+        self.encodes = 0
+        self.writes = 0
+        self.evictions = 0
+        self.dropped = 0
+        self.cpu = 0.0
+
+    # Author:   Shelby Scoville
+    # Purpose:  Tells the hub a match has both players (called from the game server's thread)
+    # Pre:      match is unique while it is live
+    # Post:     Watchers may attach to it
+    def start_match(self, match: int) -> None:
+        with self.lock:
+            self.live.add(match)
+        self.wake()
+
+    def end_match(self, match: int) -> None:
+        with self.lock:
+            self.live.discard(match)
+            self.ended.append(match)
+        self.wake()
+
+    # Author:   Shelby Scoville
+    # Purpose:  Hands the hub a match's current state (called from the game server's thread)
+    # Pre:      state is a full game state
+    # Post:     A copy is kept for the next fan-out if anyone is watching, otherwise nothing happens
+    def publish(self, match: int, state: dict) -> None:
+        if match in self.watched:
+            self.latest[match] = dict(state)
+            if not self.woken:
+                self.wake()
+
+    # Author:   Shelby Scoville
+    # Purpose:  Wakes the hub thread if it is waiting in select
+    # Pre:      None
+    # Post:     The hub runs a fan-out as soon as send_rate allows
+    def wake(self) -> None:
+        self.woken = True
+        try:
+            self.wake_writer.send(b"\0")
+        except (BlockingIOError, InterruptedError):
+            pass
+        except OSError:
+            pass
+
+    def start(self) -> None:
+        self.running = True
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    # Author:   Shelby Scoville
+    # Purpose:  The hub thread: accepts and reads watchers, fans out when woken, at most send_rate a second
+    # Pre:      start() was called
+    # Post:     Runs until close()
+    def run(self) -> None:
+        interval = 1.0 / self.send_rate
+        next_send = time.perf_counter()
+        due = False
+        while self.running:
+            # Sleep until woken, until send_rate allows the fan-out that is due, or until a new
+            # watcher that never said which match it wants has to be attached anyway
+            timeouts = []
+            if due:
+                timeouts.append(next_send - time.perf_counter())
+            if self.next_attach is not None:
+                timeouts.append(self.next_attach - time.monotonic())
+            timeout = max(0.0, min(timeouts)) if timeouts else None
+            for key, _ in self.selector.select(timeout):
+                if key.data is self.wake_reader:
+                    try:
+                        while self.wake_reader.recv(4096):
+                            pass
+                    except (BlockingIOError, InterruptedError):
+                        pass
+                    # Cleared after draining: a publish from here on wakes the hub again
+                    self.woken = False
+                    due = True
+                elif key.data is None:
+                    self.accept()
+                elif not key.data.read():
+                    self.drop(key.data)
+                else:
+                    # Answer a handshake right away instead of at the next fan-out
+                    try:
+                        key.data.flush(time.monotonic())
+                    except OSError:
+                        self.drop(key.data)
+                        continue
+                    if key.data.match is None and key.data.asked:
+                        # It said which match it wants, attach it on the next fan-out
+                        due = True
+            if self.next_attach is not None and time.monotonic() >= self.next_attach:
+                self.next_attach = None
+                due = True
+            now = time.perf_counter()
+            if due and now >= next_send:
+                due = False
+                self.fan_out(time.monotonic())
+                # A late fan-out may be followed straight away by one more, so a state that just
+                # missed its slot is not overwritten by the next one
+                next_send = max(next_send + interval, now)
+        self.cpu = time.thread_time()
+
+    # Author:   Shelby Scoville
+    # Purpose:  Accepts every waiting spectator and sends it the init line
+    # Pre:      Listening socket is readable
+    # Post:     New watchers wait to be attached until they say which match they want (or WATCH_GRACE)
+    def accept(self) -> None:
+        while True:
+            try:
+                sock, addr = self.server.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                return
+            sock.setblocking(False)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            spectator = Spectator(sock, addr, self.stall_timeout)
+            self.selector.register(sock, selectors.EVENT_READ, spectator)
+            with self.lock:
+                matches = sorted(self.live)
+            spectator.send_control({"screen_width": self.screen[0], "screen_height": self.screen[1],
+                                    "paddle": "spectator", "spectator": True, "formats": SUPPORTED_FORMATS,
+                                    "matches": matches})
+            self.waiting.append(spectator)
+            self.spectators += 1
+            deadline = spectator.since + WATCH_GRACE
+            if self.next_attach is None or deadline < self.next_attach:
+                self.next_attach = deadline
+            try:
+                spectator.flush(time.monotonic())
+            except OSError:
+                self.drop(spectator)
+
+    # Author:   Shelby Scoville
+    # Purpose:  Disconnects a watcher
+    # Pre:      None
+    # Post:     The watcher is closed and forgotten
+    def drop(self, spectator: Spectator) -> None:
+        if spectator.closed:
+            return
+        try:
+            self.selector.unregister(spectator.sock)
+        except (KeyError, ValueError):
+            pass
+        spectator.close()
+        self.spectators -= 1
+        self.dropped += spectator.dropped
+        if spectator.match is None:
+            self.waiting.remove(spectator)
+        else:
+            audience = self.audiences[spectator.match]
+            audience.remove(spectator)
+            if not audience:
+                del self.audiences[spectator.match]
+                self.latest.pop(spectator.match, None)
+                self.sent.pop(spectator.match, None)
+                self.watched = frozenset(self.audiences)
+
+    # Author:   Shelby Scoville
+    # Purpose:  Attaches waiting watchers to their match and closes the audiences of ended matches
+    # Pre:      Hub thread, now is time.monotonic()
+    # Post:     audiences and watched are up to date. Watchers still within WATCH_GRACE that have
+    #           not said which match they want are left waiting
+    def update_audiences(self, now: float) -> None:
+        with self.lock:
+            live = sorted(self.live)
+            ended, self.ended = self.ended, []
+        for match in ended:
+            for spectator in list(self.audiences.get(match, ())):
+                self.drop(spectator)
+            self.latest.pop(match, None)
+        if not live:
+            return
+        for spectator in list(self.waiting):
+            if not spectator.asked and now - spectator.since < WATCH_GRACE:
+                deadline = spectator.since + WATCH_GRACE
+                if self.next_attach is None or deadline < self.next_attach:
+                    self.next_attach = deadline
+                continue
+            match = spectator.wants or live[0]
+            if match not in live:
+                # It ended or never existed; the newest match is the one left running longest
+                match = live[-1]
+            audience = self.audiences.get(match, [])
+            if len(audience) >= self.max_per_match:
+                self.refuse(spectator, f"match {match} already has {self.max_per_match} spectators")
+                continue
+            self.waiting.remove(spectator)
+            spectator.match = match
+            self.audiences[match] = audience
+            audience.append(spectator)
+            if spectator.codec is JSON_CODEC:
+                spectator.send_control({"watching": match})
+        self.watched = frozenset(self.audiences)
+
+    # Author:   Shelby Scoville
+    # Purpose:  Turns a waiting watcher away
+    # Pre:      spectator is waiting
+    # Post:     A JSON watcher is sent the reason if the socket takes it, the watcher is disconnected
+    def refuse(self, spectator: Spectator, reason: str) -> None:
+        if spectator.codec is JSON_CODEC:
+            spectator.send_control({"error": reason})
+            try:
+                spectator.flush(time.monotonic())
+            except OSError:
+                pass
+        self.drop(spectator)
+
+    # Author:   Shelby Scoville
+    # Purpose:  Sends every watched match's newest state to its watchers, encoding it once per format
+    # Pre:      now is time.monotonic()
+    # Post:     Watchers that broke or stayed backed up too long are dropped
+    def fan_out(self, now: float) -> None:
+        self.update_audiences(now)
+        gone = []
+        for spectator in self.waiting:
+            # Still waiting for a match, but their handshake answers have to go out
+            try:
+                spectator.flush(now)
+            except OSError:
+                gone.append(spectator)
+        for match, audience in self.audiences.items():
+            state = self.latest.get(match)
+            if state is None or state is self.sent.get(match):
+                continue
+            self.sent[match] = state
+            # When the state went out, in the server's clock (the hub shares the process clock)
+            state["time"] = stamp_ms()
+            frames = {}
+            for spectator in audience:
+                frame = frames.get(spectator.codec)
+                if frame is None:
+                    frame = frames[spectator.codec] = spectator.codec.encode("state", state)
+                    self.encodes += 1
+                spectator.offer(frame)
+                try:
+                    spectator.flush(now)
+                except OSError:
+                    gone.append(spectator)
+                    continue
+                self.writes += 1
+                if spectator.stalled(now):
+                    self.evictions += 1
+                    gone.append(spectator)
+        for spectator in gone:
+            self.drop(spectator)
+
+    # Author:   Shelby Scoville
+    # Purpose:  One line about the spectators for the servers' periodic report
+    # Pre:      None
+    # Post:     Returns the summary string
+    def summary(self) -> str:
+        return (f"{self.spectators} spectators in {len(self.watched)} matches, {self.encodes} states encoded "
+                f"for {self.writes} writes, {self.dropped} dropped for newer ones, {self.evictions} evicted")
+
+    # Author:   Shelby Scoville
+    # Purpose:  Stops the hub thread and disconnects everyone
+    # Pre:      None
+    # Post:     All spectator sockets and the listening socket are closed
+    def close(self) -> None:
+        self.running = False
+        self.wake()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        for key in list(self.selector.get_map().values()):
+            if isinstance(key.data, Spectator):
+                self.drop(key.data)
+        self.selector.close()
+        self.server.close()
+        self.wake_reader.close()
+        self.wake_writer.close()
+
+# Author:   Shelby Scoville
+# Purpose:  Connects to a spectator port and does the handshake
+# Pre:      A hub is listening on host:port
+# Post:     Returns (socket, codec, init data, FrameBuffer holding anything read past the handshake)
+def connect_spectator(host: str, port: int, match: int =0, wire_format: str =None, timeout: float =5.0) -> tuple:
+    sock = socket.create_connection((host, port), timeout=timeout)
+    frames = FrameBuffer(65536)
+    init, found = None, False
+    while not found:
+        if not frames.recv_into(sock):
+            raise ConnectionError("spectator port closed during the handshake")
+        init, found = frames.next_message(JSON_CODEC)
+    codec = JSON_CODEC
+    chosen = wire_format or choose_format(init.get("formats"))
+    request = {"watch": match}
+    if chosen != JSON_CODEC.name:
+        request["format"] = chosen
+    sock.sendall(JSON_CODEC.encode("control", request))
+    if chosen != JSON_CODEC.name:
+        # States may arrive in JSON until the confirm, then in the chosen format
+        while True:
+            data, found = frames.next_message(JSON_CODEC)
+            if not found:
+                if not frames.recv_into(sock):
+                    raise ConnectionError("spectator port closed during the handshake")
+                continue
+            if isinstance(data, dict) and data.get("format") == chosen:
+                codec = CODECS[chosen]
+                break
+    return sock, codec, init, frames
+
+# Author:   Shelby Scoville
+# Purpose:  Shows what the hub told the watcher apart from states
+# Pre:      data is a decoded message that is not a state
+# Post:     Match picked or error is printed to stderr
+def show_notice(data: dict) -> None:
+    if "watching" in data:
+        print(f"Watching match {data['watching']}", file=sys.stderr)
+    elif "error" in data:
+        print(f"Spectator port refused: {data['error']}", file=sys.stderr)
+
+# Author:   Shelby Scoville
+# Purpose:  Watches a match in a window, drawn with the game's renderer
+# Pre:      Run from the pong/ folder (for the fonts)
+# Post:     Returns when the window is closed or the match ends
+def watch_window(sock: socket.socket, codec, init: dict, frames: FrameBuffer) -> None:
+    # Only the window needs pygame, servers never load it through this module
+    import pygame
+    from pongRender import openWindow
+
+    renderer = openWindow(init["screen_width"], init["screen_height"], "Pong (spectating)")
+    sock.setblocking(False)
+    state = None
+    clock = pygame.time.Clock()
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                pygame.quit()
+                return
+        try:
+            if not frames.recv_into(sock):
+                break
+        except (BlockingIOError, InterruptedError):
+            pass
+        while True:
+            data, found = frames.next_message(codec)
+            if not found:
+                break
+            if isinstance(data, dict) and "ball_x" in data:
+                state = data
+            elif isinstance(data, dict):
+                show_notice(data)
+        if state is not None:
+            renderer.drawState(state)
+        clock.tick(60)
+    pygame.quit()
+    print("The match ended")
+
+# Author:   Shelby Scoville
+# Purpose:  Watches a match by printing each state as a JSON line
+# Pre:      None
+# Post:     Returns when the match ends
+def watch_headless(sock: socket.socket, codec, frames: FrameBuffer, out=sys.stdout) -> None:
+    sock.settimeout(None)
+    while frames.recv_into(sock):
+        while True:
+            data, found = frames.next_message(codec)
+            if not found:
+                break
+            if isinstance(data, dict) and "ball_x" in data:
+                out.write(json.dumps(data) + "\n")
+            elif isinstance(data, dict):
+                show_notice(data)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Watch a match from a server's spectator port")
+    parser.add_argument("host")
+    parser.add_argument("port", type=int, help="the server's --spectator-port")
+    parser.add_argument("--match", type=int, default=0, help="match (room) number, default: whichever is running")
+    parser.add_argument("--format", choices=["json", "binary"], default=None)
+    parser.add_argument("--headless", action="store_true", help="print states as JSON lines instead of drawing them")
+    args = parser.parse_args()
+
+    sock, codec, init, frames = connect_spectator(args.host, args.port, args.match, args.format)
+    print(f"Live matches: {init.get('matches') or 'none yet, waiting for one'}", file=sys.stderr)
+    try:
+        if args.headless:
+            watch_headless(sock, codec, frames)
+        else:
+            watch_window(sock, codec, init, frames)
+    except (KeyboardInterrupt, BrokenPipeError):
+        pass
+    finally:
+        sock.close()
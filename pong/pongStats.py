@@ -0,0 +1,271 @@
+# =================================================================================================
+# Contributing Authors:	    Shelby Scoville
+# Email Addresses:          snsc235@uky.edu
+# Date:                     10/18/2026
+# Purpose:                  Saves match results and player stats to SQLite without blocking the server
+# =================================================================================================
+#
+# A server started with --stats FILE hands every finished match to a StatsWriter. The game loop only
+# puts a tuple on a queue; a background thread takes everything waiting, writes it in one
+# transaction and commits, so the more results arrive at once the bigger the batches get. Each
+# match adds a row to `matches` and updates both players' running totals in `players`, which is
+# what the leaderboard and per-player stats read, so they never scan the match history. The
+# leaderboard is read straight off an index on (wins, matches, name) and stays as fast with
+# millions of matches as with ten. Sharded workers each run their own writer on the same file;
+# SQLite's write-ahead log lets them take turns and lets readers in at any time.
+#
+# Players are known by the name their client sent in the format handshake (pongClient --name),
+# or by their IP address. A match counts as won once a player's score went past WIN_SCORE; a
+# match that ended before that (someone left) is saved with no winner and counts as played only.
+#
+# Scores come from the clients on a relaying server, so a result whose scores are not whole
+# numbers in the range the wire carries (0 to MAX_SCORE) is refused when it is recorded. A result
+# the writer cannot save for any other reason is counted as failed without stopping the writer.
+#
+# Look at the results:  python pongStats.py stats.db [--top 10] [--player NAME]
+
+import argparse
+import queue
+import sqlite3
+import threading
+import time
+
+from pongSim import WIN_SCORE
+
+# Highest score a result may have, the largest a binary state frame carries
+MAX_SCORE = 0xFFFF
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS matches (
+    id INTEGER PRIMARY KEY,
+    server_match INTEGER NOT NULL,
+    started REAL NOT NULL,
+    ended REAL NOT NULL,
+    player1 TEXT NOT NULL,
+    player2 TEXT NOT NULL,
+    score1 INTEGER NOT NULL,
+    score2 INTEGER NOT NULL,
+    winner INTEGER
+);
+CREATE INDEX IF NOT EXISTS matches_player1 ON matches (player1, ended);
+CREATE INDEX IF NOT EXISTS matches_player2 ON matches (player2, ended);
+CREATE TABLE IF NOT EXISTS players (
+    name TEXT PRIMARY KEY,
+    matches INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    losses INTEGER NOT NULL,
+    points_for INTEGER NOT NULL,
+    points_against INTEGER NOT NULL,
+    last_played REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS players_leaderboard ON players (wins DESC, matches, name);
+"""
+
+INSERT_MATCH = ("INSERT INTO matches (server_match, started, ended, player1, player2, score1, score2, winner) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)")
+UPDATE_PLAYER = ("INSERT INTO players (name, matches, wins, losses, points_for, points_against, last_played) "
+                 "VALUES (?, 1, ?, ?, ?, ?, ?) ON CONFLICT (name) DO UPDATE SET "
+                 "matches = matches + 1, wins = wins + excluded.wins, losses = losses + excluded.losses, "
+                 "points_for = points_for + excluded.points_for, "
+                 "points_against = points_against + excluded.points_against, "
+                 "last_played = max(last_played, excluded.last_played)")
+LEADERBOARD = ("SELECT name, wins, losses, matches, points_for, points_against FROM players "
+               "ORDER BY wins DESC, matches, name LIMIT ?")
+PLAYER_STATS = ("SELECT name, wins, losses, matches, points_for, points_against, last_played FROM players "
+                "WHERE name = ?")
+RECENT_MATCHES = ("SELECT * FROM (SELECT id, ended, player1, player2, score1, score2, winner FROM matches "
+                  "WHERE player1 = ? ORDER BY ended DESC LIMIT ?) UNION "
+                  "SELECT * FROM (SELECT id, ended, player1, player2, score1, score2, winner FROM matches "
+                  "WHERE player2 = ? ORDER BY ended DESC LIMIT ?) ORDER BY ended DESC LIMIT ?")
+
+# Author:   Shelby Scoville
+# Purpose:  Opens a stats file, creating its tables the first time
+# Pre:      path is a file name (or ":memory:")
+# Post:     Returns a connection in write-ahead log mode that waits up to 30s for another writer
+def open_store(path: str) -> sqlite3.Connection:
+    db = sqlite3.connect(path, timeout=30.0)
+    db.execute("PRAGMA journal_mode=WAL")
+    # Durable at every checkpoint rather than every commit; a power cut may lose the last results
+    db.execute("PRAGMA synchronous=NORMAL")
+    db.executescript(SCHEMA)
+    return db
+
+# Author:   Shelby Scoville
+# Purpose:  Who won a match
+# Pre:      Scores are the match's final scores
+# Post:     Returns 1 or 2, or None if nobody's score went past WIN_SCORE
+def match_winner(score1: int, score2: int) -> int:
+    if score1 > WIN_SCORE and score1 > score2:
+        return 1
+    if score2 > WIN_SCORE and score2 > score1:
+        return 2
+    return None
+
+# Author:   Shelby Scoville
+# Purpose:  Writes a batch of results in one transaction
+# Pre:      results are tuples as queued by StatsWriter.record
+# Post:     Every result is in `matches` and counted in `players`, or none are (and the error is raised)
+def write_results(db: sqlite3.Connection, results: list) -> None:
+    matches = []
+    players = []
+    for server_match, started, ended, player1, player2, score1, score2 in results:
+        winner = match_winner(score1, score2)
+        matches.append((server_match, started, ended, player1, player2, score1, score2, winner))
+        players.append((player1, int(winner == 1), int(winner == 2), score1, score2, ended))
+        players.append((player2, int(winner == 2), int(winner == 1), score2, score1, ended))
+    with db:
+        db.executemany(INSERT_MATCH, matches)
+        db.executemany(UPDATE_PLAYER, players)
+
+class StatsWriter:
+    # Author:   Shelby Scoville
+    # Purpose:  Background thread that does all of a server's stats writing
+    # Pre:      path is where the stats file is (or should be created)
+    # Post:     The file and its tables exist (raises sqlite3.Error if it can't be opened). The
+    #           thread starts with the first result
+    def __init__(self, path: str, batch_limit: int =5000) -> None:
+        self.path = path
+        self.batch_limit = batch_limit
+        open_store(path).close()
+        self.jobs = queue.Queue()
+        self.thread = None
+        # Counters for reports and benchmarks, only changed by the writer thread
+        self.written = 0
+        self.batches = 0
+        self.failed = 0
+        self.last_commit = 0.0
+        # Results refused by record(), only changed by the thread recording
+        self.rejected = 0
+
+    # Author:   Shelby Scoville
+    # Purpose:  Hands one finished match to the writer thread
+    # Pre:      started and ended are time.time() values, players are names
+    # Post:     The result is saved in the background; this never waits on the disk. Returns False
+    #           (and counts it in rejected) if a score is not an int from 0 to MAX_SCORE
+    def record(self, server_match: int, started: float, ended: float, player1: str, player2: str,
+               score1: int, score2: int) -> bool:
+        if not all(type(score) is int and 0 <= score <= MAX_SCORE for score in (score1, score2)):
+            self.rejected += 1
+            print(f"Stats {self.path}: not saving match {server_match}, bad score {score1!r}-{score2!r}")
+            return False
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+        self.jobs.put((server_match, started, ended, player1, player2, score1, score2))
+        return True
+
+    # Author:   Shelby Scoville
+    # Purpose:  Results queued but not written yet
+    # Pre:      None
+    # Post:     Returns the count
+    def pending(self) -> int:
+        return self.jobs.qsize()
+
+    def run(self) -> None:
+        db = open_store(self.path)
+        try:
+            while True:
+                job = self.jobs.get()
+                if job is None:
+                    return
+                # Everything that piled up while the last batch was being written goes in this one
+                batch = [job]
+                done = False
+                while len(batch) < self.batch_limit:
+                    try:
+                        job = self.jobs.get_nowait()
+                    except queue.Empty:
+                        break
+                    if job is None:
+                        done = True
+                        break
+                    batch.append(job)
+                try:
+                    write_results(db, batch)
+                    saved = len(batch)
+                except Exception:
+                    # Save the batch one result at a time, so a result that slipped past record
+                    # only loses itself. A failing disk loses results, never the writer
+                    saved = 0
+                    for result in batch:
+                        try:
+                            write_results(db, [result])
+                            saved += 1
+                        except Exception as e:
+                            self.failed += 1
+                            print(f"Stats {self.path}: write of match {result[0]} failed, {e!r}")
+                if saved:
+                    self.written += saved
+                    self.batches += 1
+                    self.last_commit = time.perf_counter()
+                if done:
+                    return
+        finally:
+            db.close()
+
+    # Author:   Shelby Scoville
+    # Purpose:  Waits for everything recorded so far to be committed and stops the thread
+    # Pre:      No more results will be recorded
+    # Post:     The stats file holds every result that could be written
+    def close(self) -> None:
+        if self.thread is not None:
+            self.jobs.put(None)
+            self.thread.join()
+            self.thread = None
+
+    def summary(self) -> str:
+        average = self.written / self.batches if self.batches else 0.0
+        return (f"results={self.written} pending={self.pending()} batches={self.batches} avg_batch={average:.1f} "
+                f"failed={self.failed} rejected={self.rejected}")
+
+# Author:   Shelby Scoville
+# Purpose:  The best players
+# Pre:      db is from open_store or sqlite3.connect on a stats file
+# Post:     Returns up to limit rows of (name, wins, losses, matches, points_for, points_against),
+#           most wins first (fewer matches breaks a tie)
+def leaderboard(db: sqlite3.Connection, limit: int =10) -> list:
+    return db.execute(LEADERBOARD, (limit,)).fetchall()
+
+# Author:   Shelby Scoville
+# Purpose:  One player's totals
+# Pre:      db is from open_store or sqlite3.connect on a stats file
+# Post:     Returns a dict, or None if the player never finished a match
+def player_stats(db: sqlite3.Connection, name: str) -> dict:
+    row = db.execute(PLAYER_STATS, (name,)).fetchone()
+    if row is None:
+        return None
+    keys = ("name", "wins", "losses", "matches", "points_for", "points_against", "last_played")
+    return dict(zip(keys, row))
+
+# Author:   Shelby Scoville
+# Purpose:  A player's latest matches, from either side
+# Pre:      db is from open_store or sqlite3.connect on a stats file
+# Post:     Returns up to limit rows of (id, ended, player1, player2, score1, score2, winner), newest first.
+#           A match against themselves (two clients from one address) is listed once
+def recent_matches(db: sqlite3.Connection, name: str, limit: int =10) -> list:
+    return db.execute(RECENT_MATCHES, (name, limit, name, limit, limit)).fetchall()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show the leaderboard and player stats from a server's --stats file")
+    parser.add_argument("path", help="stats file written by pongServer.py --stats")
+    parser.add_argument("--top", type=int, default=10, help="leaderboard rows")
+    parser.add_argument("--player", help="show this player's totals and latest matches instead")
+    args = parser.parse_args()
+
+    db = sqlite3.connect(f"file:{args.path}?mode=ro", uri=True)
+    if args.player:
+        stats = player_stats(db, args.player)
+        if stats is None:
+            print(f"No matches for {args.player}")
+        else:
+            print(f"{stats['name']}: {stats['wins']} wins, {stats['losses']} losses, {stats['matches']} matches, "
+                  f"points {stats['points_for']}-{stats['points_against']}")
+            for id, ended, player1, player2, score1, score2, winner in recent_matches(db, args.player):
+                result = {1: f"{player1} won", 2: f"{player2} won"}.get(winner, "no winner")
+                print(f"  #{id} {time.strftime('%Y-%m-%d %H:%M', time.localtime(ended))}  "
+                      f"{player1} {score1} - {score2} {player2}  ({result})")
+    else:
+        print(f"{'#':>3} {'player':<24} {'wins':>6} {'losses':>6} {'matches':>7} {'points':>13}")
+        for place, (name, wins, losses, matches, points_for, points_against) in enumerate(leaderboard(db, args.top), 1):
+            print(f"{place:>3} {name:<24} {wins:>6} {losses:>6} {matches:>7} {points_for:>6}-{points_against:<6}")
+    db.close()
@@ -0,0 +1,215 @@
+# =================================================================================================
+# Contributing Authors:	    Shelby Scoville
+# Email Addresses:          snsc235@uky.edu
+# Date:                     10/18/2026
+# Purpose:                  UDP transport for the per-frame state stream, with a small reliable channel
+# =================================================================================================
+#
+# TCP still carries init_data and the format handshake. After that a client may open a UDP channel
+# to the server. Every datagram starts with a channel id and a sequence number:
+#     uint8  channel   (0 = state stream, 1 = reliable, 2 = ack for the reliable channel)
+#     uint32 sequence
+#     payload: one binary frame from pongProtocol (nothing for acks)
+# The state stream is latest-wins: a datagram older than one already received is dropped, so a lost
+# packet never holds back newer ones. The reliable channel (UDP hello, paddle input, score events) is
+# resent until acknowledged and delivered in order; a peer may run at most RELIABLE_WINDOW datagrams
+# ahead of the oldest one still missing. A send the socket refuses (full buffer, ENOBUFS) counts as
+# a lost datagram: state is replaced by the next one, reliable datagrams are resent.
+
+import heapq
+import random
+import struct
+import threading
+import time
+
+CHANNEL_STATE = 0
+CHANNEL_RELIABLE = 1
+CHANNEL_ACK = 2
+
+DATAGRAM_HEADER = struct.Struct("!BI")
+# Large enough for any binary frame we send
+MAX_DATAGRAM = 2048
+# Reliable datagrams further than this past the next one due are dropped unacked (the peer resends them)
+RELIABLE_WINDOW = 256
+
+class UdpChannel:
+    # Author:   Shelby Scoville
+    # Purpose:  Sequencing and reliability for one UDP peer
+    # Pre:      sendto(data, addr) sends a datagram (a socket's sendto or a LossyShim), addr is the peer
+    # Post:     No datagrams sent or received yet
+    def __init__(self, sendto, addr, resend_interval: float =0.1) -> None:
+        self.sendto = sendto
+        self.addr = addr
+        self.resend_interval = resend_interval
+
+        # State stream
+        self.state_seq = 0
+        self.newest_state = 0
+        self.stale_dropped = 0
+
+        # Reliable channel: seq -> [datagram, next resend time] for everything not yet acked
+        self.reliable_seq = 0
+        self.pending = {}
+        self.resends = 0
+        self.send_failures = 0
+        self.next_reliable = 1
+        # Reliable payloads that arrived ahead of a missing one
+        self.held = {}
+        # The client sends from its game loop and resends from its receive thread
+        self.lock = threading.Lock()
+
+    # Author:   Shelby Scoville
+    # Purpose:  Hands one datagram to the socket
+    # Pre:      The socket may be non-blocking
+    # Post:     Returns False if the socket refused it (it is then as good as lost on the way)
+    def send(self, datagram: bytes) -> bool:
+        try:
+            self.sendto(datagram, self.addr)
+            return True
+        except OSError:
+            self.send_failures += 1
+            return False
+
+    # Author:   Shelby Scoville
+    # Purpose:  Sends a frame on the latest-wins state stream
+    # Pre:      payload is one encoded frame
+    # Post:     Datagram is sent once, with no retries
+    def send_state(self, payload: bytes) -> None:
+        with self.lock:
+            self.state_seq += 1
+            datagram = DATAGRAM_HEADER.pack(CHANNEL_STATE, self.state_seq) + payload
+        self.send(datagram)
+
+    # Author:   Shelby Scoville
+    # Purpose:  Sends a frame that must arrive (handshake, input, score events)
+    # Pre:      payload is one encoded frame
+    # Post:     Datagram is sent and kept for resending until it is acked
+    def send_reliable(self, payload: bytes) -> None:
+        with self.lock:
+            self.reliable_seq += 1
+            datagram = DATAGRAM_HEADER.pack(CHANNEL_RELIABLE, self.reliable_seq) + payload
+            self.pending[self.reliable_seq] = [datagram, time.monotonic() + self.resend_interval]
+        # If the socket refuses it now, poll() sends it again
+        self.send(datagram)
+
+    def has_pending(self) -> bool:
+        return bool(self.pending)
+
+    # Author:   Shelby Scoville
+    # Purpose:  Resends reliable datagrams whose ack is overdue
+    # Pre:      Called regularly by whoever owns the channel
+    # Post:     Overdue datagrams are sent again
+    def poll(self, now: float =None) -> None:
+        if not self.pending:
+            return
+        if now is None:
+            now = time.monotonic()
+        with self.lock:
+            due = [entry for entry in self.pending.values() if entry[1] <= now]
+            for entry in due:
+                entry[1] = now + self.resend_interval
+        for entry in due:
+            self.send(entry[0])
+            self.resends += 1
+
+    # Author:   Shelby Scoville
+    # Purpose:  Processes one received datagram
+    # Pre:      datagram came from this channel's peer
+    # Post:     Returns the payloads to deliver, in order (empty for stale, duplicate or ack datagrams)
+    def receive(self, datagram: bytes) -> list:
+        if len(datagram) < DATAGRAM_HEADER.size:
+            return []
+        channel, seq = DATAGRAM_HEADER.unpack_from(datagram)
+        payload = datagram[DATAGRAM_HEADER.size:]
+
+        if channel == CHANNEL_STATE:
+            if seq <= self.newest_state:
+                # An older state arrived after a newer one, it is no use any more
+                self.stale_dropped += 1
+                return []
+            self.newest_state = seq
+            return [payload]
+
+        if channel == CHANNEL_ACK:
+            with self.lock:
+                self.pending.pop(seq, None)
+            return []
+
+        if channel != CHANNEL_RELIABLE:
+            return []
+        if seq >= self.next_reliable + RELIABLE_WINDOW:
+            # Too far ahead to hold on to; left unacked, so it comes again once the gap is filled
+            return []
+        # Always ack, our previous ack may have been the one that got lost
+        self.send(DATAGRAM_HEADER.pack(CHANNEL_ACK, seq))
+        if seq < self.next_reliable:
+            return []
+        self.held[seq] = payload
+        delivered = []
+        while self.next_reliable in self.held:
+            delivered.append(self.held.pop(self.next_reliable))
+            self.next_reliable += 1
+        return delivered
+
+
+class LossyShim:
+    # Author:   Shelby Scoville
+    # Purpose:  Wraps a sendto function and drops, delays and reorders datagrams like a bad link would
+    # Pre:      loss is a 0-1 drop probability, delay and jitter are in seconds
+    # Post:     Delayed datagrams are sent by a background thread when they are due
+    def __init__(self, sendto, loss: float =0.0, delay: float =0.0, jitter: float =0.0, seed: int =None) -> None:
+        self.real_sendto = sendto
+        self.loss = loss
+        self.delay = delay
+        self.jitter = jitter
+        self.rng = random.Random(seed)
+        self.dropped = 0
+        self.sent = 0
+
+        # (due time, order, datagram, addr), soonest first
+        self.queue = []
+        self.order = 0
+        self.ready = threading.Condition()
+        if delay > 0 or jitter > 0:
+            threading.Thread(target=self.deliver_loop, daemon=True).start()
+
+    # Author:   Shelby Scoville
+    # Purpose:  Stands in for socket.sendto
+    # Pre:      None
+    # Post:     The datagram is dropped, sent, or queued until its delay is up
+    def __call__(self, data: bytes, addr) -> None:
+        if self.rng.random() < self.loss:
+            self.dropped += 1
+            return
+        wait = self.delay + (self.rng.uniform(-self.jitter, self.jitter) if self.jitter else 0.0)
+        if wait <= 0:
+            self.send_now(data, addr)
+            return
+        with self.ready:
+            self.order += 1
+            heapq.heappush(self.queue, (time.monotonic() + wait, self.order, data, addr))
+            self.ready.notify()
+
+    def send_now(self, data: bytes, addr) -> None:
+        self.sent += 1
+        try:
+            self.real_sendto(data, addr)
+        except OSError:
+            # UDP gives no delivery guarantee anyway
+            pass
+
+    # Author:   Shelby Scoville
+    # Purpose:  Background thread that sends delayed datagrams once they are due
+    # Pre:      None
+    # Post:     Runs for the life of the process
+    def deliver_loop(self) -> None:
+        while True:
+            with self.ready:
+                while not self.queue:
+                    self.ready.wait()
+                due = self.queue[0][0] - time.monotonic()
+                if due > 0:
+                    self.ready.wait(due)
+                    continue
+                _, _, data, addr = heapq.heappop(self.queue)
+            self.send_now(data, addr)